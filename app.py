@@ -7,10 +7,13 @@ from src.paper_acquisition.paper_downloader import PaperDownloader
 from src.content_extraction.latex_processor import LaTeXProcessor
 from src.content_extraction.pdf_processor import PDFProcessor
 from src.content_extraction.image_processor import ImageProcessor
+from src.content_extraction.table_extractor import save_tables, tables_from_latex
 from src.information_extraction.text_analyzer import TextAnalyzer
 from src.information_extraction.image_analyzer import ImageAnalyzer
 from src.information_extraction.combined_analyzer import CombinedAnalyzer
+from src.information_extraction.retrieval import RetrievalIndex
 from src.reasoning.calculator import ReasoningCalculator
+from src.pipeline.batch_runner import BatchRunner
 import json
 
 def load_questions():
@@ -33,30 +36,36 @@ def process_paper(url, download_dir, openai_api_key, anthropic_api_key):
     # Extract content
     if latex_path:
         st.write("Extracting content from LaTeX...")
-        processor = LaTeXProcessor(latex_path)
-        text, image_references = processor.extract_content()
-        if text is None:  # If LaTeX processing fails, fall back to PDF
+        document = LaTeXProcessor(latex_path).extract_structure()
+        if document is None:  # If LaTeX processing fails, fall back to PDF
             st.write("LaTeX processing failed, falling back to PDF...")
-            processor = PDFProcessor(pdf_path)
+            with PDFProcessor(pdf_path) as processor:
+                text, images, figures = processor.extract_content()
+                st.write(f"Extracted {len(images)} images and {len(figures)} figures from the PDF")
+                image_paths = ImageProcessor.save_images(images, processed_dir)
+                st.write(f"Saved {len(image_paths)} images")
+                tables = processor.extract_tables()
+        else:
+            st.write(f"Extracted {len(document.sections)} sections and {len(document.figures)} figures from LaTeX")
+            text = document.text
+            # LaTeX sources have no page numbers; captions are in the figure metadata
+            image_paths = [(None, path) for path in document.image_paths()]
+            figures = document.figure_metadata()
+            tables = tables_from_latex(document)
+    else:
+        st.write("Extracting content from PDF...")
+        with PDFProcessor(pdf_path) as processor:
             text, images, figures = processor.extract_content()
             st.write(f"Extracted {len(images)} images and {len(figures)} figures from the PDF")
             image_paths = ImageProcessor.save_images(images, processed_dir)
             st.write(f"Saved {len(image_paths)} images")
-        else:
-            st.write("Extracted content from LaTeX successfully")
-            image_paths = [(1, path) for path in image_references]  # Assume all images are on page 1 for LaTeX
-            figures = []  # No figure extraction for LaTeX yet
-    else:
-        st.write("Extracting content from PDF...")
-        processor = PDFProcessor(pdf_path)
-        text, images, figures = processor.extract_content()
-        st.write(f"Extracted {len(images)} images and {len(figures)} figures from the PDF")
-        image_paths = ImageProcessor.save_images(images, processed_dir)
-        st.write(f"Saved {len(image_paths)} images")
+            tables = processor.extract_tables()
 
-    # Save figures metadata
+    # Save figures metadata and tables
     with open(os.path.join(output_dir, 'figure_metadata.json'), 'w') as f:
         json.dump(figures, f, indent=2)
+    save_tables(tables, os.path.join(processed_dir, 'tables.json'))
+    st.write(f"Extracted {len(tables)} tables")
 
     # Prepend abstract to the text
     if abstract:
@@ -73,7 +82,8 @@ def process_paper(url, download_dir, openai_api_key, anthropic_api_key):
     combined_analyzer = CombinedAnalyzer(text_analyzer, image_analyzer)
     
     text_summary, image_summary = combined_analyzer.analyze(text, image_paths)
-    combined_responses = combined_analyzer.answer_questions(text_summary, image_summary, questions)
+    index = RetrievalIndex.load_or_build(text, processed_dir)
+    combined_responses = combined_analyzer.answer_questions(text_summary, image_summary, questions, index=index, tables=tables)
 
     # Reason and calculate
     st.write("Performing final reasoning and calculations...")
@@ -87,6 +97,42 @@ def process_paper(url, download_dir, openai_api_key, anthropic_api_key):
     st.write("Analysis complete!")
     return final_answers, text, image_paths, pdf_path, combined_responses
 
+def load_batch_results(state):
+    output_dir = state['download']['output_dir']
+    with open(state['analyze']['results_path'], 'r') as f:
+        results = json.load(f)
+    with open(os.path.join(output_dir, 'combined_responses.json'), 'r') as f:
+        combined_responses = json.load(f)
+    with open(state['extract']['text_path'], 'r', encoding='utf-8') as f:
+        text = f.read()
+    return results, text, state['extract']['image_paths'], state['download']['pdf_path'], combined_responses
+
+def show_results(paper_name, results, text, image_paths, pdf_path, combined_responses):
+    st.subheader(f"Analysis Results for {paper_name}")
+    for question, answer in results.items():
+        st.write(f"**{question}**")
+        st.write(answer)
+        
+        with st.expander("Show relevant text"):
+            st.write(combined_responses[question]['text_response'])
+        
+        with st.expander("Show relevant image analysis"):
+            st.write(combined_responses[question]['image_response'])
+        
+        st.write("---")
+
+    with st.expander("Show Extracted Text"):
+        st.text_area("Paper Content", text, height=300)
+
+    with st.expander("Show Extracted Images"):
+        for i, (page, path) in enumerate(image_paths):
+            st.image(path, caption=f"Image {i+1} (Page {page})" if page else f"Image {i+1}")
+
+    with st.expander("View PDF"):
+        st.write(f"[Open PDF]({pdf_path})")
+    
+    st.write("\n\n")  # Add some space between papers
+
 def main():
     st.title("AI Paper Analyzer")
 
@@ -114,35 +160,26 @@ def main():
         selected_papers = paper_names
     
     if st.button("Analyze Paper(s)"):
+        if selection_mode == "All papers":
+            # Run the whole list through the batch engine: papers overlap, failures
+            # don't stop the batch, and finished stages are reused on the next run
+            with st.spinner(f"Analyzing {len(papers)} papers..."):
+                runner = BatchRunner(download_dir, openai_api_key, anthropic_api_key)
+                summary = runner.run([paper['url'] for paper in papers])
+            st.write(f"Completed {summary['completed']}/{len(papers)} papers "
+                     f"({summary['papers_per_hour']} papers/hour)")
+            for paper, state in zip(papers, summary['papers']):
+                if state['status'] != 'done':
+                    st.error(f"{paper['name']} failed during {state['failed_stage']}: {state['error']}")
+                    continue
+                show_results(paper['name'], *load_batch_results(state))
+            return
+
         for selected_paper in selected_papers:
             with st.spinner(f"Analyzing paper: {selected_paper}..."):
                 selected_url = next(paper['url'] for paper in papers if paper['name'] == selected_paper)
                 results, text, image_paths, pdf_path, combined_responses = process_paper(selected_url, download_dir, openai_api_key, anthropic_api_key)
-                
-                st.subheader(f"Analysis Results for {selected_paper}")
-                for question, answer in results.items():
-                    st.write(f"**{question}**")
-                    st.write(answer)
-                    
-                    with st.expander("Show relevant text"):
-                        st.write(combined_responses[question]['text_response'])
-                    
-                    with st.expander("Show relevant image analysis"):
-                        st.write(combined_responses[question]['image_response'])
-                    
-                    st.write("---")
-
-                with st.expander("Show Extracted Text"):
-                    st.text_area("Paper Content", text, height=300)
-
-                with st.expander("Show Extracted Images"):
-                    for i, (page, path) in enumerate(image_paths):
-                        st.image(path, caption=f"Image {i+1} (Page {page})")
-
-                with st.expander("View PDF"):
-                    st.write(f"[Open PDF]({pdf_path})")
-                
-                st.write("\n\n")  # Add some space between papers
+                show_results(selected_paper, results, text, image_paths, pdf_path, combined_responses)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
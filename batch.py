@@ -0,0 +1,47 @@
+import argparse
+import json
+import logging
+import os
+from dotenv import load_dotenv
+from src.pipeline.batch_runner import BatchRunner, load_urls
+
+def main():
+    parser = argparse.ArgumentParser(description="Process a batch of papers with resumable checkpoints")
+    parser.add_argument("source", nargs="?", default="config/paper_list.yaml",
+                        help="Paper list YAML or a text file with one URL per line")
+    parser.add_argument("--base-dir", default="data")
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--extract-workers", type=int, default=1)
+    parser.add_argument("--api-workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["per_question", "batched"], default="per_question",
+                        help="Question answering mode for the analyzers")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoints and redo every stage")
+    parser.add_argument("--no-pipeline", action="store_true",
+                        help="Carry each paper through all stages on one worker instead of pipelining stages")
+    parser.add_argument("--queue-size", type=int, default=2,
+                        help="Papers allowed to wait between two pipeline stages")
+    args = parser.parse_args()
+
+    load_dotenv()
+    # Progress and failures are reported through the library loggers
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    runner = BatchRunner(
+        args.base_dir,
+        os.getenv("OPENAI_API_KEY"),
+        os.getenv("ANTHROPIC_API_KEY"),
+        download_workers=args.download_workers,
+        extract_workers=args.extract_workers,
+        api_workers=args.api_workers,
+        mode=args.mode,
+    )
+    summary = runner.run(load_urls(args.source), restart=args.restart,
+                         pipelined=not args.no_pipeline, queue_size=args.queue_size)
+
+    summary_path = os.path.join(args.base_dir, "output", "batch_summary.json")
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Wrote batch summary to {summary_path}")
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@ from src.paper_acquisition.paper_downloader import PaperDownloader
 from src.content_extraction.latex_processor import LaTeXProcessor
 from src.content_extraction.pdf_processor import PDFProcessor
 from src.content_extraction.image_processor import ImageProcessor
+from src.content_extraction.table_extractor import save_tables, tables_from_latex
 from src.information_extraction.text_analyzer import TextAnalyzer
 from src.information_extraction.image_analyzer import ImageAnalyzer
 from src.information_extraction.combined_analyzer import CombinedAnalyzer
+from src.information_extraction.retrieval import RetrievalIndex
 from src.reasoning.calculator import ReasoningCalculator
 from src.user_interface.validation_interface import ValidationInterface
 from src.user_interface.results_viewer import ResultsViewer
@@ -24,14 +26,20 @@ def process_paper(url, base_dir, openai_api_key, anthropic_api_key):
     pdf_path, latex_path, abstract, processed_dir, output_dir = downloader.download_paper(url)
 
     # Extract content
-    if latex_path:
-        processor = LaTeXProcessor(latex_path)
-        text, image_references = processor.extract_content()
-        image_paths = [(1, path) for path in image_references]  # Assume all images are on page 1 for LaTeX
+    document = LaTeXProcessor(latex_path).extract_structure() if latex_path else None
+    if document is not None:
+        text = document.text
+        # LaTeX sources have no page numbers; captions are in the figure metadata
+        image_paths = [(None, path) for path in document.image_paths()]
+        tables = tables_from_latex(document)
+        with open(os.path.join(output_dir, 'figure_metadata.json'), 'w') as f:
+            json.dump(document.figure_metadata(), f, indent=2)
     else:
-        processor = PDFProcessor(pdf_path)
-        text, images = processor.extract_content()
-        image_paths = ImageProcessor.save_images(images, processed_dir)
+        with PDFProcessor(pdf_path) as processor:
+            text, images, _ = processor.extract_content()
+            image_paths = ImageProcessor.save_images(images, processed_dir)
+            tables = processor.extract_tables()
+    save_tables(tables, os.path.join(processed_dir, 'tables.json'))
 
     # Prepend abstract to the text
     if abstract:
@@ -46,7 +54,8 @@ def process_paper(url, base_dir, openai_api_key, anthropic_api_key):
     combined_analyzer = CombinedAnalyzer(text_analyzer, image_analyzer)
     
     text_summary, image_summary = combined_analyzer.analyze(text, image_paths)
-    combined_responses = combined_analyzer.answer_questions(text_summary, image_summary, questions)
+    index = RetrievalIndex.load_or_build(text, processed_dir)
+    combined_responses = combined_analyzer.answer_questions(text_summary, image_summary, questions, index=index, tables=tables)
 
     # Reason and calculate
     calculator = ReasoningCalculator(anthropic_api_key)
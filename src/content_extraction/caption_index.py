@@ -0,0 +1,73 @@
+import re
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:  # only for annotations; importing pdf_document needs PyMuPDF
+    from .pdf_document import PDFDocument, TextBlock
+
+FIGURE_CAPTION_PATTERN = re.compile(r'^\s*(figure|fig\.)\s*[A-Z]?\d+', re.IGNORECASE)
+TABLE_CAPTION_PATTERN = re.compile(r'^\s*(table|tab\.)\s*[A-Z]?\d+', re.IGNORECASE)
+
+
+class CaptionIndex:
+    """
+    Per-page spatial index of caption text blocks, built once per document.
+
+    Each page's caption blocks (those starting with e.g. "Figure 3" or "Fig. 2")
+    are kept sorted by their top edge, so matching a detected region to its
+    caption is a bisect plus a short scan instead of a pass over the page text.
+    Coordinates are PDF points, as returned by PDFDocument.text_blocks.
+    """
+
+    def __init__(self, document: "PDFDocument", pattern: re.Pattern = FIGURE_CAPTION_PATTERN,
+                 max_gap: float = 150.0, tolerance: float = 6.0):
+        self.document = document
+        self.pattern = pattern
+        self.max_gap = max_gap
+        self.tolerance = tolerance
+        self._pages: Dict[int, List["TextBlock"]] = {}
+        self._tops: Dict[int, List[float]] = {}
+
+    def caption_blocks(self, page_num: int) -> List["TextBlock"]:
+        if page_num not in self._pages:
+            blocks = sorted((block for block in self.document.text_blocks(page_num)
+                             if self.pattern.match(block.text)), key=lambda block: block.y0)
+            self._pages[page_num] = blocks
+            self._tops[page_num] = [block.y0 for block in blocks]
+        return self._pages[page_num]
+
+    def match(self, page_num: int, bbox: Sequence[float]) -> Optional["TextBlock"]:
+        """
+        Find the caption belonging to a region on a page.
+
+        The nearest horizontally overlapping caption block below the region wins;
+        if there is none within ``max_gap``, the nearest one above is used
+        (table captions and some figure styles sit above the content).
+
+        Args:
+            page_num (int): 0-based page index.
+            bbox (Sequence[float]): Region as (x0, y0, x1, y1) in PDF points.
+
+        Returns:
+            Optional[TextBlock]: The caption block, or None if nothing is close enough.
+        """
+        x0, y0, x1, y1 = bbox
+        blocks = self.caption_blocks(page_num)
+        tops = self._tops[page_num]
+
+        def overlaps(block):
+            return block.x0 < x1 and block.x1 > x0
+
+        start = bisect_left(tops, y1 - self.tolerance)
+        for block in blocks[start:]:
+            if block.y0 - y1 > self.max_gap:
+                break
+            if overlaps(block):
+                return block
+
+        best, best_gap = None, self.max_gap
+        for block in blocks[:bisect_left(tops, y0)]:
+            gap = y0 - block.y1
+            if -self.tolerance <= gap <= best_gap and overlaps(block):
+                best, best_gap = block, gap
+        return best
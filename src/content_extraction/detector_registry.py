@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import torch
+from transformers import AutoModelForCausalLM, AutoProcessor
+
+logger = logging.getLogger(__name__)
+
+TFT_ID_MODEL_ID = "yifeihu/TFT-ID-1.0"
+
+
+def get_device():
+    if torch.backends.mps.is_available():
+        return torch.device('mps')
+    elif torch.cuda.is_available():
+        return torch.device('cuda')
+    else:
+        return torch.device('cpu')
+
+
+@dataclass
+class DetectorHandle:
+    model: Any
+    processor: Any
+    device: torch.device
+    dtype: torch.dtype
+    load_seconds: float
+    memory_bytes: int
+    uses: int = 0
+
+
+class DetectorRegistry:
+    """
+    Process-wide pool of loaded figure detectors, keyed on (model id, device, dtype).
+
+    Models are loaded lazily on first use and then shared by every PDFProcessor,
+    so a batch of papers pays the load cost once. Loading is guarded by a
+    per-key lock; different keys can load concurrently.
+    """
+
+    def __init__(self):
+        self._handles: Dict[Tuple[str, str, str], DetectorHandle] = {}
+        self._key_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resolve(device=None, dtype=None) -> Tuple[torch.device, torch.dtype]:
+        device = torch.device(device) if device is not None else get_device()
+        dtype = dtype if dtype is not None else torch.float32
+        return device, dtype
+
+    def get(self, model_id: str = TFT_ID_MODEL_ID, device=None, dtype: Optional[torch.dtype] = None) -> DetectorHandle:
+        """
+        Borrow a loaded detector, loading it on first request.
+
+        Args:
+            model_id (str): Hugging Face model id.
+            device: Torch device or device string. Defaults to the best available device.
+            dtype (torch.dtype, optional): Weight dtype. Defaults to float32.
+
+        Returns:
+            DetectorHandle: The shared model, processor and load metrics.
+        """
+        device, dtype = self._resolve(device, dtype)
+        key = (model_id, str(device), str(dtype))
+        handle = self._handles.get(key)
+        if handle is None:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                handle = self._handles.get(key)
+                if handle is None:
+                    handle = self._load(model_id, device, dtype)
+                    self._handles[key] = handle
+        handle.uses += 1
+        return handle
+
+    def warm_up(self, model_id: str = TFT_ID_MODEL_ID, device=None, dtype: Optional[torch.dtype] = None) -> DetectorHandle:
+        """
+        Load a detector ahead of time, e.g. before a batch starts, so the first
+        paper does not pay the load cost.
+        """
+        handle = self.get(model_id, device, dtype)
+        handle.uses -= 1
+        return handle
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "|".join(key): {
+                "load_seconds": round(handle.load_seconds, 3),
+                "memory_mb": round(handle.memory_bytes / (1024 * 1024), 1),
+                "uses": handle.uses,
+            }
+            for key, handle in self._handles.items()
+        }
+
+    def release(self, model_id: str = TFT_ID_MODEL_ID, device=None, dtype: Optional[torch.dtype] = None):
+        device, dtype = self._resolve(device, dtype)
+        with self._lock:
+            self._handles.pop((model_id, str(device), str(dtype)), None)
+        if device.type == 'cuda':
+            torch.cuda.empty_cache()
+
+    @staticmethod
+    def _load(model_id: str, device: torch.device, dtype: torch.dtype) -> DetectorHandle:
+        start = time.perf_counter()
+        model = AutoModelForCausalLM.from_pretrained(model_id, trust_remote_code=True, torch_dtype=dtype)
+        processor = AutoProcessor.from_pretrained(model_id, trust_remote_code=True)
+        model.to(device)
+        model.eval()
+        load_seconds = time.perf_counter() - start
+        memory_bytes = sum(t.numel() * t.element_size() for t in list(model.parameters()) + list(model.buffers()))
+        logger.info(f"Loaded {model_id} on {device} ({dtype}) in {load_seconds:.1f}s, "
+                    f"{memory_bytes / (1024 * 1024):.0f} MB")
+        return DetectorHandle(model, processor, device, dtype, load_seconds, memory_bytes)
+
+
+detector_registry = DetectorRegistry()
+
+
+def get_detector(model_id: str = TFT_ID_MODEL_ID, device=None, dtype: Optional[torch.dtype] = None) -> DetectorHandle:
+    return detector_registry.get(model_id, device, dtype)
+
+
+def warm_up_detector(model_id: str = TFT_ID_MODEL_ID, device=None, dtype: Optional[torch.dtype] = None) -> DetectorHandle:
+    return detector_registry.warm_up(model_id, device, dtype)
@@ -1,51 +1,109 @@
-import os
+import re
 import chardet
 from pylatexenc.latex2text import LatexNodes2Text
+from .latex_resolver import COMMENT_PATTERN, LatexResolver
+from .latex_structure import parse_structure
+
+# Bytes around non-ASCII runs are all chardet needs; the ASCII bulk of a .tex file tells it nothing
+NON_ASCII_PATTERN = re.compile(rb'[\x80-\xff]+')
+SAMPLE_WINDOW = 256
+SAMPLE_BYTES = 64 * 1024
+
+def detection_sample(raw_data, window=SAMPLE_WINDOW, max_bytes=SAMPLE_BYTES):
+    """
+    Build a bounded sample for encoding detection from the regions around
+    non-ASCII bytes.
+    """
+    pieces, total = [], 0
+    for match in NON_ASCII_PATTERN.finditer(raw_data):
+        piece = raw_data[max(0, match.start() - window):match.end() + window]
+        pieces.append(piece)
+        total += len(piece)
+        if total >= max_bytes:
+            break
+    return b'\n'.join(pieces)
 
 class LaTeXProcessor:
     def __init__(self, latex_dir):
         self.latex_dir = latex_dir
+        self.resolver = LatexResolver(latex_dir, self._decode)
+        # Files in one source tree almost always share an encoding, so a
+        # detected legacy encoding is tried first for the rest of the tree
+        self.tree_encoding = None
 
     def extract_content(self):
+        document = self.extract_structure()
+        if document is None:
+            return None, []
+        return document.text, document.image_paths()
+
+    def extract_structure(self):
+        """
+        Parse the document into sections and figure/table environments.
+
+        Returns:
+            LatexDocument: The structure, with each section's plain text and the
+            whole text in ``text``; None if there is no main file.
+        """
         main_file = self._find_main_tex_file()
         if not main_file:
-            return None, []
+            return None
 
-        latex_content = self._read_file_with_encoding(os.path.join(self.latex_dir, main_file))
-        if latex_content is None:
-            return None, []
+        # The main file with every \input/\include inlined
+        latex_content = self.resolver.flatten(main_file)
+        if not latex_content:
+            return None
+        latex_content = COMMENT_PATTERN.sub('', latex_content)
 
-        text = LatexNodes2Text().latex_to_text(latex_content)
-        images = self._extract_image_references(latex_content)
-        return text, images
+        document = parse_structure(latex_content, self.latex_dir)
+        # Converting section by section gives per-section text at the cost of one conversion
+        converter = LatexNodes2Text()
+        first_section = document.sections[0].start if document.sections else len(latex_content)
+        pieces = [converter.latex_to_text(latex_content[:first_section])]
+        for section in document.sections:
+            section.text = converter.latex_to_text(latex_content[section.start:section.end])
+            pieces.append(section.text)
+        document.text = ''.join(pieces)
+        return document
 
     def _find_main_tex_file(self):
-        for file in os.listdir(self.latex_dir):
-            if file.endswith('.tex'):
-                content = self._read_file_with_encoding(os.path.join(self.latex_dir, file))
-                if content and '\\begin{document}' in content:
-                    return file
-        return None
+        return self.resolver.find_main_file()
 
     def _read_file_with_encoding(self, file_path):
         try:
             with open(file_path, 'rb') as f:
                 raw_data = f.read()
-            detected = chardet.detect(raw_data)
-            encoding = detected['encoding']
-            
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
         except Exception as e:
             print(f"Error reading file {file_path}: {str(e)}")
             return None
+        return self._decode(raw_data, file_path)
 
-    def _extract_image_references(self, latex_content):
-        image_commands = ['\\includegraphics', '\\figure']
-        images = []
-        for line in latex_content.split('\n'):
-            for command in image_commands:
-                if command in line:
-                    image_file = line.split('{')[-1].split('}')[0]
-                    images.append(os.path.join(self.latex_dir, image_file))
-        return images
\ No newline at end of file
+    def _decode(self, raw_data, file_path):
+        """
+        Decode file bytes in tiers: strict UTF-8 (which covers ASCII), then the
+        encoding already detected for this source tree, then chardet on a
+        bounded sample.
+        """
+        try:
+            return raw_data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            pass
+        if self.tree_encoding:
+            try:
+                return raw_data.decode(self.tree_encoding)
+            except UnicodeDecodeError:
+                pass
+        try:
+            encoding = chardet.detect(detection_sample(raw_data))['encoding']
+            if not encoding:
+                raise ValueError("no encoding detected")
+            try:
+                text = raw_data.decode(encoding)
+                self.tree_encoding = encoding
+                return text
+            except UnicodeDecodeError:
+                # The sample guessed wrong somewhere; keep the text rather than lose the file
+                return raw_data.decode(encoding, errors='replace')
+        except Exception as e:
+            print(f"Error reading file {file_path}: {str(e)}")
+            return None
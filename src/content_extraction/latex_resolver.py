@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+INCLUDE_PATTERN = re.compile(r'\\(?:input|include|subfile)\s*\{([^}]+)\}')
+COMMENT_PATTERN = re.compile(r'(?<!\\)%.*')
+BEGIN_DOCUMENT = b'\\begin{document}'
+# Names authors commonly give the root file, used to break ties
+MAIN_FILE_NAMES = ('main.tex', 'ms.tex', 'paper.tex')
+
+logger = logging.getLogger(__name__)
+
+
+class DecodedFileCache:
+    """
+    Decoded text of source files, keyed by path, in LRU order.
+
+    An entry is reused while the file's mtime and size are unchanged; if they
+    changed but the content hash did not (e.g. the tree was re-extracted), the
+    decoded text is still reused and only the stat key is refreshed. Each
+    LatexResolver gets its own cache unless one is passed in, so decoded text
+    lives no longer than the source tree it belongs to.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'rehashed': 0, 'decoded': 0}
+
+    def get(self, path: str, decode: Callable[[bytes, str], Optional[str]]) -> Optional[str]:
+        stat = os.stat(path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == stat_key:
+                self._entries.move_to_end(path)
+                self.stats['hits'] += 1
+                return cached[2]
+
+        with open(path, 'rb') as f:
+            raw_data = f.read()
+        digest = hashlib.sha1(raw_data).hexdigest()
+        if cached is not None and cached[1] == digest:
+            counter = 'rehashed'
+            text = cached[2]
+        else:
+            counter = 'decoded'
+            text = decode(raw_data, path)
+        with self._lock:
+            self.stats[counter] += 1
+            if text is None:
+                return None
+            self._entries[path] = (stat_key, digest, text)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+
+class LatexResolver:
+    """
+    Flattens a multi-file LaTeX project into one stream.
+
+    The main file is found by scanning raw bytes for ``\\begin{document}``, so
+    no file is decoded just to be ruled out. ``\\input``, ``\\include`` and
+    ``\\subfile`` are inlined recursively as they are reached, each file is
+    decoded at most once (through its DecodedFileCache), and the
+    include graph is recorded as a by-product. Comments are dropped, so
+    commented-out includes are not followed.
+    """
+
+    def __init__(self, latex_dir: str, decode: Callable[[bytes, str], Optional[str]],
+                 cache: Optional[DecodedFileCache] = None):
+        self.latex_dir = latex_dir
+        self.decode = decode
+        self.cache = cache if cache is not None else DecodedFileCache()
+        self.graph: Dict[str, List[str]] = {}
+
+    def tex_files(self) -> List[str]:
+        files = []
+        for root, _, names in os.walk(self.latex_dir):
+            for name in names:
+                if name.endswith('.tex'):
+                    files.append(os.path.relpath(os.path.join(root, name), self.latex_dir))
+        return sorted(files)
+
+    def find_main_file(self) -> Optional[str]:
+        """
+        Return the path (relative to latex_dir) of the root document, or None.
+        """
+        candidates = []
+        for relative_path in self.tex_files():
+            with open(os.path.join(self.latex_dir, relative_path), 'rb') as f:
+                if BEGIN_DOCUMENT in f.read():
+                    candidates.append(relative_path)
+        if not candidates:
+            return None
+        # Prefer top-level files, then conventional names, then the largest
+        def rank(relative_path):
+            size = os.path.getsize(os.path.join(self.latex_dir, relative_path))
+            return (os.sep in relative_path, os.path.basename(relative_path) not in MAIN_FILE_NAMES, -size)
+        return min(candidates, key=rank)
+
+    def read(self, relative_path: str) -> Optional[str]:
+        return self.cache.get(os.path.join(self.latex_dir, relative_path), self.decode)
+
+    def _resolve_include(self, name: str, including_file: str) -> Optional[str]:
+        name = name.strip()
+        if not name.endswith('.tex'):
+            name += '.tex'
+        # LaTeX resolves includes relative to the main file's directory; the
+        # including file's directory covers projects compiled from a subfolder
+        for base in ('', os.path.dirname(including_file)):
+            relative_path = os.path.normpath(os.path.join(base, name))
+            if relative_path.startswith('..'):
+                continue
+            if os.path.isfile(os.path.join(self.latex_dir, relative_path)):
+                return relative_path
+        return None
+
+    def iter_flattened(self, main_file: str) -> Iterator[str]:
+        """Yield the document in pieces, with every reachable include inlined in place."""
+        yield from self._expand(main_file, set())
+
+    def _expand(self, relative_path: str, stack: Set[str]) -> Iterator[str]:
+        text = self.read(relative_path)
+        if text is None:
+            return
+        text = COMMENT_PATTERN.sub('', text)
+        children = self.graph.setdefault(relative_path, [])
+        stack = stack | {relative_path}
+        position = 0
+        for match in INCLUDE_PATTERN.finditer(text):
+            yield text[position:match.start()]
+            position = match.end()
+            child = self._resolve_include(match.group(1), relative_path)
+            if child is None:
+                logger.warning(f"Included file {match.group(1)} not found in {self.latex_dir}")
+                continue
+            if child not in children:
+                children.append(child)
+            if child in stack:
+                logger.warning(f"Skipping circular include of {child}")
+                continue
+            yield '\n'
+            yield from self._expand(child, stack)
+            yield '\n'
+        yield text[position:]
+
+    def flatten(self, main_file: Optional[str] = None) -> Optional[str]:
+        """
+        Args:
+            main_file (Optional[str]): Root file relative to latex_dir; found
+                automatically if omitted.
+
+        Returns:
+            Optional[str]: The flattened document, or None if there is no main file.
+        """
+        main_file = main_file or self.find_main_file()
+        if main_file is None:
+            return None
+        return ''.join(self.iter_flattened(main_file))
@@ -0,0 +1,282 @@
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+SECTION_LEVELS = {'chapter': 0, 'section': 1, 'subsection': 2, 'subsubsection': 3, 'paragraph': 4}
+FLOAT_ENVIRONMENTS = {'figure': 'figure', 'figure*': 'figure', 'wrapfigure': 'figure',
+                      'table': 'table', 'table*': 'table', 'wraptable': 'table'}
+SUBFIGURE_ENVIRONMENTS = {'subfigure', 'subtable', 'minipage'}
+TABULAR_ENVIRONMENTS = {'tabular', 'tabular*', 'tabularx', 'longtable', 'tabulary'}
+GRAPHIC_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.eps')
+
+TOKEN_PATTERN = re.compile(
+    r'\\(?P<section>chapter|section|subsection|subsubsection|paragraph)\*?(?![A-Za-z])'
+    r'|\\begin\s*\{(?P<begin>[^}]+)\}'
+    r'|\\end\s*\{(?P<end>[^}]+)\}'
+    r'|\\(?P<command>caption|label|includegraphics|subfloat|subfigure|graphicspath)\*?(?![A-Za-z])'
+)
+RULE_PATTERN = re.compile(r'\\(?:hline|toprule|midrule|bottomrule|cline\s*\{[^}]*\}|cmidrule\s*(?:\([^)]*\))?\s*\{[^}]*\}|addlinespace(?:\[[^\]]*\])?)')
+CELL_SEPARATOR = re.compile(r'(?<!\\)&')
+
+
+def read_group(text: str, pos: int, open_char: str = '{', close_char: str = '}') -> Tuple[Optional[str], int]:
+    """
+    Read a balanced group starting at pos (after optional whitespace).
+
+    Returns:
+        Tuple[Optional[str], int]: The group's content and the position after
+        it, or (None, pos) if no group starts there.
+    """
+    start = pos
+    while start < len(text) and text[start] in ' \t\n':
+        start += 1
+    if start >= len(text) or text[start] != open_char:
+        return None, pos
+    depth = 0
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == open_char:
+            depth += 1
+        elif char == close_char:
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i], i + 1
+        i += 1
+    return text[start + 1:], len(text)
+
+
+def clean_latex(text: str) -> str:
+    """Light conversion of a caption or table cell to plain text."""
+    text = re.sub(r'(?<!\\)%.*', '', text)
+    text = re.sub(r'\\(?:label|ref|cref|Cref|cite[pt]?|footnote)\s*\{[^}]*\}', '', text)
+    text = re.sub(r'\\multi(?:column|row)\s*\{[^}]*\}\s*\{[^}]*\}', '', text)
+    text = re.sub(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?', '', text)
+    text = text.replace('\\%', '%').replace('\\&', '&').replace('\\_', '_').replace('~', ' ')
+    text = re.sub(r'[{}$]', '', text)
+    return ' '.join(text.split())
+
+
+def parse_table_rows(body: str) -> List[List[str]]:
+    rows = []
+    for raw_row in re.split(r'\\\\(?:\[[^\]]*\])?', body):
+        raw_row = RULE_PATTERN.sub('', raw_row)
+        cells = [clean_latex(cell) for cell in CELL_SEPARATOR.split(raw_row)]
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+
+@dataclass
+class Section:
+    level: int
+    title: str
+    start: int
+    end: int = -1
+    label: Optional[str] = None
+    # Filled in by LaTeXProcessor with the plain text of the section
+    text: str = ''
+
+
+@dataclass
+class Float:
+    kind: str
+    number: int
+    section: Optional[str] = None
+    caption: Optional[str] = None
+    label: Optional[str] = None
+    graphics: List[str] = field(default_factory=list)
+    subfigures: List[Dict[str, Any]] = field(default_factory=list)
+    rows: List[List[str]] = field(default_factory=list)
+
+
+@dataclass
+class LatexDocument:
+    sections: List[Section]
+    figures: List[Float]
+    tables: List[Float]
+    text: str = ''
+
+    def image_paths(self) -> List[str]:
+        """Resolved graphics of every figure, in document order, without duplicates."""
+        paths = []
+        for figure in self.figures:
+            for path in figure.graphics:
+                if path not in paths:
+                    paths.append(path)
+        return paths
+
+    def figure_metadata(self) -> List[Dict[str, Any]]:
+        """Figure records in the shape saved to figure_metadata.json."""
+        return [{
+            'figure': figure.number,
+            'section': figure.section,
+            'caption': figure.caption,
+            'label': figure.label,
+            'graphics': figure.graphics,
+            'subfigures': figure.subfigures,
+        } for figure in self.figures]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'sections': [asdict(section) for section in self.sections],
+            'figures': [asdict(figure) for figure in self.figures],
+            'tables': [asdict(table) for table in self.tables],
+        }
+
+
+class _Scope:
+    """An open figure/table float or a subfigure inside one."""
+    def __init__(self, name: str, target: Any):
+        self.name = name
+        self.target = target
+
+
+def parse_structure(latex: str, latex_dir: str) -> LatexDocument:
+    """
+    Parse a flattened LaTeX document in one pass over its tokens.
+
+    Args:
+        latex (str): The document, with includes already inlined.
+        latex_dir (str): Source directory, for resolving graphic paths.
+
+    Returns:
+        LatexDocument: Sections with their offsets (into the document with
+        comments removed), and figure/table floats with captions, labels,
+        resolved graphics and table rows.
+    """
+    latex = re.sub(r'(?<!\\)%.*', '', latex)
+    graphics_dirs = ['']
+    sections: List[Section] = []
+    floats: List[Float] = []
+    counters = {'figure': 0, 'table': 0}
+    scopes: List[_Scope] = []
+    skip_until = 0
+
+    def current_float() -> Optional[Float]:
+        for scope in reversed(scopes):
+            if isinstance(scope.target, Float):
+                return scope.target
+        return None
+
+    def add_graphic(reference: str):
+        path = resolve_graphic(reference, graphics_dirs, latex_dir)
+        owner = current_float()
+        if owner is None:
+            return
+        if scopes and not isinstance(scopes[-1].target, Float):
+            scopes[-1].target['graphics'].append(path)
+        owner.graphics.append(path)
+
+    for match in TOKEN_PATTERN.finditer(latex):
+        if match.start() < skip_until:
+            continue
+        if match.group('section'):
+            _, pos = read_group(latex, match.end(), '[', ']')
+            title, pos = read_group(latex, pos)
+            if sections:
+                sections[-1].end = match.start()
+            sections.append(Section(SECTION_LEVELS[match.group('section')], clean_latex(title or ''), match.start()))
+        elif match.group('begin'):
+            name = match.group('begin').strip()
+            if name in FLOAT_ENVIRONMENTS:
+                kind = FLOAT_ENVIRONMENTS[name]
+                counters[kind] += 1
+                floats.append(Float(kind, counters[kind], section=sections[-1].title if sections else None))
+                scopes.append(_Scope(name, floats[-1]))
+            elif name in SUBFIGURE_ENVIRONMENTS and current_float() is not None:
+                subfigure = {'caption': None, 'label': None, 'graphics': []}
+                current_float().subfigures.append(subfigure)
+                scopes.append(_Scope(name, subfigure))
+            elif name in TABULAR_ENVIRONMENTS:
+                end_match = re.compile(r'\\end\s*\{' + re.escape(name) + r'\}').search(latex, match.end())
+                body_end = end_match.start() if end_match else len(latex)
+                pos = match.end()
+                if name in ('tabular*', 'tabularx', 'tabulary'):
+                    _, pos = read_group(latex, pos)  # width
+                _, pos = read_group(latex, pos, '[', ']')
+                _, pos = read_group(latex, pos)  # column spec
+                rows = parse_table_rows(latex[pos:body_end])
+                owner = current_float()
+                if owner is None or owner.kind != 'table':
+                    counters['table'] += 1
+                    owner = Float('table', counters['table'], section=sections[-1].title if sections else None)
+                    floats.append(owner)
+                owner.rows.extend(rows)
+                skip_until = end_match.end() if end_match else len(latex)
+        elif match.group('end'):
+            name = match.group('end').strip()
+            if scopes and scopes[-1].name == name:
+                scopes.pop()
+        else:
+            command = match.group('command')
+            if command == 'graphicspath':
+                group, _ = read_group(latex, match.end())
+                graphics_dirs.extend(re.findall(r'\{([^}]*)\}', group or ''))
+            elif command == 'includegraphics':
+                _, pos = read_group(latex, match.end(), '[', ']')
+                reference, _ = read_group(latex, pos)
+                if reference:
+                    add_graphic(reference.strip())
+            elif command in ('subfloat', 'subfigure'):
+                # \subfloat[caption]{body}: the caption is the optional argument
+                caption, pos = read_group(latex, match.end(), '[', ']')
+                body, end = read_group(latex, pos)
+                owner = current_float()
+                if owner is None or body is None:
+                    continue
+                subfigure = {'caption': clean_latex(caption) if caption else None, 'label': None, 'graphics': []}
+                label = re.search(r'\\label\s*\{([^}]*)\}', body)
+                if label:
+                    subfigure['label'] = label.group(1).strip()
+                owner.subfigures.append(subfigure)
+                scopes.append(_Scope('\\' + command, subfigure))
+                for graphic in re.finditer(r'\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}', body):
+                    add_graphic(graphic.group(1).strip())
+                scopes.pop()
+                skip_until = end
+            elif command == 'caption':
+                _, pos = read_group(latex, match.end(), '[', ']')
+                caption, _ = read_group(latex, pos)
+                if scopes and caption is not None:
+                    target = scopes[-1].target
+                    if isinstance(target, Float):
+                        target.caption = clean_latex(caption)
+                    else:
+                        target['caption'] = clean_latex(caption)
+            elif command == 'label':
+                label, _ = read_group(latex, match.end())
+                if label is None:
+                    continue
+                if scopes:
+                    target = scopes[-1].target
+                    if isinstance(target, Float):
+                        target.label = target.label or label.strip()
+                    else:
+                        target['label'] = target['label'] or label.strip()
+                elif sections and sections[-1].label is None:
+                    sections[-1].label = label.strip()
+
+    if sections:
+        sections[-1].end = len(latex)
+    return LatexDocument(sections,
+                         [item for item in floats if item.kind == 'figure'],
+                         [item for item in floats if item.kind == 'table'])
+
+
+def resolve_graphic(reference: str, graphics_dirs: List[str], latex_dir: str) -> str:
+    """
+    Resolve an \\includegraphics target the way LaTeX does: relative to the
+    source directory, then each \\graphicspath entry, trying known extensions
+    when none is given. Unresolvable references are returned relative to latex_dir.
+    """
+    for directory in graphics_dirs:
+        for extension in ('',) + GRAPHIC_EXTENSIONS:
+            candidate = os.path.normpath(os.path.join(latex_dir, directory, reference + extension))
+            if os.path.isfile(candidate):
+                return candidate
+    return os.path.normpath(os.path.join(latex_dir, reference))
@@ -0,0 +1,103 @@
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pytesseract
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker():
+    # Each worker already owns a core; stop Tesseract from spawning its own threads
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _ocr_page(page_array: np.ndarray, lang: str, config: str, timeout: float) -> Tuple[str, float]:
+    start = time.perf_counter()
+    text = pytesseract.image_to_string(page_array, lang=lang, config=config, timeout=timeout)
+    return text, time.perf_counter() - start
+
+
+class OCRPool:
+    """
+    Process-pool Tesseract OCR for scanned pages.
+
+    Pages are pulled lazily from the input iterable, so rasterization overlaps
+    with OCR and at most ``max_pending`` page arrays are in flight at a time.
+    Results come back in input order. A page that times out or fails is retried
+    up to ``retries`` times and then returned as an empty string.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: float = 120, retries: int = 1,
+                 lang: str = "eng", config: str = "", max_pending: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.retries = retries
+        self.lang = lang
+        self.config = config
+        self.max_pending = max_pending or 2 * self.workers
+        self.stats = {}
+
+    def ocr_pages(self, pages: Iterable[Tuple[int, np.ndarray]]) -> List[str]:
+        """
+        OCR a stream of pages.
+
+        Args:
+            pages (Iterable[Tuple[int, np.ndarray]]): (page number, RGB array) pairs.
+
+        Returns:
+            List[str]: The text of each page, in input order.
+        """
+        start = time.perf_counter()
+        results: Dict[int, str] = {}
+        latencies: List[float] = []
+        failed: List[int] = []
+        page_iter = enumerate(pages)
+        exhausted = False
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            # future -> (position, page number, page array, attempt)
+            pending = {}
+
+            def submit(position, page_num, page_array, attempt):
+                future = pool.submit(_ocr_page, page_array, self.lang, self.config, self.timeout)
+                pending[future] = (position, page_num, page_array, attempt)
+
+            while pending or not exhausted:
+                while not exhausted and len(pending) < self.max_pending:
+                    try:
+                        position, (page_num, page_array) = next(page_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    submit(position, page_num, page_array, 0)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position, page_num, page_array, attempt = pending.pop(future)
+                    try:
+                        text, latency = future.result()
+                        results[position] = text
+                        latencies.append(latency)
+                    except Exception as e:
+                        if attempt < self.retries:
+                            submit(position, page_num, page_array, attempt + 1)
+                        else:
+                            logger.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
+                            results[position] = ""
+                            failed.append(page_num)
+
+        elapsed = time.perf_counter() - start
+        self.stats = {
+            'pages': len(results),
+            'failed_pages': sorted(failed),
+            'seconds': round(elapsed, 3),
+            'pages_per_sec': round(len(results) / elapsed, 3) if elapsed else 0.0,
+            'mean_page_latency': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'max_page_latency': round(max(latencies), 3) if latencies else 0.0,
+        }
+        return [results[position] for position in range(len(results))]
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+# A renderer takes (first_page, last_page), 0-based and inclusive, and returns
+# RGB uint8 arrays for those pages in order.
+PageRenderer = Callable[[int, int], List[np.ndarray]]
+
+
+class PageRasterCache:
+    """
+    Per-document cache of rendered page rasters shared by text OCR, figure
+    detection and caption OCR.
+
+    Pages are held in memory as RGB arrays in LRU order, bounded by
+    ``max_bytes``. Pages are rendered lazily, one at a time, on first access.
+    When a ``spill_dir`` is given, pages evicted from memory are written to a
+    per-document directory under it as ``.npy`` files instead of being dropped,
+    so a page is rasterized at most once per document. A spilled page keeps its
+    file when it is loaded back, so evicting it again costs no write.
+    """
+
+    def __init__(self, render_pages: PageRenderer, page_count: int,
+                 max_bytes: int = 512 * 1024 * 1024, spill_dir: Optional[str] = None):
+        self.render_pages = render_pages
+        self.page_count = page_count
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._pages: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._spilled: Dict[int, str] = {}
+        # Created on first spill, so documents sharing a spill_dir never overwrite each other's pages
+        self._spill_path: Optional[str] = None
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "pages_rendered": 0, "spilled": 0}
+
+    def get(self, page_num: int) -> np.ndarray:
+        """
+        Return the RGB raster of a page, rendering it on first access.
+
+        Args:
+            page_num (int): 0-based page index.
+
+        Returns:
+            np.ndarray: The page as an RGB uint8 array. Treat it as read-only.
+        """
+        if not 0 <= page_num < self.page_count:
+            raise IndexError(f"Page {page_num} out of range (document has {self.page_count} pages)")
+        with self._lock:
+            if page_num in self._pages:
+                self._pages.move_to_end(page_num)
+                self.stats["hits"] += 1
+                return self._pages[page_num]
+            if page_num in self._spilled:
+                self.stats["hits"] += 1
+                array = np.load(self._spilled[page_num])
+                self._store(page_num, array)
+                return array
+            self.stats["misses"] += 1
+            array = self.render_pages(page_num, page_num)[0]
+            self.stats["pages_rendered"] += 1
+            self._store(page_num, array)
+            return array
+
+    def get_image(self, page_num: int) -> Image.Image:
+        return Image.fromarray(self.get(page_num))
+
+    def __iter__(self):
+        for page_num in range(self.page_count):
+            yield page_num, self.get(page_num)
+
+    def __len__(self):
+        return self.page_count
+
+    def clear(self):
+        with self._lock:
+            if self._spill_path is not None:
+                shutil.rmtree(self._spill_path, ignore_errors=True)
+                self._spill_path = None
+            self._pages.clear()
+            self._spilled.clear()
+            self._bytes = 0
+
+    def _store(self, page_num: int, array: np.ndarray):
+        array.setflags(write=False)
+        self._pages[page_num] = array
+        self._pages.move_to_end(page_num)
+        self._bytes += array.nbytes
+        while self._bytes > self.max_bytes and len(self._pages) > 1:
+            evicted_num, evicted = self._pages.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            if self.spill_dir is not None and evicted_num not in self._spilled:
+                self._spill(evicted_num, evicted)
+
+    def _spill(self, page_num: int, array: np.ndarray):
+        if self._spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._spill_path = tempfile.mkdtemp(prefix="pages_", dir=self.spill_dir)
+        path = os.path.join(self._spill_path, f"page_{page_num + 1}.npy")
+        np.save(path, array)
+        self._spilled[page_num] = path
+        self.stats["spilled"] += 1
@@ -0,0 +1,82 @@
+import cv2
+import pymupdf as fitz
+import numpy as np
+
+CANDIDATE = "candidate"
+TEXT_ONLY = "text-only"
+
+
+class FigurePageFilter:
+    """
+    Cheap pre-screen that decides which pages are worth sending to the figure detector.
+
+    Born-digital pages are classified from PyMuPDF's listings: any sizeable
+    embedded image or a cluster of vector drawing operations (plots, diagrams)
+    makes a page a candidate. Pages that are a single full-page scan carry no
+    such signal, so they are classified from a downscaled raster instead: prose
+    shows up as short runs of inked rows separated by line gaps, while figures
+    produce long uninterrupted runs.
+    """
+
+    def __init__(self, min_image_area_ratio: float = 0.02, min_drawings: int = 20,
+                 scanned_page_area_ratio: float = 0.8, min_ink_run_ratio: float = 0.06,
+                 raster_height: int = 1000):
+        self.min_image_area_ratio = min_image_area_ratio
+        self.min_drawings = min_drawings
+        self.scanned_page_area_ratio = scanned_page_area_ratio
+        self.min_ink_run_ratio = min_ink_run_ratio
+        self.raster_height = raster_height
+
+    def needs_raster(self, page) -> bool:
+        """
+        True if the page is essentially one full-page image (a scan), in which
+        case the PDF listings say nothing about its layout.
+        """
+        page_area = abs(page.rect)
+        return any(abs(fitz.Rect(info["bbox"])) >= self.scanned_page_area_ratio * page_area
+                   for info in page.get_image_info())
+
+    def classify_page(self, page) -> str:
+        """
+        Classify a born-digital page from its embedded images and vector drawings.
+
+        Args:
+            page (fitz.Page): The PyMuPDF page.
+
+        Returns:
+            str: "candidate" or "text-only".
+        """
+        page_area = abs(page.rect)
+        for info in page.get_image_info():
+            if abs(fitz.Rect(info["bbox"])) >= self.min_image_area_ratio * page_area:
+                return CANDIDATE
+        if len(page.get_drawings()) >= self.min_drawings:
+            return CANDIDATE
+        return TEXT_ONLY
+
+    def classify_raster(self, page_array: np.ndarray) -> str:
+        """
+        Classify a page from its RGB raster using the horizontal ink profile.
+
+        Args:
+            page_array (np.ndarray): RGB page raster.
+
+        Returns:
+            str: "candidate" or "text-only".
+        """
+        height, width = page_array.shape[:2]
+        scale = min(1.0, self.raster_height / height)
+        small = cv2.resize(page_array, (max(1, int(width * scale)), max(1, int(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+        _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        if ink.mean() < 0.005:  # Blank page
+            return TEXT_ONLY
+        inked_rows = ink.mean(axis=1) > 0.01
+        longest_run = run = 0
+        for inked in inked_rows:
+            run = run + 1 if inked else 0
+            longest_run = max(longest_run, run)
+        if longest_run >= self.min_ink_run_ratio * len(inked_rows):
+            return CANDIDATE
+        return TEXT_ONLY
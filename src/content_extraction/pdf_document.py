@@ -0,0 +1,178 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pymupdf as fitz
+
+
+NATIVE_TEXT = "text"
+NEEDS_OCR = "ocr"
+
+
+@dataclass
+class TextBlock:
+    """A block of text on a page, with its bounding box in PDF points (1/72 inch)."""
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    text: str
+
+
+class PDFDocument:
+    """
+    Single PyMuPDF handle serving everything the content extractors need from a PDF:
+    page text, positioned text blocks, embedded images and rasters at any DPI.
+
+    The file is opened and parsed once. Text is extracted per page on first
+    request and memoized; rasters are rendered only when asked for. PyMuPDF
+    documents are not thread-safe, so all access goes through one lock.
+    """
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.doc = fitz.open(pdf_path)
+        self._lock = threading.RLock()
+        self._text: Dict[int, str] = {}
+        self._blocks: Dict[int, List[TextBlock]] = {}
+        self._page_kinds: Dict[Tuple[int, float], List[str]] = {}
+
+    def __len__(self):
+        return self.doc.page_count
+
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    def page(self, page_num: int) -> fitz.Page:
+        return self.doc[page_num]
+
+    def page_text(self, page_num: int) -> str:
+        if page_num not in self._text:
+            with self._lock:
+                self._text[page_num] = self.doc[page_num].get_text("text")
+        return self._text[page_num]
+
+    def text_blocks(self, page_num: int) -> List[TextBlock]:
+        """
+        Return the text blocks of a page in reading order.
+
+        Args:
+            page_num (int): 0-based page index.
+
+        Returns:
+            List[TextBlock]: Text blocks with coordinates in PDF points.
+        """
+        if page_num not in self._blocks:
+            with self._lock:
+                raw_blocks = self.doc[page_num].get_text("blocks", sort=True)
+            # Block tuples are (x0, y0, x1, y1, text, block_no, block_type); type 1 is an image
+            self._blocks[page_num] = [
+                TextBlock(x0, y0, x1, y1, text.strip())
+                for x0, y0, x1, y1, text, _, block_type in raw_blocks
+                if block_type == 0 and text.strip()
+            ]
+        return self._blocks[page_num]
+
+    def classify_pages(self, min_chars: int = 100, min_image_ratio: float = 0.5) -> List[str]:
+        """
+        Decide per page whether to use the native text layer or OCR.
+
+        A page is sent to OCR only if its text layer is nearly empty and an
+        image covers a large part of it, so cover images, scanned appendices and
+        figure-only pages are each handled on their own merits. Results are
+        cached on the document per parameter set.
+
+        Args:
+            min_chars (int): Pages with at least this many text characters use the text layer.
+            min_image_ratio (float): Minimum share of the page an image must cover to be worth OCR-ing.
+
+        Returns:
+            List[str]: "text" or "ocr" for each page.
+        """
+        key = (min_chars, min_image_ratio)
+        if key not in self._page_kinds:
+            kinds = []
+            for page_num in range(self.page_count):
+                if len(self.page_text(page_num).strip()) >= min_chars:
+                    kinds.append(NATIVE_TEXT)
+                    continue
+                page_area = abs(self.doc[page_num].rect)
+                has_large_image = any(abs(fitz.Rect(info["bbox"])) >= min_image_ratio * page_area
+                                      for info in self.images(page_num))
+                kinds.append(NEEDS_OCR if has_large_image else NATIVE_TEXT)
+            self._page_kinds[key] = kinds
+        return self._page_kinds[key]
+
+    def find_tables(self, page_num: int, clip: Optional[Sequence[float]] = None
+                    ) -> List[Tuple[Tuple[float, float, float, float], List[str], List[List[str]]]]:
+        """
+        Detect tables on a page with PyMuPDF's table finder.
+
+        Args:
+            page_num (int): 0-based page index.
+            clip (Optional[Sequence[float]]): Only look inside this box (PDF points).
+
+        Returns:
+            List[Tuple[bbox, header, rows]]: Per table its bbox in PDF points, the
+            header cells (empty if PyMuPDF found none) and the body rows.
+        """
+        with self._lock:
+            page = self.doc[page_num]
+            found = page.find_tables(clip=fitz.Rect(clip) if clip is not None else None)
+            tables = []
+            for table in found.tables:
+                rows = [[' '.join((cell or '').split()) for cell in row] for row in table.extract()]
+                header = [' '.join((name or '').split()) for name in table.header.names]
+                # Unless the header sits outside the table box, it is also the first extracted row
+                if header and not table.header.external and rows and rows[0] == header:
+                    rows = rows[1:]
+                if not any(header):
+                    header = []
+                tables.append((tuple(table.bbox), header, rows))
+        return tables
+
+    def images(self, page_num: int) -> List[dict]:
+        """
+        List the images embedded in a page.
+
+        Returns:
+            List[dict]: PyMuPDF image info dicts (``xref``, ``bbox``, ``width``, ``height``, ...).
+        """
+        with self._lock:
+            return self.doc[page_num].get_image_info(xrefs=True)
+
+    def extract_image(self, xref: int) -> dict:
+        with self._lock:
+            return self.doc.extract_image(xref)
+
+    def render(self, page_num: int, dpi: int = 200) -> np.ndarray:
+        """
+        Rasterize a page.
+
+        Args:
+            page_num (int): 0-based page index.
+            dpi (int): Output resolution.
+
+        Returns:
+            np.ndarray: The page as an RGB uint8 array.
+        """
+        with self._lock:
+            pixmap = self.doc[page_num].get_pixmap(dpi=dpi, colorspace=fitz.csRGB, alpha=False)
+        array = np.frombuffer(pixmap.samples, dtype=np.uint8)
+        return array.reshape(pixmap.height, pixmap.stride)[:, :pixmap.width * 3].reshape(
+            pixmap.height, pixmap.width, 3).copy()
+
+    def render_pages(self, first_page: int, last_page: int, dpi: int = 200) -> List[np.ndarray]:
+        return [self.render(page_num, dpi) for page_num in range(first_page, last_page + 1)]
+
+    def close(self):
+        with self._lock:
+            self.doc.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
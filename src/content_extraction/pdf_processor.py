@@ -1,107 +1,218 @@
-import pymupdf as fitz 
-from pdf2image import convert_from_path
 import cv2
+import logging
 import numpy as np
-import os
-from PIL import Image
-from transformers import AutoProcessor, AutoModelForCausalLM
 import torch
-import json
-import PyPDF2
 import pytesseract
-from typing import List, Tuple
-
-def get_device():
-    if torch.backends.mps.is_available():
-        return torch.device('mps')
-    elif torch.cuda.is_available():
-        return torch.device('cuda')
-    else:
-        return torch.device('cpu')
-
-def convert_pdf_to_images(pdf_path: str, output_folder: str) -> List[str]:
-    pages = convert_from_path(pdf_path)
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-    image_paths = []
-    for i, page in enumerate(pages):
-        image_path = os.path.join(output_folder, f'page_{i+1}.png')
-        page.save(image_path, 'PNG')
-        image_paths.append(image_path)
-    return image_paths
+import time
+from typing import Dict, List, Optional, Tuple
+from .page_cache import PageRasterCache
+from .pdf_document import NEEDS_OCR, PDFDocument
+from .caption_index import CaptionIndex
+from .ocr import OCRPool
+from .detector_registry import TFT_ID_MODEL_ID, DetectorHandle, get_detector, get_device
+from .page_filter import CANDIDATE, FigurePageFilter
+from .table_extractor import PDFTableExtractor, TableRecord
+
+logger = logging.getLogger(__name__)
 
 class PDFProcessor:
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, dpi: int = 200, raster_cache_bytes: int = 512 * 1024 * 1024,
+                 raster_spill_dir: Optional[str] = None, model_id: str = TFT_ID_MODEL_ID, device=None,
+                 dtype: Optional[torch.dtype] = None, detection_batch_size: int = 4, num_beams: int = 3,
+                 fast_detection: bool = False, page_filter: Optional[FigurePageFilter] = None,
+                 force_full_detection: bool = False, ocr_workers: Optional[int] = None,
+                 ocr_timeout: float = 120, min_text_chars: int = 100):
         self.pdf_path = pdf_path
-        self.model = AutoModelForCausalLM.from_pretrained("yifeihu/TFT-ID-1.0", trust_remote_code=True)
-        self.processor = AutoProcessor.from_pretrained("yifeihu/TFT-ID-1.0", trust_remote_code=True)
-        self.device = get_device()
-        self.model.to(self.device)
-        self.pdf_reader = PyPDF2.PdfReader(self.pdf_path)
-        self.is_scanned = self._check_if_scanned()
-
-    def _check_if_scanned(self) -> bool:
-        # Check the first few pages for meaningful text
-        for i in range(min(3, len(self.pdf_reader.pages))):
-            text = self.pdf_reader.pages[i].extract_text().strip()
-            if len(text) > 100:  # Arbitrary threshold
-                return False
-        return True
+        self.dpi = dpi
+        self.detection_batch_size = max(1, detection_batch_size)
+        self.num_beams = num_beams
+        # Greedy decoding: roughly num_beams times cheaper, slightly looser boxes
+        self.fast_detection = fast_detection
+        self.page_filter = page_filter or FigurePageFilter()
+        # Skip the pre-filter and run the detector on every page, e.g. to audit what it misses
+        self.force_full_detection = force_full_detection
+        self.detection_stats = {}
+        # TFT-ID "table" boxes in PDF points per 0-based page, filled during figure detection
+        self.table_regions: Dict[int, List[List[float]]] = {}
+        self.ocr_pool = OCRPool(workers=ocr_workers, timeout=ocr_timeout)
+        self.model_id = model_id
+        self.device = torch.device(device) if device is not None else get_device()
+        self.dtype = dtype
+        self._detector: Optional[DetectorHandle] = None
+        self.document = PDFDocument(self.pdf_path)
+        self.min_text_chars = min_text_chars
+        self.page_kinds = self.document.classify_pages(self.min_text_chars)
+        self.caption_index = CaptionIndex(self.document)
+        self.page_cache = PageRasterCache(
+            lambda first, last: self.document.render_pages(first, last, self.dpi),
+            page_count=self.document.page_count,
+            max_bytes=raster_cache_bytes,
+            spill_dir=raster_spill_dir,
+        )
+
+    @property
+    def detector(self) -> DetectorHandle:
+        # Borrowed from the process-wide registry on first use, so only the first
+        # paper in a run pays the model load.
+        if self._detector is None:
+            self._detector = get_detector(self.model_id, self.device, self.dtype)
+        return self._detector
+
+    @property
+    def model(self):
+        return self.detector.model
+
+    @property
+    def processor(self):
+        return self.detector.processor
+
+    @property
+    def is_scanned(self) -> bool:
+        return bool(self.page_kinds) and all(kind == NEEDS_OCR for kind in self.page_kinds)
+
+    def _needs_ocr(self, page_num: int) -> bool:
+        return self.page_kinds[page_num] == NEEDS_OCR
 
     def extract_content(self) -> Tuple[str, List[Tuple[int, np.ndarray]], List[dict]]:
         text = self._extract_text()
         images, figures = self._extract_images_and_figures()
+        # Rasters are only needed while extracting; release them (and any spilled pages)
+        self.page_cache.clear()
         return text, images, figures
 
+    def extract_tables(self) -> List[TableRecord]:
+        """
+        Extract tables with PyMuPDF's table finder, restricted to the table boxes
+        TFT-ID found (run extract_content first) plus pages with a "Table N"
+        caption and no detected box. Scanned pages have no text layer to read
+        cells from and are skipped.
+        """
+        extractor = PDFTableExtractor(self.document)
+        regions = {page_num: boxes for page_num, boxes in self.table_regions.items()}
+        for page_num in extractor.candidate_pages():
+            regions.setdefault(page_num, [None])
+        regions = {page_num: boxes for page_num, boxes in regions.items() if not self._needs_ocr(page_num)}
+        return extractor.extract(regions)
+
+    def close(self):
+        self.page_cache.clear()
+        self.table_regions = {}
+        self.document.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _extract_text(self) -> str:
-        if not self.is_scanned:
-            return "\n".join(page.extract_text() for page in self.pdf_reader.pages)
-        else:
-            # Use OCR for scanned PDFs
-            text = ""
-            temp_folder = f'temp_{os.path.splitext(os.path.basename(self.pdf_path))[0]}'
-            image_paths = convert_pdf_to_images(self.pdf_path, temp_folder)
-            for image_path in image_paths:
-                text += pytesseract.image_to_string(Image.open(image_path)) + "\n"
-            # Clean up temporary files
-            for image_path in image_paths:
-                os.remove(image_path)
-            os.rmdir(temp_folder)
-            return text
+        page_texts = [self.document.page_text(i) for i in range(self.document.page_count)]
+        ocr_pages = [i for i in range(self.document.page_count) if self._needs_ocr(i)]
+        if ocr_pages:
+            # Only low-text scanned pages go to OCR; pages stream from the raster cache into the pool
+            ocr_texts = self.ocr_pool.ocr_pages((i, self.page_cache.get(i)) for i in ocr_pages)
+            for page_num, text in zip(ocr_pages, ocr_texts):
+                page_texts[page_num] = text
+            logger.info(f"OCR'd {self.ocr_pool.stats['pages']}/{len(page_texts)} pages at "
+                        f"{self.ocr_pool.stats['pages_per_sec']:.2f} pages/sec")
+        return "\n".join(page_texts)
 
-    def _extract_images_and_figures(self) -> Tuple[List[Tuple[int, np.ndarray]], List[dict]]:
-        images = []
-        figures = []
-        temp_folder = f'temp_{os.path.splitext(os.path.basename(self.pdf_path))[0]}'
-        image_paths = convert_pdf_to_images(self.pdf_path, temp_folder)
-        
-        for i, image_path in enumerate(image_paths):
-            page = Image.open(image_path)
-            np_image = np.array(page)
-            np_image = cv2.cvtColor(np_image, cv2.COLOR_RGB2BGR)
-            
-            inputs = self.processor(text=["<OD>"], images=[page], return_tensors="pt", padding=True)
+    def detect_objects(self, page_nums: Optional[List[int]] = None) -> Dict[int, List[Tuple[List[float], str]]]:
+        """
+        Run TFT-ID object detection, packing up to ``detection_batch_size`` pages
+        into each ``generate`` call.
+
+        Args:
+            page_nums (List[int], optional): 0-based pages to run on. Defaults to all pages.
+
+        Returns:
+            Dict[int, List[Tuple[List[float], str]]]: (bbox, label) detections per page,
+            with bboxes in raster pixel coordinates.
+        """
+        if page_nums is None:
+            page_nums = list(range(len(self.page_cache)))
+        num_beams = 1 if self.fast_detection else self.num_beams
+        detections = {}
+        for start in range(0, len(page_nums), self.detection_batch_size):
+            batch = page_nums[start:start + self.detection_batch_size]
+            pages = [self.page_cache.get_image(i) for i in batch]
+
+            inputs = self.processor(text=["<OD>"] * len(pages), images=pages, return_tensors="pt", padding=True)
             inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
+            inputs["pixel_values"] = inputs["pixel_values"].to(self.detector.dtype)
+
             with torch.no_grad():
                 generated_ids = self.model.generate(
                     input_ids=inputs["input_ids"],
                     pixel_values=inputs["pixel_values"],
                     max_new_tokens=1024,
                     do_sample=False,
-                    num_beams=3
+                    num_beams=num_beams
                 )
-            
-            generated_text = self.processor.batch_decode(generated_ids, skip_special_tokens=False)[0]
-            parsed_answer = self.processor.post_process_generation(generated_text, task="<OD>", image_size=(page.width, page.height))
-            
-            for k, (bbox, label) in enumerate(zip(parsed_answer['<OD>']['bboxes'], parsed_answer['<OD>']['labels'])):
+
+            generated_texts = self.processor.batch_decode(generated_ids, skip_special_tokens=False)
+            for page_num, page, generated_text in zip(batch, pages, generated_texts):
+                parsed_answer = self.processor.post_process_generation(generated_text, task="<OD>", image_size=(page.width, page.height))
+                detections[page_num] = list(zip(parsed_answer['<OD>']['bboxes'], parsed_answer['<OD>']['labels']))
+        return detections
+
+    def select_candidate_pages(self) -> List[int]:
+        """
+        Pre-screen pages and return the 0-based pages that may contain figures.
+
+        Returns:
+            List[int]: Pages to send to the detector.
+        """
+        page_nums = list(range(len(self.page_cache)))
+        if self.force_full_detection:
+            return page_nums
+        candidates = []
+        for page_num in page_nums:
+            page = self.document.page(page_num)
+            if self.page_filter.needs_raster(page):
+                kind = self.page_filter.classify_raster(self.page_cache.get(page_num))
+            else:
+                kind = self.page_filter.classify_page(page)
+            if kind == CANDIDATE:
+                candidates.append(page_num)
+        return candidates
+
+    def _extract_images_and_figures(self) -> Tuple[List[Tuple[int, np.ndarray]], List[dict]]:
+        images = []
+        figures = []
+
+        filter_start = time.perf_counter()
+        candidates = self.select_candidate_pages()
+        filter_seconds = time.perf_counter() - filter_start
+        detect_start = time.perf_counter()
+        detections = self.detect_objects(candidates)
+        detect_seconds = time.perf_counter() - detect_start
+        skipped = len(self.page_cache) - len(candidates)
+        seconds_per_page = detect_seconds / len(candidates) if candidates else 0.0
+        self.detection_stats = {
+            'pages': len(self.page_cache),
+            'pages_detected': len(candidates),
+            'pages_skipped': skipped,
+            'filter_seconds': round(filter_seconds, 3),
+            'detection_seconds': round(detect_seconds, 3),
+            # Estimated from the measured per-page detection cost
+            'seconds_saved': round(max(0.0, skipped * seconds_per_page - filter_seconds), 3),
+        }
+        logger.info(f"Figure pre-filter skipped {skipped}/{len(self.page_cache)} pages, "
+                    f"saving ~{self.detection_stats['seconds_saved']:.1f}s of detection")
+
+        for i in sorted(detections):
+            np_page = self.page_cache.get(i)
+            page_height = np_page.shape[0]
+            for bbox, label in detections[i]:
+                if label == 'table':
+                    self.table_regions.setdefault(i, []).append([v * 72 / self.dpi for v in bbox])
                 if label == 'figure':
                     x1, y1, x2, y2 = map(int, bbox)
-                    cropped = np_image[y1:y2, x1:x2]
+                    cropped = cv2.cvtColor(np_page[y1:y2, x1:x2], cv2.COLOR_RGB2BGR)
                     images.append((i+1, cropped))
                     
-                    caption = self._extract_caption(i, y2, page.height)
+                    caption = self._extract_caption(i, (x1, y1, x2, y2), page_height)
                     
                     figures.append({
                         'page': i+1,
@@ -109,42 +220,25 @@ class PDFProcessor:
                         'caption': caption
                     })
         
-        # Clean up temporary files
-        for image_path in image_paths:
-            os.remove(image_path)
-        os.rmdir(temp_folder)
-        
         return images, figures
 
-    def _extract_caption(self, page_num: int, y_start: int, y_end: int) -> str:
-        if not self.is_scanned:
-            page_text = self.pdf_reader.pages[page_num].extract_text()
-            lines = page_text.split('\n')
-            
-            # Estimate the line containing the figure based on y_start
-            start_line = int(y_start / y_end * len(lines))
-            
-            # Look for lines starting with "Figure" or "Fig." after the estimated start line
-            for line in lines[start_line:]:
-                if line.strip().lower().startswith(('figure', 'fig.')):
-                    return line.strip()
+    def _extract_caption(self, page_num: int, bbox: Tuple[int, int, int, int], page_height: int) -> str:
+        if not self._needs_ocr(page_num):
+            # Detector boxes are in raster pixels; text blocks are in PDF points
+            scale = 72 / self.dpi
+            caption = self.caption_index.match(page_num, [v * scale for v in bbox])
+            if caption:
+                return ' '.join(caption.text.split())
         else:
-            # For scanned PDFs, use OCR on the specific area below the figure
-            temp_folder = f'temp_{os.path.splitext(os.path.basename(self.pdf_path))[0]}'
-            image_paths = convert_pdf_to_images(self.pdf_path, temp_folder)
-            page_image = Image.open(image_paths[page_num])
+            # For scanned pages, use OCR on the specific area below the figure
+            page_array = self.page_cache.get(page_num)
             
             # Crop the image to the area below the figure
-            caption_area = page_image.crop((0, y_start, page_image.width, y_end))
+            caption_area = page_array[bbox[3]:page_height, :]
             
             # Use OCR to extract text from the cropped area
             caption_text = pytesseract.image_to_string(caption_area)
             
-            # Clean up temporary files
-            for image_path in image_paths:
-                os.remove(image_path)
-            os.rmdir(temp_folder)
-            
             # Clean up the extracted text (remove newlines, extra spaces)
             return ' '.join(caption_text.split())
         
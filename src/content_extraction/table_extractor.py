@@ -0,0 +1,134 @@
+import json
+import re
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .caption_index import TABLE_CAPTION_PATTERN, CaptionIndex
+from .latex_structure import LatexDocument
+
+if TYPE_CHECKING:  # LaTeX tables and saved records must not need PyMuPDF
+    from .pdf_document import PDFDocument
+
+CAPTION_PREFIX = re.compile(r'^\s*(?:table|tab\.)\s*[A-Z]?(\d+)\s*[:.]?\s*(.*)$', re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class TableRecord:
+    """A table as a header plus rows of cell strings, with where it came from."""
+    source: str
+    number: int
+    header: List[str]
+    rows: List[List[str]]
+    caption: Optional[str] = None
+    label: Optional[str] = None
+    page: Optional[int] = None
+    bbox: Optional[List[float]] = None
+
+    @property
+    def title(self) -> str:
+        title = f"Table {self.number}"
+        return f"{title}: {self.caption}" if self.caption else title
+
+    def to_text(self, max_rows: int = 40) -> str:
+        """Compact pipe-separated rendering for prompts."""
+        lines = [self.title, ' | '.join(self.header)]
+        lines.extend(' | '.join(row) for row in self.rows[:max_rows])
+        if len(self.rows) > max_rows:
+            lines.append(f"... {len(self.rows) - max_rows} more rows")
+        return '\n'.join(lines)
+
+    def to_sentences(self) -> str:
+        """
+        One "key: value" line per cell, the shape the numeric pattern bank
+        matches ("Batch size: 2048", "GPT-3, Params: 175B").
+        """
+        lines = []
+        key_value = len(self.header) == 2
+        if key_value and self.header[0] and self.header[1]:
+            lines.append(f"{self.header[0]}: {self.header[1]}")
+        for row in self.rows:
+            if not row or not row[0]:
+                continue
+            if key_value:
+                lines.append(f"{row[0]}: {row[1] if len(row) > 1 else ''}")
+                continue
+            for column, cell in zip(self.header[1:], row[1:]):
+                if cell:
+                    lines.append(f"{row[0]}, {column}: {cell}")
+        return '\n'.join(lines)
+
+
+def _split_header(rows: List[List[str]]) -> Tuple[List[str], List[List[str]]]:
+    if not rows:
+        return [], []
+    width = max(len(row) for row in rows)
+    padded = [row + [''] * (width - len(row)) for row in rows]
+    return padded[0], padded[1:]
+
+
+def tables_from_latex(document: LatexDocument) -> List[TableRecord]:
+    """Turn the tabulars found by parse_structure into records, first row as header."""
+    tables = []
+    for table in document.tables:
+        if not table.rows:
+            continue
+        header, rows = _split_header(table.rows)
+        tables.append(TableRecord('latex', table.number, header, rows, table.caption, table.label))
+    return tables
+
+
+class PDFTableExtractor:
+    """
+    Finds tables in a PDF with PyMuPDF's ``find_tables``.
+
+    Running table detection on every page is slow, so it only runs inside the
+    given regions (e.g. TFT-ID "table" boxes) or, without regions, on pages
+    that have a "Table N" caption.
+    """
+
+    def __init__(self, document: "PDFDocument"):
+        self.document = document
+        self.caption_index = CaptionIndex(document, TABLE_CAPTION_PATTERN)
+
+    def candidate_pages(self) -> List[int]:
+        return [page_num for page_num in range(self.document.page_count)
+                if self.caption_index.caption_blocks(page_num)]
+
+    def extract(self, regions: Optional[Dict[int, List[Sequence[float]]]] = None) -> List[TableRecord]:
+        """
+        Args:
+            regions (Optional[Dict[int, List[Sequence[float]]]]): Table boxes in
+                PDF points per 0-based page; whole candidate pages if omitted.
+
+        Returns:
+            List[TableRecord]: Tables in page order, numbered from their captions
+            where possible.
+        """
+        if regions is None:
+            regions = {page_num: [None] for page_num in self.candidate_pages()}
+        tables = []
+        for page_num in sorted(regions):
+            for clip in regions[page_num]:
+                for bbox, header, rows in self.document.find_tables(page_num, clip):
+                    if not header and not rows:
+                        continue
+                    if not header:
+                        header, rows = _split_header(rows)
+                    caption_block = self.caption_index.match(page_num, bbox)
+                    number, caption = len(tables) + 1, None
+                    # "Table 3: Hyperparameters." -> number 3, caption "Hyperparameters."
+                    found = CAPTION_PREFIX.match(' '.join(caption_block.text.split())) if caption_block else None
+                    if found:
+                        number, caption = int(found.group(1)), found.group(2) or None
+                    tables.append(TableRecord('pdf', number, header, rows, caption, page=page_num + 1, bbox=list(bbox)))
+        return tables
+
+
+def save_tables(tables: List[TableRecord], path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([asdict(table) for table in tables], f, indent=2)
+
+
+def load_tables(path: str) -> List[TableRecord]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [TableRecord(**table) for table in json.load(f)]
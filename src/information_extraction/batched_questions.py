@@ -0,0 +1,62 @@
+import json
+import re
+from typing import Dict, List
+
+
+def question_key(index: int) -> str:
+    return f"q{index + 1}"
+
+
+def build_batched_prompt(summary: str, questions: List[str], source: str = "an AI model paper") -> str:
+    """
+    Build a single prompt asking every question about the same summary at once.
+
+    Args:
+        summary (str): The summary the answers should be based on.
+        questions (List[str]): Questions to answer.
+        source (str): What the summary was taken from, used in the instructions.
+
+    Returns:
+        str: The prompt. Answers are requested as a JSON object keyed "q1", "q2", ...
+    """
+    numbered = "\n".join(f"{question_key(i)}: {question}" for i, question in enumerate(questions))
+    return f"""Based on the following summary of {source}, answer each of the questions below concisely.
+
+Give a brief answer (1-2 sentences) to each question and quote the most relevant piece of the summary. If the summary does not contain the answer, say so.
+
+Respond with only a JSON object mapping each question key to its answer string, for example {{"q1": "...", "q2": "..."}}.
+
+Questions:
+{numbered}
+
+Summary: {summary}"""
+
+
+def parse_batched_answers(response_text: str, questions: List[str]) -> Dict[str, str]:
+    """
+    Parse a batched JSON answer back into per-question answers.
+
+    Args:
+        response_text (str): The raw model response.
+        questions (List[str]): The questions, in the order they were numbered.
+
+    Returns:
+        Dict[str, str]: Answers keyed by question text. Questions with a missing
+        or empty answer are left out, so callers can retry just those.
+    """
+    match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        parsed = json.loads(match.group())
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+
+    answers = {}
+    for i, question in enumerate(questions):
+        answer = parsed.get(question_key(i), parsed.get(question))
+        if isinstance(answer, (str, int, float)) and str(answer).strip():
+            answers[question] = str(answer).strip()
+    return answers
@@ -0,0 +1,117 @@
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+# Section headings as they appear in PyMuPDF text ("3.2 Training Details",
+# "Abstract", "Appendix A") and in LatexNodes2Text output ("§.§ Training Details")
+SECTION_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:'
+    r'§(?:\.§)*[ \t]+\S.{0,100}'
+    r'|\d{1,2}(?:\.\d{1,2}){0,3}\.?[ \t]+[A-Z][A-Za-z\-:,&() ]{0,80}'
+    r'|(?:Abstract|Introduction|Related Work|Background|Method(?:s|ology)?|Experiments?|Results|'
+    r'Discussion|Conclusions?|Acknowledg(?:e)?ments?|References|Bibliography|Appendix(?:[ \t]+[A-Z0-9][^\n]{0,60})?)'
+    r')[ \t]*$',
+    re.MULTILINE,
+)
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose; good enough for budgeting
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class TextChunk:
+    index: int
+    section: str
+    text: str
+    start: int
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def split_sections(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Split text at section headings.
+
+    Args:
+        text (str): Extracted paper text.
+
+    Returns:
+        List[Tuple[str, int, int]]: (heading, start, end) character spans covering the
+        whole text. Text before the first heading gets the heading "".
+    """
+    headings = list(SECTION_HEADING_PATTERN.finditer(text))
+    sections = []
+    previous_title, previous_start = "", 0
+    for match in headings:
+        if match.start() > previous_start:
+            sections.append((previous_title, previous_start, match.start()))
+        previous_title, previous_start = match.group().strip(), match.start()
+    if previous_start < len(text):
+        sections.append((previous_title, previous_start, len(text)))
+    return sections
+
+
+def _split_oversized(paragraph: str, max_chars: int) -> Iterator[str]:
+    piece = ""
+    for sentence in SENTENCE_END_PATTERN.split(paragraph):
+        while len(sentence) > max_chars:
+            if piece:
+                yield piece
+                piece = ""
+            yield sentence[:max_chars]
+            sentence = sentence[max_chars:]
+        if piece and len(piece) + len(sentence) + 1 > max_chars:
+            yield piece
+            piece = ""
+        piece = f"{piece} {sentence}" if piece else sentence
+    if piece:
+        yield piece
+
+
+def iter_chunks(text: str, max_tokens: int = 2000) -> Iterator[TextChunk]:
+    """
+    Stream section-aware chunks of at most ``max_tokens`` (estimated) each.
+
+    Chunks never span two sections; within a section, paragraphs are packed
+    greedily and paragraphs larger than the budget are split at sentence
+    boundaries. Chunk boundaries depend only on the local text, so editing one
+    section leaves the chunks of the other sections unchanged.
+
+    Args:
+        text (str): Extracted paper text.
+        max_tokens (int): Token budget per chunk.
+
+    Yields:
+        TextChunk: Chunks in document order.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    index = 0
+    for title, start, end in split_sections(text):
+        section_text = text[start:end]
+        buffer, buffer_start = "", start
+        offset = start
+        for paragraph in re.split(r'\n\s*\n', section_text):
+            paragraph_start = text.find(paragraph, offset) if paragraph else offset
+            offset = paragraph_start + len(paragraph)
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            pieces = [paragraph] if len(paragraph) <= max_chars else list(_split_oversized(paragraph, max_chars))
+            for piece in pieces:
+                if buffer and len(buffer) + len(piece) + 2 > max_chars:
+                    yield TextChunk(index, title, buffer, buffer_start)
+                    index += 1
+                    buffer = ""
+                if not buffer:
+                    buffer_start = paragraph_start
+                buffer = f"{buffer}\n\n{piece}" if buffer else piece
+        if buffer:
+            yield TextChunk(index, title, buffer, buffer_start)
+            index += 1
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 class CombinedAnalyzer:
     def __init__(self, text_analyzer, image_analyzer):
         self.text_analyzer = text_analyzer
@@ -8,9 +10,28 @@ class CombinedAnalyzer:
         image_summary = self.image_analyzer.analyze(image_paths)
         return text_summary, image_summary
 
-    def answer_questions(self, text_summary, image_summary, questions):
-        text_responses = self.text_analyzer.answer_questions(text_summary, questions)
-        image_responses = self.image_analyzer.answer_questions(image_summary, questions)
+    def answer_questions(self, text_summary, image_summary, questions, mode="per_question", index=None, tables=None):
+        """
+        Answer questions from both summaries. An optional RetrievalIndex over the
+        paper text lets the text analyzer add the relevant passages per question,
+        and extracted tables (TableRecord) let it add the matching tables.
+
+        mode="per_question" makes one call per question per analyzer;
+        mode="batched" asks all questions in a single structured call per analyzer.
+        """
+        if mode == "batched":
+            text_answer, image_answer = self.text_analyzer.answer_questions_batched, self.image_analyzer.answer_questions_batched
+        elif mode == "per_question":
+            text_answer, image_answer = self.text_analyzer.answer_questions, self.image_analyzer.answer_questions
+        else:
+            raise ValueError(f"Unknown question answering mode: {mode}")
+
+        # Text and image questions go to different providers, so fan both out at once
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            text_future = pool.submit(text_answer, text_summary, questions, index, tables)
+            image_future = pool.submit(image_answer, image_summary, questions)
+            text_responses = text_future.result()
+            image_responses = image_future.result()
         
         combined_responses = {}
         for question in questions:
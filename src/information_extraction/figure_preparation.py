@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    import pymupdf
+except ImportError:  # PDF graphics from LaTeX sources are then skipped
+    pymupdf = None
+
+DEFAULT_FIGURE_CACHE_DIR = os.path.join("data", "cache", "figures")
+# With detail "high" the vision API fits images into 2048x2048 and then scales
+# the short side to 768 before tiling, so anything larger only costs upload bytes
+MAX_LONG_SIDE = 2048
+MAX_SHORT_SIDE = 768
+# Images that fit one 512px tile lose nothing at detail "low", which costs a fixed 85 tokens
+TILE_SIZE = 512
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreparedFigure:
+    page: Optional[int]
+    path: str
+    dhash: str
+    width: int
+    height: int
+    mime: str
+    detail: str
+    data: str
+
+    def to_content(self) -> dict:
+        """The figure as an image_url content part of a chat message."""
+        return {
+            "type": "image_url",
+            "image_url": {"url": f"data:{self.mime};base64,{self.data}", "detail": self.detail},
+        }
+
+
+def dhash(image: Image.Image, size: int = 8) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair of a size+1 x size thumbnail."""
+    pixels = image.convert("L").resize((size + 1, size), Image.LANCZOS).tobytes()
+    bits = 0
+    for row in range(size):
+        for column in range(size):
+            left = pixels[row * (size + 1) + column]
+            right = pixels[row * (size + 1) + column + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def fit_size(width: int, height: int, max_long: int = MAX_LONG_SIDE, max_short: int = MAX_SHORT_SIDE) -> Tuple[int, int]:
+    scale = min(1.0, max_long / max(width, height), max_short / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class FigurePreparer:
+    """
+    Turns saved figure files into compact vision payloads.
+
+    Each figure is downscaled to what the vision model actually looks at,
+    flattened to RGB and re-encoded (JPEG by default) with the matching MIME
+    type. Crops too small to carry information are dropped, as are near
+    duplicates (difference hashes within ``max_hamming`` bits of a figure
+    already kept). Encoded payloads are cached on disk under the hash of the
+    source file and the encoding settings, so re-analyzing a paper skips the
+    decode/resize/encode work.
+    """
+
+    def __init__(self, image_format: str = "JPEG", quality: int = 85, min_side: int = 48,
+                 min_area: int = 96 * 96, max_hamming: int = 5, cache_dir: Optional[str] = DEFAULT_FIGURE_CACHE_DIR):
+        self.image_format = image_format.upper()
+        self.quality = quality
+        self.min_side = min_side
+        self.min_area = min_area
+        self.max_hamming = max_hamming
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.stats = {"figures": 0, "kept": 0, "tiny": 0, "duplicates": 0, "failed": 0,
+                      "cache_hits": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def prepare(self, image_paths: Iterable[Tuple[Optional[int], str]]) -> Tuple[List[PreparedFigure], Dict[str, int]]:
+        """
+        Args:
+            image_paths (Iterable[Tuple[Optional[int], str]]): (page, path) pairs
+                as produced by ImageProcessor.save_images or the LaTeX extractor.
+
+        Returns:
+            Tuple[List[PreparedFigure], Dict[str, int]]: The figures worth
+            sending, in input order, and this call's counts (the same keys as
+            ``stats``, which accumulates over the preparer's lifetime).
+        """
+        kept: List[PreparedFigure] = []
+        counts = dict.fromkeys(self.stats, 0)
+        for page, path in image_paths:
+            counts["figures"] += 1
+            try:
+                figure = self._prepare_one(page, path, counts)
+            except Exception as e:
+                counts["failed"] += 1
+                logger.warning(f"Invalid or corrupted image: {path}. Error: {str(e)}")
+                continue
+            if figure is None:
+                counts["tiny"] += 1
+                continue
+            figure_hash = int(figure.dhash, 16)
+            if any(bin(figure_hash ^ int(other.dhash, 16)).count("1") <= self.max_hamming for other in kept):
+                counts["duplicates"] += 1
+                continue
+            kept.append(figure)
+            counts["kept"] += 1
+            counts["bytes_out"] += len(figure.data) * 3 // 4
+        for key, value in counts.items():
+            self.stats[key] += value
+        return kept, counts
+
+    def _prepare_one(self, page: Optional[int], path: str, counts: Dict[str, int]) -> Optional[PreparedFigure]:
+        with open(path, "rb") as f:
+            raw_data = f.read()
+        counts["bytes_in"] += len(raw_data)
+        # The size thresholds are part of the key because "too small" verdicts are cached too
+        settings = f"{self.image_format}:{self.quality}:{MAX_LONG_SIDE}:{MAX_SHORT_SIDE}:{self.min_side}:{self.min_area}"
+        key = hashlib.sha1(raw_data + settings.encode("utf-8")).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, "r") as f:
+                cached = json.load(f)
+            counts["cache_hits"] += 1
+            if cached is None:
+                return None
+            return PreparedFigure(page=page, path=path, **cached)
+
+        image = self._open(path, raw_data)
+        figure = None
+        width, height = image.size
+        if min(width, height) >= self.min_side and width * height >= self.min_area:
+            image = self._flatten(image)
+            image_hash = dhash(image)
+            target = fit_size(width, height)
+            if target != (width, height):
+                image = image.resize(target, Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format=self.image_format, quality=self.quality)
+            figure = PreparedFigure(
+                page=page, path=path, dhash=f"{image_hash:016x}", width=image.width, height=image.height,
+                mime=MIME_TYPES[self.image_format],
+                detail="low" if max(image.size) <= TILE_SIZE else "high",
+                data=base64.b64encode(buffer.getvalue()).decode("utf-8"),
+            )
+        if cache_path:
+            cached = None
+            if figure is not None:
+                cached = {k: v for k, v in asdict(figure).items() if k not in ("page", "path")}
+            with open(cache_path, "w") as f:
+                json.dump(cached, f)
+        return figure
+
+    @staticmethod
+    def _open(path: str, raw_data: bytes) -> Image.Image:
+        if path.lower().endswith(".pdf"):
+            # LaTeX sources often include figures as single-page PDFs
+            if pymupdf is None:
+                raise ValueError("PyMuPDF is needed to rasterize PDF figures")
+            with pymupdf.open(stream=raw_data, filetype="pdf") as document:
+                pixmap = document[0].get_pixmap(dpi=150, alpha=False)
+                return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        image = Image.open(io.BytesIO(raw_data))
+        image.load()
+        return image
+
+    @staticmethod
+    def _flatten(image: Image.Image) -> Image.Image:
+        # JPEG has no alpha; composite transparent figures onto white rather than black
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            return background
+        return image.convert("RGB")
@@ -1,31 +1,29 @@
-import base64
+import logging
 from openai import OpenAI
-from PIL import Image
+from .request_executor import default_executor
+from .batched_questions import build_batched_prompt, parse_batched_answers
+from .response_cache import get_default_cache
+from .figure_preparation import FigurePreparer
+
+logger = logging.getLogger(__name__)
 
 class ImageAnalyzer:
-    def __init__(self, api_key):
+    def __init__(self, api_key, executor=None, cache=None, preparer=None):
         self.client = OpenAI(api_key=api_key)
+        self.executor = executor or default_executor
+        self.cache = cache or get_default_cache()
+        self.preparer = preparer or FigurePreparer()
 
-    def encode_image(self, image_path):
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+    def _create(self, **request):
+        # Identical requests (including image bytes) are served from the response cache
+        return self.cache.cached("openai", request, lambda: self.client.chat.completions.create(**request).choices[0].message.content)
 
     def analyze(self, image_paths):
-        valid_images = []
-        for _, path in image_paths:
-            try:
-                with Image.open(path) as img:
-                    img.verify()
-                base64_image = self.encode_image(path)
-                valid_images.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/jpeg;base64,{base64_image}",
-                        "detail": "high"
-                    }
-                })
-            except Exception as e:
-                print(f"Invalid or corrupted image: {path}. Error: {str(e)}")
+        # Downscaled, deduplicated and re-encoded; tiny crops and unreadable files are dropped
+        figures, counts = self.preparer.prepare(image_paths)
+        valid_images = [figure.to_content() for figure in figures]
+        logger.info(f"Sending {counts['kept']}/{counts['figures']} figures "
+                    f"({counts['duplicates']} duplicates, {counts['tiny']} tiny crops, {counts['failed']} unreadable dropped)")
 
         if not valid_images:
             return "No valid images found for analysis."
@@ -39,26 +37,47 @@ class ImageAnalyzer:
         ]
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._create(
                 model="gpt-4-vision-preview",
                 messages=messages,
                 max_tokens=200
             )
-            return response.choices[0].message.content
+            return response
         except Exception as e:
             return f"Error analyzing images: {str(e)}"
 
     def answer_questions(self, summary, questions):
-        responses = {}
-        for question in questions:
-            messages = [
-                {"role": "system", "content": "You are an AI assistant tasked with answering specific questions about AI models based on summarized information from images in academic papers."},
-                {"role": "user", "content": f"Based on the following summary of images from an AI model paper, answer this question concisely: {question}\n\nSummary: {summary}"}
-            ]
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                max_tokens=300
-            )
-            responses[question] = response.choices[0].message.content
-        return responses
\ No newline at end of file
+        calls = [(question, lambda question=question: self._answer_question(summary, question)) for question in questions]
+        return self.executor.run("openai", calls)
+
+    def answer_questions_batched(self, summary, questions):
+        """
+        Answer all questions with one request that sends the summary once.
+        Questions missing from the parsed JSON are retried one by one.
+        """
+        messages = [
+            {"role": "system", "content": "You are an AI assistant tasked with answering specific questions about AI models based on summarized information from images in academic papers."},
+            {"role": "user", "content": build_batched_prompt(summary, questions, source="images from an AI model paper")}
+        ]
+        response = self._create(
+            model="gpt-4o",
+            messages=messages,
+            max_tokens=min(4096, 150 * len(questions)),
+            response_format={"type": "json_object"}
+        )
+        answers = parse_batched_answers(response or "", questions)
+        missing = [question for question in questions if question not in answers]
+        answers.update(self.answer_questions(summary, missing))
+        return {question: answers[question] for question in questions}
+
+    def _answer_question(self, summary, question):
+        messages = [
+            {"role": "system", "content": "You are an AI assistant tasked with answering specific questions about AI models based on summarized information from images in academic papers."},
+            {"role": "user", "content": f"Based on the following summary of images from an AI model paper, answer this question concisely: {question}\n\nSummary: {summary}"}
+        ]
+        response = self._create(
+            model="gpt-4o",
+            messages=messages,
+            max_tokens=300
+        )
+        return response
\ No newline at end of file
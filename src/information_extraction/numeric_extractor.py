@@ -0,0 +1,190 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .chunking import TextChunk
+
+# Confidence at or above which a candidate is trusted without asking an LLM
+HIGH_CONFIDENCE = 0.85
+
+MAGNITUDES = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "million": 1e6, "mn": 1e6,
+    "b": 1e9, "billion": 1e9, "bn": 1e9,
+    "t": 1e12, "trillion": 1e12,
+}
+# FLOP per unit of compute
+COMPUTE_UNITS = {
+    "flop": 1.0, "flops": 1.0,
+    "pf-days": 8.64e19, "pf-day": 8.64e19, "petaflop/s-days": 8.64e19, "petaflop/s-day": 8.64e19,
+    "petaflop-days": 8.64e19, "pflop/s-days": 8.64e19,
+    "zettaflop": 1e21, "zettaflops": 1e21, "exaflop": 1e18, "exaflops": 1e18,
+}
+HOURS_PER_UNIT = {"hour": 1, "day": 24, "week": 168, "month": 730}
+WORD_NUMBERS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "twelve": 12, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "hundred": 100,
+}
+
+NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+WORD_NUMBER = "|".join(WORD_NUMBERS)
+# Patterns compile with IGNORECASE, so the suffix must end the word ("2048 tokens" is not 2048T)
+MAGNITUDE = r"(?:[KkMBT]|thousand|million|billion|trillion|[Mm]n|[Bb]n)(?![A-Za-z])"
+# Values must start a number, not sit inside a name ("A100", "ResNet50", "GPT-3")
+VALUE_START = r"(?<![\w.])"
+HARDWARE = (r"(?:NVIDIA\s+|Nvidia\s+)?(?:A100|H100|V100|P100|A6000|RTX\s?\d{4}|TPU\s?v\d[a-z]*|TPUv\d[a-z]*)"
+            r"(?:\s+(?:GPUs?|chips|cores|\d+GB))*|GPUs?|TPUs?|TPU\s+chips|accelerators|chips")
+
+# (field, confidence, pattern). Each pattern exposes a ``value`` group and, where
+# relevant, ``mag`` (K/M/B), ``exp`` (power of ten), ``unit`` and ``word`` groups.
+PATTERN_BANK: List[Tuple[str, float, str]] = [
+    ("parameters", 0.95,
+     rf"{VALUE_START}(?P<value>{NUMBER})\s*(?P<mag>{MAGNITUDE})?[\s-]*(?:learnable\s+|trainable\s+|total\s+)?param(?:eter)?s?\b"),
+    ("parameters", 0.9,
+     rf"param(?:eter)?s?\s*(?:count\s*)?(?:of|:|=)\s*{VALUE_START}(?P<value>{NUMBER})\s*(?P<mag>{MAGNITUDE})\b"),
+    ("parameters", 0.6,
+     rf"{VALUE_START}(?P<value>\d+(?:\.\d+)?)\s?(?P<mag>[MB])[\s-]+(?:model|variant|version|LLM)\b"),
+    ("training_compute", 0.95,
+     rf"{VALUE_START}(?P<value>{NUMBER})\s*(?:[x×\*]\s*10\s*\^?\s*\{{?(?P<exp>[-−]?\d+)\}}?|[eE]\+?(?P<exp2>\d+))?\s*"
+     rf"(?P<unit>FLOPs?|PF-days?|petaflop/s-days?|petaflop-days|pflop/s-days|zettaFLOPs?|exaFLOPs?)(?![a-z])"),
+    ("batch_size", 0.9,
+     rf"batch\s+sizes?\s*(?:of|=|:|is|was|to)?\s*(?:about\s+|approximately\s+|~\s*)?{VALUE_START}(?P<value>{NUMBER})\s*(?P<mag>{MAGNITUDE})?"
+     rf"(?:\s*(?P<unit>tokens|sequences|examples|samples|images))?"),
+    ("batch_size", 0.85,
+     rf"{VALUE_START}(?P<value>{NUMBER})\s*(?P<mag>{MAGNITUDE})?\s*(?P<unit>tokens|sequences|examples|samples|images)?\s+(?:per|in\s+each|each)\s+(?:mini-?)?batch"),
+    ("epochs", 0.9,
+     rf"(?:{VALUE_START}(?P<value>{NUMBER})|(?P<word>{WORD_NUMBER}))\s+(?:full\s+|training\s+)?epochs?\b"),
+    ("epochs", 0.9,
+     rf"epochs?\s*(?:=|:)\s*{VALUE_START}(?P<value>{NUMBER})"),
+    ("gpu_hours", 0.9,
+     rf"{VALUE_START}(?P<value>{NUMBER})\s*(?P<mag>{MAGNITUDE})?\s*(?P<unit>GPU|TPU|accelerator)[\s-]hours"),
+    ("hardware_quantity", 0.9,
+     rf"{VALUE_START}(?P<value>{NUMBER})\s*(?:x\s*|×\s*)?(?P<unit>{HARDWARE})(?![\s-]hours)"),
+    # Only kept when a training verb precedes it in the same sentence (see TRAINING_CONTEXT)
+    ("training_time", 0.85,
+     rf"(?:{VALUE_START}(?P<value>{NUMBER})|(?P<word>{WORD_NUMBER}))\s*(?P<unit>hours?|days?|weeks?|months?)\b(?![\s-]*(?:of\s+)?(?:data|tokens|video|audio|speech))"),
+]
+
+TRAINING_CONTEXT = re.compile(r"\b(?:train(?:ed|ing)?|took|takes|lasted)\b[^.\n]*$", re.IGNORECASE)
+
+# One alternation with an outer named group per pattern, so a single scan of the
+# text finds every field's candidates. Inner group names get a per-pattern prefix.
+_INNER_GROUP = re.compile(r"\(\?P<(\w+)>")
+COMBINED_PATTERN = re.compile(
+    "|".join(f"(?P<p{i}>{_INNER_GROUP.sub(lambda m, i=i: f'(?P<p{i}_{m.group(1)}>', pattern)})"
+             for i, (_, _, pattern) in enumerate(PATTERN_BANK)),
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class NumericCandidate:
+    field: str
+    value: float
+    unit: str
+    confidence: float
+    span: Tuple[int, int]
+    source: str
+    chunk_index: Optional[int] = None
+
+
+def _parse_number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _normalize(field: str, groups: Dict[str, Optional[str]]) -> Optional[Tuple[float, str]]:
+    if groups.get("word"):
+        value = float(WORD_NUMBERS[groups["word"].lower()])
+    elif groups.get("value"):
+        value = _parse_number(groups["value"])
+    else:
+        return None
+    magnitude = groups.get("mag")
+    if magnitude:
+        value *= MAGNITUDES[magnitude.lower()]
+    unit = (groups.get("unit") or "").lower()
+
+    if field == "parameters":
+        return value, "parameters"
+    if field == "training_compute":
+        exponent = groups.get("exp") or groups.get("exp2")
+        if exponent:
+            value *= 10 ** int(exponent.replace("−", "-"))
+        value *= COMPUTE_UNITS.get(unit, 1.0)
+        # A bare "FLOPs" count below 1e15 is a throughput or per-token figure, not training compute
+        return (value, "FLOP") if value >= 1e15 else None
+    if field == "training_time":
+        return value * HOURS_PER_UNIT[unit.rstrip("s")], "hours"
+    if field == "gpu_hours":
+        return value, "GPU-hours"
+    if field == "batch_size":
+        return value, unit or "examples"
+    if field == "hardware_quantity":
+        return (value, unit) if value >= 1 and value == int(value) else None
+    return value, unit
+
+
+def extract_candidates(text: Union[str, Iterable[TextChunk]]) -> Dict[str, List[NumericCandidate]]:
+    """
+    Propose values for numeric MODEL_FIELDS straight from the text, without an LLM.
+
+    Args:
+        text (Union[str, Iterable[TextChunk]]): Full text, or chunks from iter_chunks.
+
+    Returns:
+        Dict[str, List[NumericCandidate]]: Candidates per field, most confident and most
+        repeated values first. Values are normalized to parameters, FLOP, hours, and
+        raw counts for batch size, epochs and hardware quantity.
+    """
+    chunks = [TextChunk(0, "", text, 0)] if isinstance(text, str) else list(text)
+    candidates: Dict[str, List[NumericCandidate]] = defaultdict(list)
+    for chunk in chunks:
+        for match in COMBINED_PATTERN.finditer(chunk.text):
+            index = int(match.lastgroup[1:])
+            field, confidence, _ = PATTERN_BANK[index]
+            start, end = match.span()
+            if field == "training_time" and not TRAINING_CONTEXT.search(chunk.text[max(0, start - 80):start]):
+                continue
+            prefix = f"p{index}_"
+            groups = {name[len(prefix):]: value for name, value in match.groupdict().items()
+                      if name.startswith(prefix)}
+            normalized = _normalize(field, groups)
+            if normalized is None:
+                continue
+            value, unit = normalized
+            candidates[field].append(NumericCandidate(
+                field, value, unit, confidence, (chunk.start + start, chunk.start + end),
+                match.group().strip(), chunk.index,
+            ))
+
+    _derive_training_time(candidates)
+    return {field: _rank(field_candidates) for field, field_candidates in candidates.items()}
+
+
+def _derive_training_time(candidates: Dict[str, List[NumericCandidate]]):
+    # GPU-hours divided by the number of accelerators gives wall-clock hours
+    if candidates.get("training_time") or not candidates.get("gpu_hours") or not candidates.get("hardware_quantity"):
+        return
+    gpu_hours = _rank(candidates["gpu_hours"])[0]
+    quantity = _rank(candidates["hardware_quantity"])[0]
+    candidates["training_time"].append(NumericCandidate(
+        "training_time", gpu_hours.value / quantity.value, "hours", 0.6, gpu_hours.span,
+        f"{gpu_hours.source} / {quantity.source}", gpu_hours.chunk_index,
+    ))
+
+
+def _rank(field_candidates: List[NumericCandidate]) -> List[NumericCandidate]:
+    # Values stated several times in the paper are more likely to be the headline number
+    counts = defaultdict(int)
+    for candidate in field_candidates:
+        counts[candidate.value] += 1
+    return sorted(field_candidates, key=lambda c: (c.confidence, counts[c.value]), reverse=True)
+
+
+def best_candidate(candidates: Dict[str, List[NumericCandidate]], field: str,
+                   min_confidence: float = HIGH_CONFIDENCE) -> Optional[NumericCandidate]:
+    field_candidates = candidates.get(field) or []
+    if field_candidates and field_candidates[0].confidence >= min_confidence:
+        return field_candidates[0]
+    return None
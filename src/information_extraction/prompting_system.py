@@ -4,19 +4,37 @@ import base64
 import requests
 from typing import Dict, Any, List, Union
 import logging
+import re
+from .model_fields import MODEL_FIELDS
+from .response_cache import get_default_cache
+from .chunking import TextChunk
+from .retrieval import RetrievalIndex, format_passages, format_tables, select_tables
+from .numeric_extractor import best_candidate, extract_candidates
 
 logger = logging.getLogger(__name__)
 
 class PromptingSystem:
-    def __init__(self, openai_api_key):
+    def __init__(self, openai_api_key, cache=None, retrieval_top_k: int = 4):
         self.openai_api_key = openai_api_key
         self.anthropic_client = anthropic.Anthropic()
+        self.cache = cache or get_default_cache()
+        self.retrieval_top_k = retrieval_top_k
         self.conversation_history = []
+        self.index = None
+        self.tables = []
+        self.numeric_candidates = {}
 
-    def extract_information(self, text: str, images: List[str] = None) -> Dict[str, Any]:
+    def extract_information(self, text: str, images: List[str] = None, index: RetrievalIndex = None,
+                            tables: List[Any] = None) -> Dict[str, Any]:
         extracted_info = {}
         try:
             self._initialize_conversation(text)
+            self.index = index or RetrievalIndex.build(text)
+            self.tables = tables or []
+            # Tables are scanned as "key: value" lines, after the text chunks
+            table_chunks = [TextChunk(len(self.index.chunks) + i, table.title, table.to_sentences(), -1)
+                            for i, table in enumerate(self.tables)]
+            self.numeric_candidates = extract_candidates(list(self.index.chunks) + table_chunks)
             for field, field_info in MODEL_FIELDS.items():
                 if images and field_info.get("requires_image", False):
                     field_value = self._extract_field_info_multimodal(field, field_info, images)
@@ -38,6 +56,32 @@ class PromptingSystem:
 
     def _extract_field_info_text(self, field: str, field_info: Dict[str, str]) -> Dict[str, Any]:
         prompt = field_info["prompt"]
+        candidates = self.numeric_candidates.get(field, [])
+        if field_info["type"] == "numeric":
+            candidate = best_candidate(self.numeric_candidates, field)
+            if candidate:
+                # Stated verbatim in the paper; no need to ask a model
+                if candidate.chunk_index >= len(self.index.chunks):
+                    location = f"in {self.tables[candidate.chunk_index - len(self.index.chunks)].title}"
+                else:
+                    location = f"at characters {candidate.span[0]}-{candidate.span[1]}"
+                return {
+                    "value": candidate.value,
+                    "confidence": "Confident",
+                    "notes": f"Pattern match ({candidate.unit}): \"{candidate.source}\" {location}"
+                }
+        top_k = self.retrieval_top_k
+        if candidates:
+            # Lower-confidence matches still point at the right passages, so fewer are needed
+            top_k = max(1, top_k // 2)
+            prompt += "\n\nCandidate values found in the text: " + "; ".join(
+                f"\"{candidate.source}\"" for candidate in candidates[:3])
+        passages = self.index.search(prompt, top_k) if self.index else []
+        if passages:
+            prompt = f"{prompt}\n\nAnswer using these passages from the paper:\n{format_passages(passages)}"
+        tables = select_tables(self.tables, field_info["prompt"] + " " + field.replace("_", " "))
+        if tables:
+            prompt = f"{prompt}\n\nTables from the paper:\n{format_tables(tables)}"
         response = self._get_claude_response(prompt)
         
         extracted_value = self._parse_response(response, field_info["type"])
@@ -64,7 +108,7 @@ class PromptingSystem:
 
     def _get_claude_response(self, prompt: str) -> str:
         try:
-            message = self.anthropic_client.messages.create(
+            request = dict(
                 model="claude-3-5-sonnet-20240620",
                 max_tokens=1000,
                 temperature=0,
@@ -73,7 +117,8 @@ class PromptingSystem:
                     {"role": "user", "content": prompt}
                 ]
             )
-            return message.content[0].text
+            return self.cache.cached("anthropic", request,
+                                     lambda: self.anthropic_client.messages.create(**request).content[0].text)
         except Exception as e:
             logger.error(f"Error getting Claude response: {str(e)}")
             raise
@@ -101,8 +146,11 @@ class PromptingSystem:
                 "max_tokens": 300
             }
 
-            response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-            return response.json()['choices'][0]['message']['content']
+            def post():
+                response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
+                return response.json()['choices'][0]['message']['content']
+
+            return self.cache.cached("openai", payload, post)
         except Exception as e:
             logger.error(f"Error getting GPT-4 response: {str(e)}")
             raise
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+DEFAULT_PROVIDER_LIMITS = {"anthropic": 8, "openai": 8}
+
+
+class RequestExecutor:
+    """
+    Bounded-concurrency engine for fanning out blocking LLM client calls.
+
+    Calls run on worker threads driven by an asyncio event loop. Each provider
+    has its own semaphore, shared by every caller of this executor, so the text
+    analyzer, image analyzer and reasoning calculator together never exceed a
+    provider's limit. Results are returned in the order the calls were given,
+    and per-call latency is recorded per provider.
+    """
+
+    def __init__(self, provider_limits: Optional[Dict[str, int]] = None, default_limit: int = 4):
+        self.provider_limits = dict(DEFAULT_PROVIDER_LIMITS if provider_limits is None else provider_limits)
+        self.default_limit = default_limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, int] = defaultdict(int)
+
+    def _semaphore(self, provider: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if provider not in self._semaphores:
+                limit = self.provider_limits.get(provider, self.default_limit)
+                self._semaphores[provider] = threading.BoundedSemaphore(limit)
+            return self._semaphores[provider]
+
+    def _timed_call(self, provider: str, fn: Callable[[], Any]) -> Any:
+        with self._semaphore(provider):
+            start = time.perf_counter()
+            try:
+                return fn()
+            except Exception:
+                with self._lock:
+                    self._errors[provider] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._latencies[provider].append(time.perf_counter() - start)
+
+    async def run_async(self, provider: str, calls: Sequence[Tuple[Hashable, Callable[[], Any]]]) -> Dict[Hashable, Any]:
+        """
+        Run calls concurrently within the provider's limit.
+
+        Args:
+            provider (str): Provider name used to pick the semaphore, e.g. "anthropic".
+            calls (Sequence[Tuple[Hashable, Callable[[], Any]]]): (key, zero-argument call) pairs.
+
+        Returns:
+            Dict[Hashable, Any]: Results keyed by call key, in input order.
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._timed_call, provider, fn) for _, fn in calls)
+        )
+        return {key: result for (key, _), result in zip(calls, results)}
+
+    def run(self, provider: str, calls: Sequence[Tuple[Hashable, Callable[[], Any]]]) -> Dict[Hashable, Any]:
+        """
+        Blocking wrapper around run_async for synchronous callers.
+        """
+        if not calls:
+            return {}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run_async(provider, calls))
+        # Already inside an event loop (e.g. a notebook): run on a separate thread
+        outcome = {}
+
+        def runner():
+            try:
+                outcome["result"] = asyncio.run(self.run_async(provider, calls))
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=runner)
+        thread.start()
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        with self._lock:
+            for provider, latencies in self._latencies.items():
+                ordered = sorted(latencies)
+                stats[provider] = {
+                    "calls": len(ordered),
+                    "errors": self._errors[provider],
+                    "mean": round(sum(ordered) / len(ordered), 3),
+                    "p50": round(ordered[len(ordered) // 2], 3),
+                    "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                    "max": round(ordered[-1], 3),
+                }
+        return stats
+
+
+default_executor = RequestExecutor()
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "llm_responses.sqlite")
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of LLM responses, stored in SQLite.
+
+    Entries are keyed on a hash of the provider and the full request (model,
+    system prompt, messages including any base64 image data, max_tokens,
+    temperature, ...), so changing any input produces a new key and unchanged
+    calls are served locally. Entries expire after ``ttl_seconds`` and the
+    least recently used ones are evicted beyond ``max_entries``. Set ``bypass``
+    (or LLM_CACHE_BYPASS=1) to always call through without reading or writing.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: Optional[float] = 30 * 24 * 3600,
+                 max_entries: int = 50000, bypass: Optional[bool] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.bypass = bypass if bypass is not None else os.getenv("LLM_CACHE_BYPASS") == "1"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, provider TEXT, response TEXT, created REAL, accessed REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        return self._conn
+
+    @staticmethod
+    def make_key(provider: str, request: Dict[str, Any]) -> str:
+        payload = json.dumps({"provider": provider, "request": request}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None:
+                return None
+            response, created = row
+            if self.ttl_seconds is not None and now - created > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return response
+
+    def put(self, key: str, provider: str, response: str):
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, response, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, provider, response, now, now),
+            )
+            count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.commit()
+
+    def cached(self, provider: str, request: Dict[str, Any], call: Callable[[], str]) -> str:
+        """
+        Return the cached response for a request, or make the call and store its result.
+
+        Args:
+            provider (str): Provider name, part of the key.
+            request (Dict[str, Any]): Every input that affects the response.
+            call (Callable[[], str]): Makes the real API call and returns the response text.
+
+        Returns:
+            str: The response text.
+        """
+        if self.bypass:
+            return call()
+        key = self.make_key(provider, request)
+        response = self.get(key)
+        if response is not None:
+            with self._lock:
+                self.hits += 1
+            return response
+        with self._lock:
+            self.misses += 1
+        response = call()
+        if response is not None:
+            self.put(key, provider, response)
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> ResponseCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
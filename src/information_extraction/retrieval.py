@@ -0,0 +1,174 @@
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .chunking import TextChunk, iter_chunks
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from how in is it of on or the this to was were what "
+    "which who with used use any model paper".split()
+)
+INDEX_FILENAME = "retrieval_index.json"
+EMBEDDINGS_FILENAME = "retrieval_embeddings.npy"
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def format_passages(chunks: List[TextChunk]) -> str:
+    return "\n\n".join(f"[{chunk.section or 'Front matter'}]\n{chunk.text}" for chunk in chunks)
+
+
+def select_tables(tables: list, query: str, top_k: int = 2) -> list:
+    """
+    Pick the tables (anything with ``to_text()``, e.g. TableRecord) whose
+    caption and cells share the most terms with the query, in document order.
+    """
+    terms = set(tokenize(query))
+    scored = []
+    for position, table in enumerate(tables):
+        overlap = len(terms & set(tokenize(table.to_text())))
+        if overlap:
+            scored.append((overlap, position))
+    best = sorted(scored, key=lambda item: (-item[0], item[1]))[:top_k]
+    return [tables[position] for _, position in sorted(best, key=lambda item: item[1])]
+
+
+def format_tables(tables: list) -> str:
+    return "\n\n".join(table.to_text() for table in tables)
+
+
+class RetrievalIndex:
+    """
+    Per-paper BM25 index over section-aware chunks, so each question or field
+    prompt only carries the passages relevant to it.
+
+    If sentence-transformers is installed and an ``embedding_model`` is given,
+    BM25 scores are blended with embedding cosine similarity. The index is
+    stored as JSON (plus an .npy of embeddings) in the paper's processed
+    directory and reused as long as the text is unchanged.
+    """
+
+    def __init__(self, chunks: List[TextChunk], text_hash: str = "", k1: float = 1.5, b: float = 0.75,
+                 embedding_model: Optional[str] = None, embeddings=None):
+        self.chunks = chunks
+        self.text_hash = text_hash
+        self.k1 = k1
+        self.b = b
+        self.embedding_model = embedding_model
+        self.embeddings = embeddings
+        self._encoder = None
+
+        self._term_freqs = [Counter(tokenize(chunk.text)) for chunk in chunks]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        doc_freqs = Counter(term for freqs in self._term_freqs for term in freqs)
+        n = len(chunks)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()}
+
+        if embedding_model and self.embeddings is None and SentenceTransformer is not None and chunks:
+            self.embeddings = self._encode([chunk.text for chunk in chunks])
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def build(cls, text: str, chunk_tokens: int = 400, embedding_model: Optional[str] = None) -> "RetrievalIndex":
+        return cls(list(iter_chunks(text, chunk_tokens)), cls.hash_text(text), embedding_model=embedding_model)
+
+    @classmethod
+    def load_or_build(cls, text: str, processed_dir: str, chunk_tokens: int = 400,
+                      embedding_model: Optional[str] = None) -> "RetrievalIndex":
+        """
+        Load the index stored in ``processed_dir`` if it was built from the same
+        text, otherwise build it and save it there.
+        """
+        path = os.path.join(processed_dir, INDEX_FILENAME)
+        if os.path.exists(path):
+            index = cls.load(path)
+            if index.text_hash == cls.hash_text(text) and index.embedding_model == embedding_model:
+                return index
+        index = cls.build(text, chunk_tokens, embedding_model)
+        index.save(path)
+        return index
+
+    def _encode(self, texts: List[str]):
+        if self._encoder is None:
+            self._encoder = SentenceTransformer(self.embedding_model, device="cpu")
+        return self._encoder.encode(texts, normalize_embeddings=True)
+
+    def _bm25_scores(self, query: str) -> List[float]:
+        terms = tokenize(query)
+        scores = []
+        for freqs, length in zip(self._term_freqs, self._lengths):
+            score = 0.0
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / (self._avg_length or 1))
+                    score += self._idf[term] * tf * (self.k1 + 1) / norm
+            scores.append(score)
+        return scores
+
+    def search(self, query: str, top_k: int = 4) -> List[TextChunk]:
+        """
+        Return the ``top_k`` chunks most relevant to a query, in document order.
+
+        Args:
+            query (str): Question or field prompt.
+            top_k (int): Number of chunks to return.
+
+        Returns:
+            List[TextChunk]: Matching chunks. With BM25 alone, chunks sharing no
+            term with the query are never returned; with embeddings, a chunk with
+            no term overlap can still be returned on semantic similarity, as long
+            as its blended score is positive.
+        """
+        if not self.chunks:
+            return []
+        scores = self._bm25_scores(query)
+        if self.embeddings is not None and SentenceTransformer is not None:
+            best = max(scores) or 1.0
+            similarities = np.asarray(self.embeddings) @ self._encode([query])[0]
+            scores = [0.5 * score / best + 0.5 * float(sim) for score, sim in zip(scores, similarities)]
+        ranked = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+        selected = [i for i in ranked[:top_k] if scores[i] > 0]
+        return [self.chunks[i] for i in sorted(selected)]
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data: Dict = {
+            "text_hash": self.text_hash,
+            "k1": self.k1,
+            "b": self.b,
+            "embedding_model": self.embedding_model,
+            "chunks": [chunk.__dict__ for chunk in self.chunks],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        if self.embeddings is not None:
+            np.save(os.path.join(os.path.dirname(path), EMBEDDINGS_FILENAME), self.embeddings)
+
+    @classmethod
+    def load(cls, path: str) -> "RetrievalIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        embeddings = None
+        embeddings_path = os.path.join(os.path.dirname(path), EMBEDDINGS_FILENAME)
+        if data.get("embedding_model") and SentenceTransformer is not None and os.path.exists(embeddings_path):
+            embeddings = np.load(embeddings_path)
+        return cls([TextChunk(**chunk) for chunk in data["chunks"]], data["text_hash"], data["k1"], data["b"],
+                   data.get("embedding_model"), embeddings)
@@ -1,46 +1,148 @@
 import anthropic
+from .request_executor import default_executor
+from .batched_questions import build_batched_prompt, parse_batched_answers
+from .response_cache import get_default_cache
+from .chunking import estimate_tokens, iter_chunks
+from .retrieval import format_passages, format_tables, select_tables
 
 class TextAnalyzer:
-    def __init__(self, anthropic_api_key):
+    def __init__(self, anthropic_api_key, executor=None, cache=None, single_pass_tokens=30000, chunk_tokens=3000,
+                 retrieval_top_k=4):
         self.client = anthropic.Anthropic(api_key=anthropic_api_key)
+        self.executor = executor or default_executor
+        self.cache = cache or get_default_cache()
+        self.single_pass_tokens = single_pass_tokens
+        self.chunk_tokens = chunk_tokens
+        self.retrieval_top_k = retrieval_top_k
+
+    def _create(self, **request):
+        # Identical requests are served from the response cache
+        return self.cache.cached("anthropic", request, lambda: self.client.messages.create(**request).content[0].text)
 
     def analyze(self, text):
-        prompt = """
-        Analyze the following text from an academic paper about an AI model. 
+        """
+        Summarize a paper for question answering.
+
+        Papers that fit in ``single_pass_tokens`` are summarized in one request.
+        Longer papers are split into section-aware chunks that are summarized
+        concurrently (map) and then merged into one digest (reduce). Chunk
+        summaries go through the response cache, so re-running on an edited
+        paper only pays for the chunks that changed.
+        """
+        if estimate_tokens(text) <= self.single_pass_tokens:
+            return self._summarize(text)
+
+        chunks = list(iter_chunks(text, self.chunk_tokens))
+        calls = [(chunk.index, lambda chunk=chunk: self._summarize_chunk(chunk)) for chunk in chunks]
+        chunk_summaries = self.executor.run("anthropic", calls)
+        notes = "\n\n".join(
+            f"[{chunk.section or 'Front matter'}]\n{chunk_summaries[chunk.index]}" for chunk in chunks
+        )
+        return self._summarize(notes, source="notes taken on consecutive parts of an academic paper")
+
+    def _summarize(self, text, source="an academic paper"):
+        prompt = f"""
+        Analyze the following text from {source} about an AI model. 
         Extract key information about the model's architecture, training process, performance, and other notable characteristics.
         Provide a concise summary (max 100 words) that can be used to answer specific questions later.
+
+        Text:
+        {text}
         """
         
-        response = self.client.messages.create(
+        response = self._create(
             model="claude-3-5-sonnet-20240620",
             max_tokens=200,
             temperature=0,
             system="You are an AI assistant tasked with extracting concise information about AI models from academic papers. Provide brief, factual summaries.",
             messages=[
-                {"role": "user", "content": prompt.format(text=text)}
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return response
+
+    def _summarize_chunk(self, chunk):
+        prompt = f"""
+        The following is one part ({chunk.section or 'front matter'}) of an academic paper about an AI model.
+        List the facts it states about the model: architecture, parameter count, training data and dataset size, compute, hardware, batch size, epochs, training time, and results.
+        Keep every number with its unit. Reply "Nothing relevant." if the part has no such facts.
+
+        Text:
+        {chunk.text}
+        """
+        return self._create(
+            model="claude-3-5-sonnet-20240620",
+            max_tokens=300,
+            temperature=0,
+            system="You are an AI assistant tasked with extracting concise information about AI models from academic papers. Provide brief, factual summaries.",
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+
+    def answer_questions(self, summary, questions, index=None, tables=None):
+        """
+        Answer each question with its own request. If a RetrievalIndex is given,
+        each prompt also carries the top passages for that question; if tables
+        are given, the ones matching the question are included as well.
+        """
+        calls = [(question, lambda question=question: self._answer_question(summary, question, index, tables)) for question in questions]
+        return self.executor.run("anthropic", calls)
+
+    def answer_questions_batched(self, summary, questions, index=None, tables=None):
+        """
+        Answer all questions with one request that sends the summary once.
+        Questions missing from the parsed JSON are retried one by one.
+        """
+        context = summary
+        if index is not None:
+            # Every passage any question retrieves, each sent once
+            chunks = {chunk.index: chunk for question in questions
+                      for chunk in index.search(question, max(1, self.retrieval_top_k // 2))}
+            context = f"{summary}\n\nRelevant passages from the paper:\n{format_passages([chunks[i] for i in sorted(chunks)])}"
+        if tables:
+            # Every table any question selects, each sent once
+            picked = {id(table) for question in questions for table in select_tables(tables, question)}
+            selected = [table for table in tables if id(table) in picked]
+            if selected:
+                context += f"\n\nTables from the paper:\n{format_tables(selected)}"
+        response = self._create(
+            model="claude-3-5-sonnet-20240620",
+            max_tokens=min(4096, 150 * len(questions)),
+            temperature=0,
+            system="You are an AI assistant tasked with providing brief, factual answers about AI models based on summarized information from academic papers.",
+            messages=[
+                {"role": "user", "content": build_batched_prompt(context, questions)}
+            ]
+        )
+        answers = parse_batched_answers(response, questions)
+        missing = [question for question in questions if question not in answers]
+        answers.update(self.answer_questions(summary, missing, index, tables))
+        return {question: answers[question] for question in questions}
+
+    def _answer_question(self, summary, question, index=None, tables=None):
+        prompt = f"""
+        Based on the following summary of an AI model paper, answer this question concisely:
+        {question}
+
+        Provide a brief answer (1-2 sentences) and highlight the most relevant piece of text from the summary in quotes.
+
+        Summary: {summary}
+        """
+        if index is not None:
+            passages = index.search(question, self.retrieval_top_k)
+            if passages:
+                prompt += f"\nRelevant passages from the paper (prefer these for exact numbers):\n{format_passages(passages)}\n"
+        selected = select_tables(tables, question) if tables else []
+        if selected:
+            prompt += f"\nTables from the paper:\n{format_tables(selected)}\n"
+        response = self._create(
+            model="claude-3-5-sonnet-20240620",
+            max_tokens=100,
+            temperature=0,
+            system="You are an AI assistant tasked with providing brief, factual answers about AI models based on summarized information from academic papers.",
+            messages=[
+                {"role": "user", "content": prompt}
             ]
         )
-        return response.content[0].text
-
-    def answer_questions(self, summary, questions):
-        responses = {}
-        for question in questions:
-            prompt = f"""
-            Based on the following summary of an AI model paper, answer this question concisely:
-            {question}
-
-            Provide a brief answer (1-2 sentences) and highlight the most relevant piece of text from the summary in quotes.
-
-            Summary: {summary}
-            """
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20240620",
-                max_tokens=100,
-                temperature=0,
-                system="You are an AI assistant tasked with providing brief, factual answers about AI models based on summarized information from academic papers.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            responses[question] = response.content[0].text
-        return responses
\ No newline at end of file
+        return response
\ No newline at end of file
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Local store of downloaded arXiv artifacts, one directory per paper id and
+    version::
+
+        <root>/<arxiv id>/<version>/paper.pdf
+                                    source
+                                    metadata.json
+                                    checksums.json
+
+    ``checksums.json`` records the size, SHA-256 and HTTP validators (ETag,
+    Last-Modified) of every artifact, so a repeat run can trust what is on disk
+    without touching the network. Metadata is also indexed by the id as it was
+    requested (which may lack a version), so the lookup from a URL to a
+    directory is itself local.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, '_index'), exist_ok=True)
+
+    @staticmethod
+    def _safe(arxiv_id: str) -> str:
+        # Old-style ids contain a slash (e.g. hep-th/9901001)
+        return arxiv_id.replace('/', '_')
+
+    def paper_dir(self, arxiv_id: str, version: str, create: bool = False) -> str:
+        """Directory of one paper version; only created when ``create`` is set, so lookups have no side effects."""
+        path = os.path.join(self.root, self._safe(arxiv_id), version)
+        if create:
+            os.makedirs(path, exist_ok=True)
+        return path
+
+    def path(self, arxiv_id: str, version: str, name: str, create: bool = False) -> str:
+        """Path of an artifact; pass ``create`` when about to write it."""
+        return os.path.join(self.paper_dir(arxiv_id, version, create), name)
+
+    def get_metadata(self, requested_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up stored metadata for an id as it appears in a paper URL.
+
+        Returns:
+            Optional[Dict[str, Any]]: The metadata, or None if it was never stored.
+        """
+        index_path = os.path.join(self.root, '_index', self._safe(requested_id) + '.json')
+        if not os.path.exists(index_path):
+            return None
+        with open(index_path, 'r') as f:
+            entry = json.load(f)
+        metadata_path = os.path.join(self.root, self._safe(entry['id']), entry['version'], 'metadata.json')
+        if not os.path.exists(metadata_path):
+            return None
+        with open(metadata_path, 'r') as f:
+            return json.load(f)
+
+    def put_metadata(self, requested_id: str, metadata: Dict[str, Any]):
+        """
+        Store metadata (which must carry ``id`` and ``version``) and index it
+        under the requested id.
+        """
+        self._write_json(self.path(metadata['id'], metadata['version'], 'metadata.json'), metadata)
+        entry = {'id': metadata['id'], 'version': metadata['version']}
+        self._write_json(os.path.join(self.root, '_index', self._safe(requested_id) + '.json'), entry)
+
+    def _checksums(self, arxiv_id: str, version: str) -> Dict[str, Any]:
+        path = self.path(arxiv_id, version, 'checksums.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def record(self, arxiv_id: str, version: str, name: str, validators: Optional[Dict[str, str]] = None):
+        """Record the checksum and HTTP validators of an artifact just written to the store."""
+        artifact_path = self.path(arxiv_id, version, name)
+        entry = {
+            'size': os.path.getsize(artifact_path),
+            'sha256': file_sha256(artifact_path),
+            'etag': (validators or {}).get('etag'),
+            'last_modified': (validators or {}).get('last_modified'),
+            'stored': time.time(),
+        }
+        with self._lock:
+            checksums = self._checksums(arxiv_id, version)
+            checksums[name] = entry
+            self._write_json(self.path(arxiv_id, version, 'checksums.json'), checksums)
+
+    def entry(self, arxiv_id: str, version: str, name: str, verify: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Return the checksum entry of an artifact if it is present and intact.
+
+        Args:
+            verify (bool): Re-hash the file instead of only comparing its size.
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry, or None if the artifact is
+            missing, truncated or (with verify) corrupted.
+        """
+        entry = self._checksums(arxiv_id, version).get(name)
+        artifact_path = self.path(arxiv_id, version, name)
+        if entry is None or not os.path.exists(artifact_path):
+            return None
+        if os.path.getsize(artifact_path) != entry['size']:
+            return None
+        if verify and file_sha256(artifact_path) != entry['sha256']:
+            return None
+        return entry
+
+    def _write_json(self, path: str, data: Any):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
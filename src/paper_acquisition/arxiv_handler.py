@@ -1,9 +1,96 @@
 import arxiv
-from typing import Tuple, Optional
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple, Optional
+
+# arXiv asks API clients for no more than one request every three seconds
+API_INTERVAL_SECONDS = 3.0
+_last_request = [0.0]
+_request_lock = threading.Lock()
+
+def _wait_for_rate_window(interval: float = API_INTERVAL_SECONDS):
+    """Block until the process-wide arXiv rate window allows another query."""
+    with _request_lock:
+        wait = _last_request[0] + interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request[0] = time.monotonic()
 
 class ArxivHandler:
     def __init__(self):
-        self.client = arxiv.Client()
+        self.client = arxiv.Client(delay_seconds=API_INTERVAL_SECONDS)
+
+    def get_metadata(self, arxiv_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look a paper up once, combining validation and metadata retrieval.
+        
+        Args:
+            arxiv_id (str): The arXiv ID of the paper, with or without a version.
+        
+        Returns:
+            Optional[Dict[str, Any]]: id, version, title, pdf_url, latex_url and
+            abstract, or None if the ID does not exist.
+        """
+        search = arxiv.Search(id_list=[arxiv_id])
+        _wait_for_rate_window()
+        try:
+            paper = next(self.client.results(search))
+        except StopIteration:
+            return None
+        return self._metadata_from_result(paper)
+
+    def fetch_metadata_batch(self, arxiv_ids: Iterable[str], chunk_size: int = 100) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve many IDs with chunked ``id_list`` queries instead of one query per paper.
+        
+        Args:
+            arxiv_ids (Iterable[str]): arXiv IDs, with or without versions.
+            chunk_size (int): IDs per API query.
+        
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Metadata (as returned by
+            get_metadata) per requested ID, or None for IDs arXiv does not know.
+        """
+        requested = list(dict.fromkeys(arxiv_ids))
+        metadata: Dict[str, Optional[Dict[str, Any]]] = {arxiv_id: None for arxiv_id in requested}
+        for start in range(0, len(requested), chunk_size):
+            chunk = requested[start:start + chunk_size]
+            search = arxiv.Search(id_list=chunk, max_results=len(chunk))
+            _wait_for_rate_window()
+            results = [self._metadata_from_result(paper) for paper in self.client.results(search)]
+            for arxiv_id, paper_metadata in self._match_requested(chunk, results).items():
+                metadata[arxiv_id] = paper_metadata
+        return metadata
+
+    @staticmethod
+    def _match_requested(requested: List[str], results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        # Results come back with versioned ids; requests may or may not carry a version
+        by_id = {}
+        for paper_metadata in results:
+            by_id[paper_metadata['id']] = paper_metadata
+            by_id[paper_metadata['id'] + paper_metadata['version']] = paper_metadata
+        return {arxiv_id: by_id[arxiv_id] for arxiv_id in requested if arxiv_id in by_id}
+
+    @staticmethod
+    def _metadata_from_result(paper) -> Dict[str, Any]:
+        short_id = paper.get_short_id()
+        match = re.match(r'(.+?)(v\d+)$', short_id)
+        base_id, version = (match.group(1), match.group(2)) if match else (short_id, 'v1')
+        return {
+            'id': base_id,
+            'version': version,
+            'title': paper.title,
+            'pdf_url': paper.pdf_url,
+            'latex_url': f"https://arxiv.org/e-print/{base_id}{version}",
+            'abstract': paper.summary,
+        }
+
+    def _require_metadata(self, arxiv_id: str) -> Dict[str, Any]:
+        metadata = self.get_metadata(arxiv_id)
+        if metadata is None:
+            raise ValueError(f"arXiv ID {arxiv_id} not found")
+        return metadata
 
     def get_paper_info(self, arxiv_id: str) -> Tuple[str, str, str, Optional[str]]:
         """
@@ -16,15 +103,8 @@ class ArxivHandler:
             Tuple[str, str, str, Optional[str]]: A tuple containing the paper title,
             PDF URL, LaTeX source URL, and abstract.
         """
-        search = arxiv.Search(id_list=[arxiv_id])
-        paper = next(search.results())
-        
-        title = paper.title
-        pdf_url = paper.pdf_url
-        latex_url = f"https://arxiv.org/e-print/{arxiv_id}"
-        abstract = paper.summary
-        
-        return title, pdf_url, latex_url, abstract
+        metadata = self._require_metadata(arxiv_id)
+        return metadata['title'], metadata['pdf_url'], metadata['latex_url'], metadata['abstract']
 
     def validate_arxiv_id(self, arxiv_id: str) -> bool:
         """
@@ -36,12 +116,7 @@ class ArxivHandler:
         Returns:
             bool: True if the ID is valid, False otherwise.
         """
-        try:
-            search = arxiv.Search(id_list=[arxiv_id])
-            next(search.results())
-            return True
-        except StopIteration:
-            return False
+        return self.get_metadata(arxiv_id) is not None
 
     def get_paper_abstract(self, arxiv_id: str) -> str:
         """
@@ -53,6 +128,4 @@ class ArxivHandler:
         Returns:
             str: The abstract of the paper.
         """
-        search = arxiv.Search(id_list=[arxiv_id])
-        paper = next(search.results())
-        return paper.summary
\ No newline at end of file
+        return self._require_metadata(arxiv_id)['abstract']
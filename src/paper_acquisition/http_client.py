@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status codes worth retrying; everything else in 4xx/5xx fails immediately
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class _RetryableStatus(Exception):
+    pass
+
+
+class HTTPClient:
+    """
+    Shared HTTP session for paper downloads.
+
+    Connections are pooled and kept alive across requests, bodies are streamed
+    to disk in chunks so memory stays flat on large source tarballs, and a
+    partial ``.part`` file left by an interrupted download is resumed with an
+    HTTP Range request. The validators of the response that started a
+    ``.part`` file are kept next to it and sent as If-Range, so a file that
+    changed on the server is downloaded again from the start instead of being
+    spliced onto the stale prefix. Finished files are moved into place atomically.
+    """
+
+    def __init__(self, pool_size: int = 16, retries: int = 3, backoff: float = 1.0,
+                 chunk_size: int = 1 << 20, timeout: Tuple[float, float] = (10, 60),
+                 user_agent: str = "paper-analysis/1.0"):
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = user_agent
+        self.stats = {'files': 0, 'bytes': 0, 'resumed': 0, 'retries': 0, 'not_modified': 0, 'seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def download(self, url: str, path: str) -> str:
+        """
+        Stream a URL to a file, resuming and retrying as needed.
+
+        Args:
+            url (str): The URL to fetch.
+            path (str): Destination path; written via ``path + '.part'``.
+
+        Returns:
+            str: The destination path.
+        """
+        self.fetch(url, path)
+        return path
+
+    def fetch(self, url: str, path: str, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Like download, but conditional on the given validators and returning
+        the response's validators.
+
+        Args:
+            url (str): The URL to fetch.
+            path (str): Destination path.
+            etag (Optional[str]): Sent as If-None-Match.
+            last_modified (Optional[str]): Sent as If-Modified-Since.
+
+        Returns:
+            Optional[Dict[str, Optional[str]]]: ``etag`` and ``last_modified`` of
+            the new file, or None if the server answered 304 Not Modified (the
+            file at path is left alone).
+        """
+        start = time.perf_counter()
+        part_path = path + '.part'
+        conditional = {}
+        if etag:
+            conditional['If-None-Match'] = etag
+        if last_modified:
+            conditional['If-Modified-Since'] = last_modified
+        for attempt in range(self.retries + 1):
+            try:
+                result = self._fetch(url, part_path, conditional)
+                break
+            except (requests.ConnectionError, requests.Timeout, _RetryableStatus) as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                print(f"Download of {url} failed ({str(e)}), retrying in {delay:.0f}s")
+                with self._stats_lock:
+                    self.stats['retries'] += 1
+                time.sleep(delay)
+        if result is None:
+            with self._stats_lock:
+                self.stats['not_modified'] += 1
+            return None
+        written, validators = result
+        os.replace(part_path, path)
+        self._remove(part_path + '.json')
+        with self._stats_lock:
+            self.stats['files'] += 1
+            self.stats['bytes'] += written
+            self.stats['seconds'] += time.perf_counter() - start
+        return validators
+
+    @staticmethod
+    def _remove(path: str):
+        if os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def _if_range(part_path: str) -> Optional[str]:
+        """The If-Range value for resuming part_path, or None if it cannot be resumed safely."""
+        try:
+            with open(part_path + '.json', 'r') as f:
+                validators = json.load(f)
+        except (OSError, ValueError):
+            return None
+        etag = validators.get('etag')
+        # If-Range only accepts strong ETags
+        if etag and not etag.startswith('W/'):
+            return etag
+        return validators.get('last_modified')
+
+    def _fetch(self, url: str, part_path: str, conditional: Dict[str, str]):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if_range = self._if_range(part_path) if offset else None
+        if offset and if_range is None:
+            # Without the validators of the partial file there is no way to tell
+            # whether the remote file changed since, so start over
+            self._remove(part_path)
+            offset = 0
+        # A partial file means the previous attempt already passed the validators
+        headers = {'Range': f'bytes={offset}-', 'If-Range': if_range} if offset else dict(conditional)
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 304:
+                return None
+            if response.status_code == 416:
+                # The partial file is no longer valid for this resource; start over
+                self._remove(part_path)
+                raise _RetryableStatus(f"range {offset}- not satisfiable")
+            if response.status_code in RETRY_STATUSES:
+                raise _RetryableStatus(f"HTTP {response.status_code}")
+            response.raise_for_status()
+
+            validators = {'etag': response.headers.get('ETag'),
+                          'last_modified': response.headers.get('Last-Modified')}
+            # A 200 to a ranged request means the file changed (If-Range failed): the body is the whole new file
+            resumed = response.status_code == 206
+            if resumed:
+                with self._stats_lock:
+                    self.stats['resumed'] += 1
+            else:
+                offset = 0
+                with open(part_path + '.json', 'w') as f:
+                    json.dump(validators, f)
+            expected = response.headers.get('Content-Length')
+            received = 0
+            with open(part_path, 'ab' if resumed else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+                    received += len(chunk)
+            if expected is not None and received < int(expected):
+                # Keep the partial file so the retry resumes from here
+                raise _RetryableStatus(f"connection closed after {received} of {expected} bytes")
+        return offset + received, validators
+
+    def download_many(self, jobs: List[Tuple[str, str]], workers: int = 8) -> Dict[str, Union[str, Exception]]:
+        """
+        Download several files in parallel over the shared session.
+
+        Args:
+            jobs (List[Tuple[str, str]]): (url, path) pairs.
+            workers (int): Maximum concurrent downloads.
+
+        Returns:
+            Dict[str, Union[str, Exception]]: Path per URL, or the exception that
+            made it fail.
+        """
+        def run(job):
+            url, path = job
+            try:
+                return url, self.download(url, path)
+            except Exception as e:
+                return url, e
+
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as pool:
+            return dict(pool.map(run, jobs))
+
+    def close(self):
+        self.session.close()
+
+
+_default_client: Optional[HTTPClient] = None
+_default_lock = threading.Lock()
+
+
+def get_default_client() -> HTTPClient:
+    """Return the process-wide client so every downloader shares one connection pool."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
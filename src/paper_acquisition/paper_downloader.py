@@ -1,15 +1,23 @@
-import requests
 import os
 import tarfile
 import gzip
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from .arxiv_handler import ArxivHandler
+from .artifact_store import ArtifactStore
+from .source_archive import SourceArchive
+from .http_client import get_default_client
 
 class PaperDownloader:
-    def __init__(self, base_dir):
+    def __init__(self, base_dir, client=None, store=None, revalidate=False):
         self.base_dir = base_dir
         self.arxiv_handler = ArxivHandler()
+        # Shared by default so keep-alive connections are reused across papers
+        self.client = client or get_default_client()
+        self.store = store or ArtifactStore(os.path.join(base_dir, 'artifacts'))
+        # Re-check stored artifacts with conditional requests instead of trusting them
+        self.revalidate = revalidate
 
     def download_paper(self, url):
         if 'arxiv.org' in url:
@@ -17,64 +25,116 @@ class PaperDownloader:
         else:
             return self._download_generic(url)
 
+    def resolve_metadata(self, arxiv_id):
+        """
+        Return the paper's metadata from the store, or from a single arXiv
+        lookup that also serves as validation.
+        """
+        metadata = self.store.get_metadata(arxiv_id)
+        if metadata is None:
+            metadata = self.arxiv_handler.get_metadata(arxiv_id)
+            if metadata is None:
+                raise ValueError(f"Invalid arXiv ID: {arxiv_id}")
+            self.store.put_metadata(arxiv_id, metadata)
+        return metadata
+
+    def prefetch_metadata(self, urls, chunk_size=100):
+        """
+        Fill the metadata store for a batch of arXiv URLs with bulk queries, so
+        the per-paper lookups in resolve_metadata stay local.
+        
+        Returns:
+            List[str]: The IDs arXiv did not recognise.
+        """
+        ids = [url.split('/')[-1] for url in urls if 'arxiv.org' in url]
+        missing = [arxiv_id for arxiv_id in ids if self.store.get_metadata(arxiv_id) is None]
+        if not missing:
+            return []
+        unknown = []
+        for arxiv_id, metadata in self.arxiv_handler.fetch_metadata_batch(missing, chunk_size).items():
+            if metadata is None:
+                unknown.append(arxiv_id)
+            else:
+                self.store.put_metadata(arxiv_id, metadata)
+        return unknown
+
     def _download_from_arxiv(self, url):
         arxiv_id = url.split('/')[-1]
-        
-        if not self.arxiv_handler.validate_arxiv_id(arxiv_id):
-            raise ValueError(f"Invalid arXiv ID: {arxiv_id}")
-        
-        title, pdf_url, latex_url, abstract = self.arxiv_handler.get_paper_info(arxiv_id)
+        metadata = self.resolve_metadata(arxiv_id)
+        paper_id, version = metadata['id'], metadata['version']
         
         # Create a valid filename from the title
-        valid_filename = self._create_valid_filename(title)
+        valid_filename = self._create_valid_filename(metadata['title'])
         
         # Create folders for the paper
-        raw_dir = os.path.join(self.base_dir, 'raw', valid_filename)
         processed_dir = os.path.join(self.base_dir, 'processed', valid_filename)
         output_dir = os.path.join(self.base_dir, 'output', valid_filename)
         
-        os.makedirs(raw_dir, exist_ok=True)
         os.makedirs(processed_dir, exist_ok=True)
         os.makedirs(output_dir, exist_ok=True)
         
-        # Download PDF
-        pdf_path = os.path.join(raw_dir, f"{valid_filename}.pdf")
-        self._download_file(pdf_url, pdf_path)
-        
-        # Download and extract LaTeX source files
-        latex_path = os.path.join(raw_dir, f"{valid_filename}_latex")
-        os.makedirs(latex_path, exist_ok=True)
-        source_file = os.path.join(latex_path, f"{valid_filename}_source")
-        self._download_file(latex_url, source_file)
+        # Download the PDF and the LaTeX source unless the store already has them
+        self._fetch_artifacts(paper_id, version, [('paper.pdf', metadata['pdf_url']),
+                                                  ('source', metadata['latex_url'])])
+        pdf_path = self.store.path(paper_id, version, 'paper.pdf')
+        source_file = self.store.path(paper_id, version, 'source')
         
-        # Check if it's a gzip file or a tar.gz file
-        if self._is_gzip_file(source_file):
-            self._extract_gzip(source_file, latex_path)
-        elif self._is_tar_file(source_file):
-            self._extract_tar(source_file, latex_path)
-        else:
-            print(f"Unknown source file format for {valid_filename}")
+        # Extract the source once per archive checksum
+        latex_path = self.store.path(paper_id, version, 'latex')
+        source_sha256 = self.store.entry(paper_id, version, 'source')['sha256']
+        marker = os.path.join(latex_path, '.source_sha256')
+        extracted_sha256 = None
+        if os.path.exists(marker):
+            with open(marker, 'r') as f:
+                extracted_sha256 = f.read()
+        if extracted_sha256 != source_sha256:
+            shutil.rmtree(latex_path, ignore_errors=True)
+            os.makedirs(latex_path)
+            # A tarball (usually gzipped) or a single gzipped .tex file; test for
+            # tar first, since a .tar.gz also starts with the gzip magic bytes
+            if self._is_tar_file(source_file):
+                self._extract_tar(source_file, latex_path)
+            elif self._is_gzip_file(source_file):
+                self._extract_gzip(source_file, latex_path)
+            else:
+                print(f"Unknown source file format for {valid_filename}")
+            with open(marker, 'w') as f:
+                f.write(source_sha256)
         
-        # Clean up the original source file
-        os.remove(source_file)
-        
-        return pdf_path, latex_path, abstract, processed_dir, output_dir
+        return pdf_path, latex_path, metadata['abstract'], processed_dir, output_dir
+
+    def _fetch_artifacts(self, arxiv_id, version, artifacts):
+        """Download missing (or, with revalidate, changed) artifacts into the store in parallel."""
+        def fetch(artifact):
+            name, url = artifact
+            entry = self.store.entry(arxiv_id, version, name)
+            if entry is not None and not self.revalidate:
+                return
+            path = self.store.path(arxiv_id, version, name, create=True)
+            if entry is None:
+                validators = self.client.fetch(url, path)
+            else:
+                validators = self.client.fetch(url, path, entry['etag'], entry['last_modified'])
+            if validators is not None:
+                self.store.record(arxiv_id, version, name, validators)
+
+        with ThreadPoolExecutor(max_workers=len(artifacts)) as pool:
+            list(pool.map(fetch, artifacts))
 
     def _download_generic(self, url):
-        response = requests.get(url)
         filename = os.path.basename(urlparse(url).path)
-        file_path = os.path.join(self.download_dir, filename)
-        
-        with open(file_path, 'wb') as f:
-            f.write(response.content)
-        
-        return file_path, None, None
+        name = os.path.splitext(filename)[0]
+        raw_dir = os.path.join(self.base_dir, 'raw', name)
+        processed_dir = os.path.join(self.base_dir, 'processed', name)
+        output_dir = os.path.join(self.base_dir, 'output', name)
+        for directory in (raw_dir, processed_dir, output_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        file_path = self._download_file(url, os.path.join(raw_dir, filename))
+        return file_path, None, None, processed_dir, output_dir
 
     def _download_file(self, url, path):
-        response = requests.get(url)
-        response.raise_for_status()
-        with open(path, 'wb') as f:
-            f.write(response.content)
+        return self.client.download(url, path)
 
     def _is_gzip_file(self, file_path):
         with open(file_path, 'rb') as f:
@@ -89,8 +149,12 @@ class PaperDownloader:
                 shutil.copyfileobj(f_in, f_out)
 
     def _extract_tar(self, tar_path, extract_path):
-        with tarfile.open(tar_path, 'r:gz') as tar:
-            tar.extractall(path=extract_path)
+        # Only TeX sources and the graphics they include; the rest of the bundle stays packed
+        archive = SourceArchive(tar_path)
+        archive.extract(extract_path)
+        stats = archive.stats()
+        print(f"Extracted {stats['selected']}/{stats['members']} source members "
+              f"({stats['selected_bytes'] / 1e6:.1f} of {stats['bytes'] / 1e6:.1f} MB)")
 
     def _create_valid_filename(self, title):
         # Remove invalid characters and replace spaces with underscores
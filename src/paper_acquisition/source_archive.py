@@ -0,0 +1,167 @@
+import os
+import posixpath
+import re
+import shutil
+import tarfile
+from typing import Dict, Iterable, List, Optional, Set
+
+SOURCE_EXTENSIONS = ('.tex', '.bbl', '.sty')
+GRAPHIC_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.eps')
+
+INCLUDEGRAPHICS_PATTERN = re.compile(r'\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+GRAPHICSPATH_PATTERN = re.compile(r'\\graphicspath\s*\{((?:\s*\{[^}]*\})+)\s*\}')
+
+
+def safe_member_name(name: str) -> Optional[str]:
+    """
+    Normalize an archive member name, or return None if extracting it could
+    escape the destination directory (absolute paths, ``..`` components).
+    """
+    name = name.replace('\\', '/')
+    if name.startswith('/') or re.match(r'^[A-Za-z]:', name):
+        return None
+    normalized = posixpath.normpath(name)
+    if normalized == '.' or normalized == '..' or normalized.startswith('../'):
+        return None
+    return normalized
+
+
+def _strip_comments(text: str) -> str:
+    return re.sub(r'(?<!\\)%.*', '', text)
+
+
+class SourceArchive:
+    """
+    Selective reader for an arXiv e-print tarball.
+
+    The archive is read as a stream, never seeking: the first pass indexes
+    every member and keeps the (small) TeX sources in memory, the graphics
+    referenced by ``\\includegraphics`` are resolved from those sources, and a
+    second pass extracts only what was selected. Datasets, checkpoints and
+    unused images in the bundle are never written to disk. Links, devices and
+    members whose path would escape the destination are skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index: Dict[str, int] = {}
+        self.sources: Dict[str, bytes] = {}
+        self._scan()
+
+    def _open(self) -> tarfile.TarFile:
+        # Stream mode with transparent decompression; members must be read in order
+        return tarfile.open(self.path, mode='r|*')
+
+    def _scan(self):
+        with self._open() as tar:
+            for member in tar:
+                name = safe_member_name(member.name)
+                if name is None or not member.isfile():
+                    continue
+                self.index[name] = member.size
+                if name.lower().endswith(SOURCE_EXTENSIONS):
+                    self.sources[name] = tar.extractfile(member).read()
+
+    def read(self, name: str) -> bytes:
+        """
+        Read one member's bytes straight from the archive, without writing to disk.
+
+        Args:
+            name (str): The member name as listed in ``index``.
+
+        Returns:
+            bytes: The member's content.
+        """
+        if name in self.sources:
+            return self.sources[name]
+        if name not in self.index:
+            raise KeyError(f"{name} is not in {self.path}")
+        with self._open() as tar:
+            for member in tar:
+                if member.isfile() and safe_member_name(member.name) == name:
+                    return tar.extractfile(member).read()
+        raise KeyError(f"{name} is not in {self.path}")
+
+    def referenced_graphics(self) -> Set[str]:
+        """Resolve every ``\\includegraphics`` target in the TeX sources to an archive member."""
+        graphics_dirs = ['']
+        references = []
+        for name, data in self.sources.items():
+            if not name.endswith('.tex'):
+                continue
+            text = _strip_comments(data.decode('utf-8', errors='replace'))
+            for group in GRAPHICSPATH_PATTERN.findall(text):
+                graphics_dirs.extend(re.findall(r'\{([^}]*)\}', group))
+            for reference in INCLUDEGRAPHICS_PATTERN.findall(text):
+                references.append((posixpath.dirname(name), reference.strip()))
+
+        selected = set()
+        for tex_dir, reference in references:
+            member = self._resolve_graphic(reference, graphics_dirs, tex_dir)
+            if member is not None:
+                selected.add(member)
+        return selected
+
+    def _resolve_graphic(self, reference: str, graphics_dirs: List[str], tex_dir: str) -> Optional[str]:
+        # LaTeX resolves relative to the main file, then \graphicspath; the
+        # including file's directory covers sources that \input from subdirectories
+        for directory in graphics_dirs + [tex_dir]:
+            for extension in ('',) + GRAPHIC_EXTENSIONS:
+                candidate = safe_member_name(posixpath.join(directory, reference + extension))
+                if candidate in self.index and candidate not in self.sources:
+                    return candidate
+        return None
+
+    def selected_members(self) -> Set[str]:
+        return set(self.sources) | self.referenced_graphics()
+
+    def extract(self, dest: str, members: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Extract selected members into a directory.
+
+        Args:
+            dest (str): Destination directory.
+            members (Optional[Iterable[str]]): Member names; defaults to the TeX
+                sources plus the graphics they reference.
+
+        Returns:
+            List[str]: Paths of the files written.
+        """
+        selected = set(members) if members is not None else self.selected_members()
+        dest_root = os.path.realpath(dest)
+        written = []
+        for name in sorted(selected & set(self.sources)):
+            written.append(self._write(dest_root, name, self.sources[name]))
+        remaining = selected - set(self.sources)
+        if remaining:
+            with self._open() as tar:
+                for member in tar:
+                    name = safe_member_name(member.name)
+                    if name in remaining and member.isfile():
+                        written.append(self._write(dest_root, name, tar.extractfile(member)))
+                        remaining.discard(name)
+                        if not remaining:
+                            break
+        return written
+
+    @staticmethod
+    def _write(dest_root: str, name: str, content) -> str:
+        target = os.path.realpath(os.path.join(dest_root, *name.split('/')))
+        if os.path.commonpath([dest_root, target]) != dest_root:
+            raise ValueError(f"Refusing to extract {name} outside {dest_root}")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            if isinstance(content, bytes):
+                f.write(content)
+            else:
+                shutil.copyfileobj(content, f)
+        return target
+
+    def stats(self) -> Dict[str, int]:
+        selected = self.selected_members()
+        return {
+            'members': len(self.index),
+            'bytes': sum(self.index.values()),
+            'selected': len(selected),
+            'selected_bytes': sum(self.index[name] for name in selected),
+        }
@@ -0,0 +1,187 @@
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from src.paper_acquisition.paper_downloader import PaperDownloader
+
+from .checkpoints import DONE, FAILED, CheckpointStore
+from .stage_pipeline import StagePipeline
+from .stages import STAGES, analyze_stage, download_stage, extract_stage, load_questions
+
+logger = logging.getLogger(__name__)
+
+
+def load_urls(path: str) -> List[str]:
+    """
+    Read paper URLs from a paper list YAML (``papers: [{name, url}, ...]``) or a
+    plain text file with one URL per line.
+    """
+    if path.endswith(('.yaml', '.yml')):
+        with open(path, 'r') as file:
+            return [paper['url'] for paper in yaml.safe_load(file)['papers']]
+    with open(path, 'r') as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith('#')]
+
+
+class BatchRunner:
+    """
+    Runs many papers through download, extraction and analysis on a worker pool.
+
+    Each stage has its own concurrency limit (network, CPU and API bound
+    respectively), so e.g. four papers can download while one runs TFT-ID and
+    several sit in LLM calls. A failure only stops the paper it happened in.
+    Stage results are checkpointed, and a rerun skips stages that already finished.
+    By default the stages run as a pipeline (see StagePipeline) and the summary
+    reports per-stage utilization, which shows where the bottleneck is.
+    """
+
+    def __init__(self, base_dir: str, openai_api_key: str, anthropic_api_key: str,
+                 download_workers: int = 4, extract_workers: int = 1, api_workers: int = 4,
+                 questions: Optional[List[str]] = None, mode: str = "per_question",
+                 checkpoint_dir: Optional[str] = None):
+        self.base_dir = base_dir
+        self.openai_api_key = openai_api_key
+        self.anthropic_api_key = anthropic_api_key
+        self.questions = questions if questions is not None else load_questions()
+        self.mode = mode
+        self.limits = {'network': download_workers, 'cpu': extract_workers, 'api': api_workers}
+        # Per-kind limits for the sequential mode, where one pool carries papers through
+        # every stage; in the pipeline each stage's worker count is already its limit
+        self._semaphores = {kind: threading.BoundedSemaphore(limit) for kind, limit in self.limits.items()}
+        self.checkpoints = CheckpointStore(checkpoint_dir or os.path.join(base_dir, 'checkpoints'))
+        self.stage_functions: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'download': lambda state: download_stage(state['url'], self.base_dir),
+            'extract': lambda state: extract_stage(state['download']),
+            'analyze': lambda state: analyze_stage(state['download'], state['extract'], self.questions,
+                                                   self.openai_api_key, self.anthropic_api_key, self.mode),
+        }
+
+    def _run_stage(self, state: Dict[str, Any], stage: str, kind: str, throttle: bool = True) -> bool:
+        """
+        Run one stage of a paper in place; returns False if it failed. With
+        ``throttle`` the stage waits for a slot of its resource kind.
+        """
+        url = state['url']
+        result = self.checkpoints.stage_result(url, stage)
+        if result is not None:
+            state[stage] = result
+            return True
+        start = time.perf_counter()
+        try:
+            with self._semaphores[kind] if throttle else nullcontext():
+                result = self.stage_functions[stage](state)
+            # A stage whose result cannot be checkpointed counts as failed
+            self.checkpoints.record(url, stage, DONE, result=result, seconds=time.perf_counter() - start)
+        except Exception as e:
+            logger.warning(f"[{stage}] failed for {url}: {str(e)}")
+            state.update({'status': FAILED, 'failed_stage': stage, 'error': str(e)})
+            try:
+                self.checkpoints.record(url, stage, FAILED, error=traceback.format_exc(),
+                                        seconds=time.perf_counter() - start)
+            except Exception as record_error:
+                logger.error(f"[{stage}] could not checkpoint the failure for {url}: {str(record_error)}")
+            return False
+        state[stage] = result
+        return True
+
+    def process(self, url: str) -> Dict[str, Any]:
+        """
+        Run the remaining stages of one paper, resuming from its checkpoint.
+
+        Returns:
+            Dict[str, Any]: The paper's state: the url, each stage's result, and
+            ``status`` ("done" or "failed") plus ``error`` on failure.
+        """
+        state = {'url': url}
+        for stage, kind in STAGES:
+            if not self._run_stage(state, stage, kind):
+                return state
+        state['status'] = DONE
+        return state
+
+    def _pipeline_stage(self, stage: str, kind: str, is_last: bool) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        def run_stage(state: Dict[str, Any]) -> Dict[str, Any]:
+            if not self._run_stage(state, stage, kind, throttle=False):
+                state['done'] = True
+            elif is_last:
+                state['status'] = DONE
+            return state
+        return run_stage
+
+    def prefetch_metadata(self, urls: List[str]):
+        """Resolve arXiv metadata for the whole batch up front in a few bulk queries."""
+        pending = [url for url in urls if self.checkpoints.stage_result(url, 'download') is None]
+        if not pending:
+            return
+        try:
+            unknown = PaperDownloader(self.base_dir).prefetch_metadata(pending)
+        except Exception as e:
+            # Not fatal: each paper falls back to its own lookup in the download stage
+            logger.warning(f"Bulk metadata prefetch failed: {str(e)}")
+            return
+        for arxiv_id in unknown:
+            logger.warning(f"arXiv does not know {arxiv_id}")
+
+    def run(self, urls: List[str], restart: bool = False, pipelined: bool = True,
+            queue_size: int = 2) -> Dict[str, Any]:
+        """
+        Process a batch of papers.
+
+        Args:
+            urls (List[str]): Paper URLs.
+            restart (bool): Ignore existing checkpoints and redo every stage.
+            pipelined (bool): Run the stages as a producer/consumer pipeline with
+                bounded queues between them; otherwise each worker carries one
+                paper through all stages.
+            queue_size (int): Papers allowed to wait between two stages before
+                the upstream stage blocks.
+
+        Returns:
+            Dict[str, Any]: Per-paper states plus throughput numbers.
+        """
+        if restart:
+            for url in urls:
+                self.checkpoints.reset(url)
+        start = time.perf_counter()
+        self.prefetch_metadata(urls)
+        utilization = None
+        if pipelined:
+            pipeline = StagePipeline([
+                (stage, self._pipeline_stage(stage, kind, index == len(STAGES) - 1), self.limits[kind])
+                for index, (stage, kind) in enumerate(STAGES)
+            ], queue_size=queue_size)
+            papers = pipeline.run({'url': url} for url in urls)
+            for paper in papers:
+                paper.pop('done', None)
+                # Papers the pipeline stopped without a status (an exception escaped the stage) failed
+                paper.setdefault('status', FAILED)
+            utilization = pipeline.utilization()
+        else:
+            max_workers = max(1, min(len(urls), sum(self.limits.values())))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                papers = list(pool.map(self.process, urls))
+        elapsed = time.perf_counter() - start
+
+        completed = sum(1 for paper in papers if paper.get('status') == DONE)
+        summary = {
+            'papers': papers,
+            'completed': completed,
+            'failed': len(papers) - completed,
+            'seconds': round(elapsed, 1),
+            'papers_per_hour': round(completed / elapsed * 3600, 1) if elapsed else 0.0,
+        }
+        if utilization is not None:
+            summary['stages'] = utilization
+            for stage, metrics in utilization.items():
+                logger.info(f"  {stage:<9} utilization {metrics['utilization']:.0%}, "
+                            f"blocked {metrics['blocked_seconds']:.0f}s, max queue {metrics['max_queue_depth']}")
+        logger.info(f"Completed {completed}/{len(papers)} papers in {elapsed:.0f}s "
+                    f"({summary['papers_per_hour']} papers/hour)")
+        return summary
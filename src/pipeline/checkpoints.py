@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DONE = "done"
+FAILED = "failed"
+
+
+class CheckpointStore:
+    """
+    Per-paper stage status persisted as one small JSON file per paper, so an
+    interrupted or partially failed batch resumes from the last finished stage.
+    """
+
+    def __init__(self, checkpoint_dir: str):
+        self.checkpoint_dir = checkpoint_dir
+        self._lock = threading.Lock()
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.checkpoint_dir, hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + '.json')
+
+    def load(self, url: str) -> Dict[str, Any]:
+        path = self._path(url)
+        if not os.path.exists(path):
+            return {'url': url, 'stages': {}}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def stage_result(self, url: str, stage: str) -> Optional[Dict[str, Any]]:
+        entry = self.load(url)['stages'].get(stage)
+        if entry and entry['status'] == DONE:
+            return entry['result']
+        return None
+
+    def record(self, url: str, stage: str, status: str, result: Any = None, error: str = None, seconds: float = 0.0):
+        with self._lock:
+            checkpoint = self.load(url)
+            checkpoint['stages'][stage] = {
+                'status': status,
+                'result': result,
+                'error': error,
+                'seconds': round(seconds, 3),
+                'updated': time.time(),
+            }
+            path = self._path(url)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(checkpoint, f, indent=2)
+            # Atomic replace, so a crash mid-write never leaves a corrupt checkpoint
+            os.replace(tmp_path, path)
+
+    def reset(self, url: str):
+        path = self._path(url)
+        if os.path.exists(path):
+            os.remove(path)
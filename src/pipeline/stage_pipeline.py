@@ -0,0 +1,130 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+_DONE = object()
+
+
+@dataclass
+class StageMetrics:
+    workers: int
+    items: int = 0
+    busy_seconds: float = 0.0
+    # Time workers spent blocked handing items to a full downstream queue
+    blocked_seconds: float = 0.0
+    max_queue_depth: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def as_dict(self, wall_seconds: float) -> Dict[str, float]:
+        return {
+            'workers': self.workers,
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'blocked_seconds': round(self.blocked_seconds, 3),
+            'utilization': round(self.busy_seconds / (self.workers * wall_seconds), 3) if wall_seconds else 0.0,
+            'max_queue_depth': self.max_queue_depth,
+        }
+
+
+class StagePipeline:
+    """
+    Producer/consumer pipeline: each stage has its own worker threads and a
+    bounded input queue, so different items occupy different stages at the
+    same time (paper N+1 downloads and extracts while paper N is in LLM calls).
+
+    A full queue blocks the upstream stage (backpressure), which caps how many
+    downloaded-but-unprocessed papers pile up. Each stage function takes and
+    returns an item; it can mark an item finished early by returning it with
+    ``done=True`` set, and later stages pass it through untouched. An exception
+    does the same and leaves ``failed_stage``/``error`` on the item.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Dict[str, Any]], Dict[str, Any]], int]],
+                 queue_size: int = 2):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.metrics: Dict[str, StageMetrics] = {}
+        self.wall_seconds = 0.0
+
+    def run(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Push items through every stage.
+
+        Args:
+            items (Iterable[Dict[str, Any]]): Input items; consumed lazily.
+
+        Returns:
+            List[Dict[str, Any]]: Output items in input order.
+        """
+        self.metrics = {name: StageMetrics(workers) for name, _, workers in self.stages}
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: Dict[int, Dict[str, Any]] = {}
+        results_lock = threading.Lock()
+        start = time.perf_counter()
+
+        def worker(stage_index: int, finished: List[int], finished_lock: threading.Lock):
+            name, fn, workers = self.stages[stage_index]
+            metrics = self.metrics[name]
+            in_queue = queues[stage_index]
+            is_last = stage_index == len(self.stages) - 1
+            while True:
+                entry = in_queue.get()
+                if entry is _DONE:
+                    with finished_lock:
+                        finished[0] += 1
+                        last_worker = finished[0] == workers
+                    # The last worker out tells every worker of the next stage to stop
+                    if last_worker and not is_last:
+                        for _ in range(self.stages[stage_index + 1][2]):
+                            queues[stage_index + 1].put(_DONE)
+                    return
+                position, item = entry
+                if not item.get('done'):
+                    busy_start = time.perf_counter()
+                    try:
+                        item = fn(item)
+                    except Exception as e:
+                        # A dead worker would stall the whole pipeline, so record and move on
+                        item.update({'done': True, 'failed_stage': name, 'error': str(e)})
+                    with metrics.lock:
+                        metrics.busy_seconds += time.perf_counter() - busy_start
+                        metrics.items += 1
+                if is_last:
+                    with results_lock:
+                        results[position] = item
+                    continue
+                blocked_start = time.perf_counter()
+                queues[stage_index + 1].put((position, item))
+                next_metrics = self.metrics[self.stages[stage_index + 1][0]]
+                with metrics.lock:
+                    metrics.blocked_seconds += time.perf_counter() - blocked_start
+                with next_metrics.lock:
+                    next_metrics.max_queue_depth = max(next_metrics.max_queue_depth, queues[stage_index + 1].qsize())
+
+        threads = []
+        for stage_index, (_, _, workers) in enumerate(self.stages):
+            finished, finished_lock = [0], threading.Lock()
+            for _ in range(workers):
+                thread = threading.Thread(target=worker, args=(stage_index, finished, finished_lock), daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        count = 0
+        first_metrics = self.metrics[self.stages[0][0]]
+        for position, item in enumerate(items):
+            queues[0].put((position, item))
+            count += 1
+            with first_metrics.lock:
+                first_metrics.max_queue_depth = max(first_metrics.max_queue_depth, queues[0].qsize())
+        for _ in range(self.stages[0][2]):
+            queues[0].put(_DONE)
+        for thread in threads:
+            thread.join()
+
+        self.wall_seconds = time.perf_counter() - start
+        return [results[position] for position in range(count)]
+
+    def utilization(self) -> Dict[str, Dict[str, float]]:
+        return {name: metrics.as_dict(self.wall_seconds) for name, metrics in self.metrics.items()}
@@ -0,0 +1,91 @@
+import json
+import os
+import yaml
+from src.paper_acquisition.paper_downloader import PaperDownloader
+from src.content_extraction.latex_processor import LaTeXProcessor
+from src.content_extraction.pdf_processor import PDFProcessor
+from src.content_extraction.image_processor import ImageProcessor
+from src.content_extraction.table_extractor import load_tables, save_tables, tables_from_latex
+from src.information_extraction.text_analyzer import TextAnalyzer
+from src.information_extraction.image_analyzer import ImageAnalyzer
+from src.information_extraction.combined_analyzer import CombinedAnalyzer
+from src.information_extraction.retrieval import RetrievalIndex
+from src.reasoning.calculator import ReasoningCalculator
+
+# Stage name -> the kind of resource it is bound by, used to pick its concurrency limit
+STAGES = [("download", "network"), ("extract", "cpu"), ("analyze", "api")]
+
+def load_questions(path='config/questions.yaml'):
+    with open(path, 'r') as file:
+        return yaml.safe_load(file)
+
+def download_stage(url, base_dir):
+    downloader = PaperDownloader(base_dir)
+    pdf_path, latex_path, abstract, processed_dir, output_dir = downloader.download_paper(url)
+    return {
+        'pdf_path': pdf_path,
+        'latex_path': latex_path,
+        'abstract': abstract,
+        'processed_dir': processed_dir,
+        'output_dir': output_dir,
+    }
+
+def extract_stage(paper):
+    """
+    Extract text and figures, preferring LaTeX and falling back to the PDF.
+    Text, figure metadata and tables are written to disk so later stages (and reruns) can read them.
+    """
+    text, image_paths, figures, tables = None, [], [], []
+    if paper['latex_path']:
+        document = LaTeXProcessor(paper['latex_path']).extract_structure()
+        if document is not None:
+            text = document.text
+            # LaTeX sources have no page numbers; captions are in the figure metadata
+            image_paths = [(None, path) for path in document.image_paths()]
+            figures = document.figure_metadata()
+            tables = tables_from_latex(document)
+            with open(os.path.join(paper['processed_dir'], 'latex_structure.json'), 'w', encoding='utf-8') as f:
+                json.dump(document.to_dict(), f, indent=2)
+    if text is None:
+        with PDFProcessor(paper['pdf_path']) as processor:
+            text, images, figures = processor.extract_content()
+            image_paths = ImageProcessor.save_images(images, paper['processed_dir'])
+            tables = processor.extract_tables()
+
+    if paper['abstract']:
+        text = f"Abstract:\n{paper['abstract']}\n\n{text}"
+
+    text_path = os.path.join(paper['processed_dir'], 'text.txt')
+    with open(text_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    with open(os.path.join(paper['output_dir'], 'figure_metadata.json'), 'w') as f:
+        json.dump(figures, f, indent=2)
+    tables_path = os.path.join(paper['processed_dir'], 'tables.json')
+    save_tables(tables, tables_path)
+    return {'text_path': text_path, 'image_paths': image_paths, 'tables_path': tables_path}
+
+def analyze_stage(paper, extracted, questions, openai_api_key, anthropic_api_key, mode="per_question"):
+    with open(extracted['text_path'], 'r', encoding='utf-8') as f:
+        text = f.read()
+    image_paths = [tuple(item) for item in extracted['image_paths']]
+    # Checkpoints written before table extraction existed have no tables_path
+    tables = load_tables(extracted['tables_path']) if extracted.get('tables_path') else []
+
+    text_analyzer = TextAnalyzer(anthropic_api_key)
+    image_analyzer = ImageAnalyzer(openai_api_key)
+    combined_analyzer = CombinedAnalyzer(text_analyzer, image_analyzer)
+
+    text_summary, image_summary = combined_analyzer.analyze(text, image_paths)
+    index = RetrievalIndex.load_or_build(text, paper['processed_dir'])
+    combined_responses = combined_analyzer.answer_questions(text_summary, image_summary, questions, mode=mode, index=index,
+                                                          tables=tables)
+
+    calculator = ReasoningCalculator(anthropic_api_key)
+    final_answers = calculator.reason_and_calculate(combined_responses, questions)
+
+    results_path = os.path.join(paper['output_dir'], 'results.json')
+    with open(results_path, 'w') as f:
+        json.dump(final_answers, f, indent=2)
+    with open(os.path.join(paper['output_dir'], 'combined_responses.json'), 'w') as f:
+        json.dump(combined_responses, f, indent=2)
+    return {'results_path': results_path}
@@ -1,30 +1,40 @@
 import anthropic
+from ..information_extraction.request_executor import default_executor
+from ..information_extraction.response_cache import get_default_cache
 
 class ReasoningCalculator:
-    def __init__(self, anthropic_api_key):
+    def __init__(self, anthropic_api_key, executor=None, cache=None):
         self.client = anthropic.Anthropic(api_key=anthropic_api_key)
+        self.executor = executor or default_executor
+        self.cache = cache or get_default_cache()
+
+    def _create(self, **request):
+        # Identical requests are served from the response cache
+        return self.cache.cached("anthropic", request, lambda: self.client.messages.create(**request).content[0].text)
 
     def reason_and_calculate(self, combined_responses, questions):
-        final_answers = {}
-        for question, responses in combined_responses.items():
-            prompt = f"""
-            Question: {question}
-            
-            Information from text: {responses['text_response']}
-            
-            Information from images: {responses['image_response']}
-            
-            Based on this information, provide a final answer to the question. If calculation is needed, show your work. If the information is inconsistent or unclear, explain why.
-            """
-            
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20240620",
-                max_tokens=1000,
-                temperature=0,
-                system="You are an AI assistant tasked with reasoning about and calculating final answers for questions about AI models based on extracted information.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            final_answers[question] = response.content[0].text
-        return final_answers
\ No newline at end of file
+        calls = [(question, lambda question=question, responses=responses: self._reason(question, responses))
+                 for question, responses in combined_responses.items()]
+        return self.executor.run("anthropic", calls)
+
+    def _reason(self, question, responses):
+        prompt = f"""
+        Question: {question}
+        
+        Information from text: {responses['text_response']}
+        
+        Information from images: {responses['image_response']}
+        
+        Based on this information, provide a final answer to the question. If calculation is needed, show your work. If the information is inconsistent or unclear, explain why.
+        """
+        
+        response = self._create(
+            model="claude-3-5-sonnet-20240620",
+            max_tokens=1000,
+            temperature=0,
+            system="You are an AI assistant tasked with reasoning about and calculating final answers for questions about AI models based on extracted information.",
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return response
\ No newline at end of file
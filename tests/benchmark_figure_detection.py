@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+import argparse
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.pdf_processor import PDFProcessor
+from content_extraction.detector_registry import warm_up_detector
+
+def benchmark_detection(pdf_path, batch_sizes, num_beams, fast_detection, max_pages=None):
+    """
+    Report TFT-ID detection throughput (pages/sec) for each batch size.
+    """
+    handle = warm_up_detector()
+    print(f"Detector loaded in {handle.load_seconds:.1f}s on {handle.device}")
+
+    processor = PDFProcessor(pdf_path, num_beams=num_beams, fast_detection=fast_detection)
+    page_nums = list(range(len(processor.page_cache)))
+    if max_pages:
+        page_nums = page_nums[:max_pages]
+    # Render once up front so only detection is timed
+    for page_num in page_nums:
+        processor.page_cache.get(page_num)
+
+    baseline = None
+    for batch_size in batch_sizes:
+        processor.detection_batch_size = batch_size
+        start = time.perf_counter()
+        detections = processor.detect_objects(page_nums)
+        elapsed = time.perf_counter() - start
+        figure_count = sum(1 for page in detections.values() for _, label in page if label == 'figure')
+        pages_per_sec = len(page_nums) / elapsed
+        baseline = baseline or pages_per_sec
+        print(f"batch_size={batch_size:<3} {pages_per_sec:6.2f} pages/sec "
+              f"({pages_per_sec / baseline:4.2f}x)  figures={figure_count}")
+    processor.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched TFT-ID figure detection")
+    parser.add_argument("pdf_path")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--num-beams", type=int, default=3)
+    parser.add_argument("--fast", action="store_true", help="Greedy decoding instead of beam search")
+    parser.add_argument("--max-pages", type=int, default=None)
+    args = parser.parse_args()
+
+    benchmark_detection(args.pdf_path, args.batch_sizes, args.num_beams, args.fast, args.max_pages)
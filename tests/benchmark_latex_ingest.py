@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import argparse
+
+import chardet
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.latex_processor import LaTeXProcessor
+
+def source_trees(corpus_dir):
+    """Each subdirectory of the corpus is one extracted arXiv source tree."""
+    for name in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, name)
+        if os.path.isdir(path):
+            files = [os.path.join(root, file) for root, _, names in os.walk(path)
+                     for file in names if file.endswith(('.tex', '.bbl'))]
+            yield path, files
+
+def full_chardet_read(file_path):
+    """The previous decoder: chardet over every byte, then a second read to decode."""
+    with open(file_path, 'rb') as f:
+        raw_data = f.read()
+    encoding = chardet.detect(raw_data)['encoding']
+    with open(file_path, 'r', encoding=encoding) as f:
+        return f.read()
+
+def benchmark_ingest(corpus_dir, extract):
+    trees = list(source_trees(corpus_dir))
+    total_bytes = sum(os.path.getsize(path) for _, files in trees for path in files)
+    print(f"{len(trees)} source trees, {sum(len(files) for _, files in trees)} files, {total_bytes / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    for _, files in trees:
+        for path in files:
+            full_chardet_read(path)
+    baseline = time.perf_counter() - start
+    print(f"full chardet   {baseline:7.2f}s  {total_bytes / 1e6 / baseline:7.1f} MB/s")
+
+    start = time.perf_counter()
+    mismatches = 0
+    for tree, files in trees:
+        processor = LaTeXProcessor(tree)
+        for path in files:
+            text = processor._read_file_with_encoding(path)
+            if text is None:
+                mismatches += 1
+    tiered = time.perf_counter() - start
+    print(f"tiered decode  {tiered:7.2f}s  {total_bytes / 1e6 / tiered:7.1f} MB/s  "
+          f"({baseline / tiered:.1f}x, {mismatches} undecodable)")
+
+    if extract:
+        start = time.perf_counter()
+        for tree, _ in trees:
+            LaTeXProcessor(tree).extract_content()
+        print(f"extract_content {time.perf_counter() - start:6.2f}s for the whole corpus")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LaTeX source decoding")
+    parser.add_argument("corpus_dir", help="Directory with one extracted arXiv source tree per subdirectory")
+    parser.add_argument("--extract", action="store_true", help="Also time full text extraction")
+    args = parser.parse_args()
+
+    benchmark_ingest(args.corpus_dir, args.extract)
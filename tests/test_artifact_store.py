@@ -0,0 +1,47 @@
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from paper_acquisition.artifact_store import ArtifactStore
+
+METADATA = {
+    'id': '2106.09685',
+    'version': 'v2',
+    'title': 'LoRA: Low-Rank Adaptation of Large Language Models',
+    'pdf_url': 'http://arxiv.org/pdf/2106.09685v2',
+    'latex_url': 'https://arxiv.org/e-print/2106.09685v2',
+    'abstract': 'An important paradigm of natural language processing...',
+}
+
+def test_metadata_is_found_by_requested_id(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    assert store.get_metadata('2106.09685') is None
+    store.put_metadata('2106.09685', METADATA)
+    assert store.get_metadata('2106.09685') == METADATA
+    # A fresh store over the same directory needs no lookup either
+    assert ArtifactStore(str(tmp_path)).get_metadata('2106.09685')['version'] == 'v2'
+
+def test_truncated_or_corrupted_artifacts_are_not_trusted(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    path = store.path('2106.09685', 'v2', 'paper.pdf', create=True)
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.5 example')
+    assert store.entry('2106.09685', 'v2', 'paper.pdf') is None
+    store.record('2106.09685', 'v2', 'paper.pdf', {'etag': '"abc"', 'last_modified': None})
+    assert store.entry('2106.09685', 'v2', 'paper.pdf')['etag'] == '"abc"'
+
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.5 exampl')
+    assert store.entry('2106.09685', 'v2', 'paper.pdf') is None
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.5 EXAMPLE')
+    assert store.entry('2106.09685', 'v2', 'paper.pdf') is not None
+    assert store.entry('2106.09685', 'v2', 'paper.pdf', verify=True) is None
+
+def test_lookups_do_not_create_directories(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.path('2106.09685', 'v2', 'paper.pdf')
+    assert store.entry('2106.09685', 'v2', 'paper.pdf') is None
+    assert not os.path.exists(store.paper_dir('2106.09685', 'v2'))
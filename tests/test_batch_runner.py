@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+
+# batch_runner imports its siblings as src.*, so the repo root goes on the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipeline.batch_runner import BatchRunner
+from src.pipeline.checkpoints import DONE, FAILED, CheckpointStore
+
+
+def test_checkpoint_store_keeps_only_finished_results(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.record('url', 'download', DONE, result={'pdf_path': 'paper.pdf'})
+    store.record('url', 'extract', FAILED, error='boom')
+    assert store.stage_result('url', 'download') == {'pdf_path': 'paper.pdf'}
+    assert store.stage_result('url', 'extract') is None
+    assert store.load('url')['stages']['extract']['error'] == 'boom'
+    store.reset('url')
+    assert store.stage_result('url', 'download') is None
+
+
+def fake_runner(tmp_path, calls, failures):
+    runner = BatchRunner(str(tmp_path), 'openai-key', 'anthropic-key', questions=[],
+                         checkpoint_dir=str(tmp_path / 'checkpoints'))
+    runner.prefetch_metadata = lambda urls: None
+
+    def stage(name):
+        def run(state):
+            calls.append((name, state['url']))
+            if failures.get((name, state['url']), 0) > 0:
+                failures[(name, state['url'])] -= 1
+                raise RuntimeError(f"{name} broke")
+            return {name: state['url']}
+        return run
+
+    runner.stage_functions = {name: stage(name) for name in ('download', 'extract', 'analyze')}
+    return runner
+
+
+@pytest.mark.parametrize('pipelined', [True, False])
+def test_rerun_skips_checkpointed_stages_and_retries_failures(tmp_path, pipelined):
+    calls = []
+    runner = fake_runner(tmp_path, calls, failures={('extract', 'b'): 1})
+
+    summary = runner.run(['a', 'b'], pipelined=pipelined)
+    assert (summary['completed'], summary['failed']) == (1, 1)
+    failed = summary['papers'][1]
+    assert (failed['status'], failed['failed_stage'], failed['error']) == (FAILED, 'extract', 'extract broke')
+    assert runner.checkpoints.load('b')['stages']['extract']['status'] == FAILED
+
+    calls.clear()
+    summary = runner.run(['a', 'b'], pipelined=pipelined)
+    assert summary['completed'] == 2
+    # Only the failed stage and the one after it run again
+    assert sorted(calls) == [('analyze', 'b'), ('extract', 'b')]
+
+
+def test_checkpoint_write_failure_marks_paper_failed(tmp_path):
+    runner = fake_runner(tmp_path, [], failures={})
+
+    def broken_record(url, stage, status, **kwargs):
+        raise OSError('disk full')
+
+    runner.checkpoints.record = broken_record
+    summary = runner.run(['a'])
+    assert summary['papers'][0]['status'] == FAILED
+    assert summary['failed'] == 1
@@ -0,0 +1,50 @@
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.caption_index import TABLE_CAPTION_PATTERN, CaptionIndex
+
+
+def block(x0, y0, x1, y1, text):
+    return SimpleNamespace(x0=x0, y0=y0, x1=x1, y1=y1, text=text)
+
+
+class FakeDocument:
+    """Serves fixed text blocks per page and counts how often a page is read."""
+    def __init__(self, pages):
+        self.pages = pages
+        self.reads = []
+
+    def text_blocks(self, page_num):
+        self.reads.append(page_num)
+        return self.pages.get(page_num, [])
+
+
+# Two-column page: a figure per column with its caption below, and a table captioned above
+PAGE = [
+    block(50, 700, 550, 720, "Page footer"),
+    block(320, 310, 550, 330, "Figure 2: Right column results."),
+    block(50, 310, 280, 330, "Figure 1: Left column architecture."),
+    block(50, 380, 280, 395, "Table 1: Hyperparameters."),
+    block(50, 340, 280, 360, "Body text that follows the figure."),
+]
+
+
+def test_matches_nearest_overlapping_caption_below():
+    document = FakeDocument({0: PAGE})
+    index = CaptionIndex(document)
+    assert index.match(0, (55, 100, 270, 300)).text.startswith("Figure 1")
+    assert index.match(0, (330, 100, 540, 300)).text.startswith("Figure 2")
+    # Caption blocks of a page are collected once
+    index.match(0, (55, 100, 270, 300))
+    assert document.reads == [0]
+
+
+def test_falls_back_to_caption_above_and_respects_max_gap():
+    index = CaptionIndex(FakeDocument({0: PAGE}), TABLE_CAPTION_PATTERN, max_gap=50)
+    assert index.match(0, (55, 400, 270, 500)).text.startswith("Table 1")
+    assert index.match(0, (55, 500, 270, 600)) is None
+    assert index.match(1, (55, 400, 270, 500)) is None
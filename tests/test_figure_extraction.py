@@ -57,8 +57,8 @@ def test_figure_extraction(arxiv_id, raw_data_folder, output_folder):
     images_folder = os.path.join(output_pdf_folder, "images")
     os.makedirs(images_folder, exist_ok=True)
     
-    processor = PDFProcessor(pdf_path)
-    text, images, figures = processor.extract_content()
+    with PDFProcessor(pdf_path) as processor:
+        text, images, figures = processor.extract_content()
     
     print(f"Extracted {len(figures)} figures from the PDF.")
     
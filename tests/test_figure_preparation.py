@@ -0,0 +1,54 @@
+import base64
+import io
+import os
+import sys
+
+from PIL import Image, ImageDraw
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from information_extraction.figure_preparation import FigurePreparer
+
+def save_chart(path, size, bars, mode="RGB"):
+    image = Image.new(mode, size, "white")
+    draw = ImageDraw.Draw(image)
+    width, height = size
+    for i, bar in enumerate(bars):
+        x = (i + 1) * width // (len(bars) + 2)
+        draw.rectangle([x, height - bar * height // 10, x + width // 20, height], fill="black")
+    image.save(path)
+    return path
+
+def test_downscales_dedupes_and_drops_tiny_crops(tmp_path):
+    chart = save_chart(str(tmp_path / "chart.png"), (3000, 2000), [3, 7, 5, 9])
+    resaved = save_chart(str(tmp_path / "chart_copy.png"), (1500, 1000), [3, 7, 5, 9])
+    other = save_chart(str(tmp_path / "other.png"), (800, 400), [9, 2, 2, 8, 1])
+    icon = save_chart(str(tmp_path / "icon.png"), (40, 40), [5])
+    preparer = FigurePreparer(cache_dir=str(tmp_path / "cache"))
+
+    figures, counts = preparer.prepare([(1, chart), (2, resaved), (3, other), (3, icon)])
+    assert [figure.path for figure in figures] == [chart, other]
+    assert counts["duplicates"] == 1 and counts["tiny"] == 1 and counts["kept"] == 2
+
+    big = figures[0]
+    assert (big.width, big.height) == (1152, 768)
+    assert big.mime == "image/jpeg" and big.detail == "high"
+    assert Image.open(io.BytesIO(base64.b64decode(big.data))).format == "JPEG"
+
+def test_payloads_are_cached(tmp_path):
+    chart = save_chart(str(tmp_path / "chart.png"), (400, 300), [3, 7, 5, 9], mode="RGBA")
+    first, _ = FigurePreparer(image_format="WEBP", cache_dir=str(tmp_path / "cache")).prepare([(None, chart)])
+    preparer = FigurePreparer(image_format="WEBP", cache_dir=str(tmp_path / "cache"))
+    second, counts = preparer.prepare([(None, chart)])
+    assert counts["cache_hits"] == 1
+    # Counts are per call; stats accumulate across calls
+    preparer.prepare([(None, chart)])
+    assert preparer.stats["cache_hits"] == 2
+    assert second == first and second[0].mime == "image/webp" and second[0].detail == "low"
+
+def test_cached_drop_verdict_respects_size_thresholds(tmp_path):
+    small = save_chart(str(tmp_path / "small.png"), (60, 60), [5])
+    cache_dir = str(tmp_path / "cache")
+    assert FigurePreparer(cache_dir=cache_dir).prepare([(1, small)])[0] == []
+    assert len(FigurePreparer(min_side=10, min_area=100, cache_dir=cache_dir).prepare([(1, small)])[0]) == 1
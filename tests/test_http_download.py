@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from paper_acquisition.http_client import HTTPClient
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+ETAG = '"v1"'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves PAYLOAD with Range and If-Range support; /flaky answers 503 on its
+    first request.
+    """
+    requests_seen = []
+    flaky_failures = 1
+
+    def do_GET(self):
+        StandInHandler.requests_seen.append((self.path, self.headers.get('Range')))
+        if self.path == '/flaky' and StandInHandler.flaky_failures > 0:
+            StandInHandler.flaky_failures -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and (if_range is None or if_range == ETAG):
+            start = int(range_header.split('=')[1].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(PAYLOAD) - start))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(PAYLOAD[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.requests_seen = []
+    StandInHandler.flaky_failures = 1
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+
+
+def test_streams_to_file_atomically(server, tmp_path):
+    client = HTTPClient(chunk_size=64 * 1024)
+    path = str(tmp_path / 'paper.pdf')
+    client.download(f'{server}/paper.pdf', path)
+    with open(path, 'rb') as f:
+        assert f.read() == PAYLOAD
+    assert not os.path.exists(path + '.part')
+
+
+def write_partial(path, data, etag):
+    with open(path + '.part', 'wb') as f:
+        f.write(data)
+    with open(path + '.part.json', 'w') as f:
+        json.dump({'etag': etag, 'last_modified': None}, f)
+
+
+def test_resumes_partial_download_with_range(server, tmp_path):
+    client = HTTPClient()
+    path = str(tmp_path / 'source.tar.gz')
+    write_partial(path, PAYLOAD[:1000], ETAG)
+    client.download(f'{server}/source', path)
+    with open(path, 'rb') as f:
+        assert f.read() == PAYLOAD
+    assert StandInHandler.requests_seen == [('/source', 'bytes=1000-')]
+    assert client.stats['resumed'] == 1
+    assert not os.path.exists(path + '.part.json')
+
+
+def test_changed_file_is_not_spliced_onto_stale_part(server, tmp_path):
+    client = HTTPClient()
+    path = str(tmp_path / 'source.tar.gz')
+    write_partial(path, b'stale' * 200, '"v0"')
+    client.download(f'{server}/source', path)
+    with open(path, 'rb') as f:
+        assert f.read() == PAYLOAD
+    assert client.stats['resumed'] == 0
+
+
+def test_partial_without_validators_starts_over(server, tmp_path):
+    client = HTTPClient()
+    path = str(tmp_path / 'source.tar.gz')
+    with open(path + '.part', 'wb') as f:
+        f.write(b'stale' * 200)
+    client.download(f'{server}/source', path)
+    with open(path, 'rb') as f:
+        assert f.read() == PAYLOAD
+    assert StandInHandler.requests_seen == [('/source', None)]
+
+
+def test_retries_transient_errors(server, tmp_path):
+    client = HTTPClient(backoff=0.01)
+    path = str(tmp_path / 'flaky.pdf')
+    client.download(f'{server}/flaky', path)
+    assert os.path.getsize(path) == len(PAYLOAD)
+    assert client.stats['retries'] == 1
+
+
+def test_download_many_in_parallel(server, tmp_path):
+    client = HTTPClient()
+    jobs = [(f'{server}/paper{i}.pdf', str(tmp_path / f'paper{i}.pdf')) for i in range(6)]
+    results = client.download_many(jobs, workers=3)
+    assert all(results[url] == path for url, path in jobs)
+    assert client.stats['files'] == 6
+
+
+def test_conditional_fetch_skips_unchanged_file(server, tmp_path):
+    client = HTTPClient()
+    path = str(tmp_path / 'paper.pdf')
+    validators = client.fetch(f'{server}/paper.pdf', path)
+    assert validators['etag'] == ETAG
+    assert client.fetch(f'{server}/paper.pdf', path, etag=validators['etag']) is None
+    assert client.stats['not_modified'] == 1
+    assert os.path.getsize(path) == len(PAYLOAD)
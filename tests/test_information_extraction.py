@@ -0,0 +1,32 @@
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from information_extraction.batched_questions import build_batched_prompt, parse_batched_answers
+
+QUESTIONS = [
+    "What is the total number of parameters in the model?",
+    "What is the batch size used during training?",
+    "What hardware was used for training?",
+]
+
+def test_batched_prompt_numbers_questions():
+    prompt = build_batched_prompt("A 7B model.", QUESTIONS)
+    assert "q1: What is the total number of parameters" in prompt
+    assert "q3: What hardware" in prompt
+    assert "Summary: A 7B model." in prompt
+
+def test_parse_batched_answers_from_fenced_json():
+    response = '```json\n{"q1": "7B parameters", "q2": "4M tokens", "q3": "A100 GPUs"}\n```'
+    answers = parse_batched_answers(response, QUESTIONS)
+    assert answers == dict(zip(QUESTIONS, ["7B parameters", "4M tokens", "A100 GPUs"]))
+
+def test_parse_batched_answers_drops_missing_and_empty_keys():
+    answers = parse_batched_answers('{"q1": "7B", "q2": ""}', QUESTIONS)
+    assert list(answers) == [QUESTIONS[0]]
+
+def test_parse_batched_answers_invalid_json():
+    assert parse_batched_answers("Sorry, I cannot answer that.", QUESTIONS) == {}
+    assert parse_batched_answers('{"q1": "7B",', QUESTIONS) == {}
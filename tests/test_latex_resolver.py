@@ -0,0 +1,56 @@
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.latex_resolver import DecodedFileCache, LatexResolver
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def decode(raw_data, path):
+    return raw_data.decode('utf-8')
+
+def make_project(root):
+    write(os.path.join(root, 'main.tex'),
+          "\\documentclass{article}\n\\begin{document}\n\\input{sections/intro}\n"
+          "% \\input{sections/unused}\n\\include{sections/method}\n\\end{document}\n")
+    write(os.path.join(root, 'sections', 'intro.tex'), "We train a 7B model.\n\\input{sections/details}\n")
+    write(os.path.join(root, 'sections', 'details.tex'), "It uses 512 GPUs.\n")
+    write(os.path.join(root, 'sections', 'method.tex'), "Our method.\n\\input{sections/method}\n")
+    write(os.path.join(root, 'sections', 'unused.tex'), "Never included.\n")
+    write(os.path.join(root, 'supplement.tex'), "\\begin{document}Supplement\\end{document}\n")
+
+def test_flattens_nested_includes(tmp_path):
+    make_project(str(tmp_path))
+    resolver = LatexResolver(str(tmp_path), decode, cache=DecodedFileCache())
+    assert resolver.find_main_file() == 'main.tex'
+    flattened = resolver.flatten()
+    assert flattened.index("7B model") < flattened.index("512 GPUs") < flattened.index("Our method")
+    assert "Never included" not in flattened
+    assert resolver.graph['main.tex'] == [os.path.join('sections', 'intro.tex'), os.path.join('sections', 'method.tex')]
+
+def test_files_are_decoded_once(tmp_path):
+    make_project(str(tmp_path))
+    cache = DecodedFileCache()
+    LatexResolver(str(tmp_path), decode, cache=cache).flatten()
+    decoded = cache.stats['decoded']
+    LatexResolver(str(tmp_path), decode, cache=cache).flatten()
+    assert cache.stats['decoded'] == decoded
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    paths = [str(tmp_path / f'{name}.tex') for name in 'abc']
+    for path in paths:
+        write(path, path)
+    cache = DecodedFileCache(max_entries=2)
+    cache.get(paths[0], decode)
+    cache.get(paths[1], decode)
+    cache.get(paths[0], decode)  # a hit makes a.tex the most recently used
+    cache.get(paths[2], decode)
+    cache.get(paths[0], decode)
+    assert cache.stats == {'hits': 2, 'rehashed': 0, 'decoded': 3}
+    cache.get(paths[1], decode)
+    assert cache.stats['decoded'] == 4
@@ -0,0 +1,65 @@
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.latex_structure import parse_structure
+
+DOCUMENT = r"""
+\graphicspath{{figures/}}
+\begin{document}
+\section{Introduction}\label{sec:intro}
+We present a model.
+\section{Method}
+\begin{figure*}[t]
+  \centering
+  \includegraphics[width=0.45\linewidth,
+                   trim=0 0 0 0]{architecture}
+  \caption{Overview of the \textbf{architecture}, with {nested} braces.}
+  \label{fig:arch}
+\end{figure*}
+\begin{figure}
+  \subfloat[Training loss]{\includegraphics{plots/loss}\label{fig:loss}}
+  \subfloat[Validation loss]{\includegraphics{plots/val}}
+  \caption{Loss curves.}
+\end{figure}
+\subsection{Training}
+\begin{table}
+  \caption{Hyperparameters.}\label{tab:hparams}
+  \begin{tabular}{lr}
+    \toprule
+    Parameter & Value \\
+    \midrule
+    Batch size & 2048 \\
+    Learning rate & 3e-4 \\
+    \bottomrule
+  \end{tabular}
+\end{table}
+\end{document}
+"""
+
+def test_sections_and_labels(tmp_path):
+    document = parse_structure(DOCUMENT, str(tmp_path))
+    assert [(section.level, section.title) for section in document.sections] == [
+        (1, 'Introduction'), (1, 'Method'), (2, 'Training')]
+    assert document.sections[0].label == 'sec:intro'
+    assert 'We present a model.' in DOCUMENT[document.sections[0].start:document.sections[0].end]
+
+def test_figures_with_captions_subfloats_and_graphicspath(tmp_path):
+    os.makedirs(tmp_path / 'figures')
+    (tmp_path / 'figures' / 'architecture.pdf').write_bytes(b'%PDF')
+    document = parse_structure(DOCUMENT, str(tmp_path))
+    architecture, losses = document.figures
+    assert architecture.caption == 'Overview of the architecture, with nested braces.'
+    assert architecture.label == 'fig:arch'
+    assert architecture.section == 'Method'
+    assert architecture.graphics == [str(tmp_path / 'figures' / 'architecture.pdf')]
+    assert [sub['caption'] for sub in losses.subfigures] == ['Training loss', 'Validation loss']
+    assert losses.subfigures[0]['label'] == 'fig:loss'
+    assert len(losses.graphics) == 2 and losses.caption == 'Loss curves.'
+
+def test_tables_as_rows(tmp_path):
+    table, = parse_structure(DOCUMENT, str(tmp_path)).tables
+    assert table.caption == 'Hyperparameters.' and table.label == 'tab:hparams'
+    assert table.rows == [['Parameter', 'Value'], ['Batch size', '2048'], ['Learning rate', '3e-4']]
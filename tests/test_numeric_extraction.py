@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from information_extraction.numeric_extractor import extract_candidates
+
+# Sentences phrased as they appear in ML papers, labelled with the normalized value
+# the extractor should propose for each field
+LABELLED_SET = [
+    ("Llama 2 70B has 70 billion parameters.", {"parameters": 70e9}),
+    ("We release variants with 7B, 13B, and 70B parameters.", {"parameters": 70e9}),
+    ("GPT-3 is a 175B-parameter autoregressive language model.", {"parameters": 175e9}),
+    ("Our model has 1.3 billion trainable parameters.", {"parameters": 1.3e9}),
+    ("The network contains 340M parameters in total.", {"parameters": 340e6}),
+    ("Training GPT-3 175B consumed 3.14 × 10^23 FLOPs.", {"training_compute": 3.14e23}),
+    ("Training required 3.64E+03 petaflop/s-days of compute.", {"training_compute": 3.64e3 * 8.64e19}),
+    ("The total training compute is 2.5e24 FLOP.", {"training_compute": 2.5e24}),
+    ("We use a global batch size of 4M tokens.", {"batch_size": 4e6}),
+    ("All models use a batch size of 2048 sequences.", {"batch_size": 2048}),
+    ("batch size 256, learning rate 3e-4", {"batch_size": 256}),
+    ("We use 512 examples per batch.", {"batch_size": 512}),
+    ("We use a batch size of 2048 tokens.", {"batch_size": 2048}),
+    ("We use a batch size of 64 but accumulate gradients.", {"batch_size": 64}),
+    ("The batch size 256 to 512 was tuned per task.", {"batch_size": 256}),
+    ("Batch size of 32 by default.", {"batch_size": 32}),
+    ("Batch size: 2048 tokens", {"batch_size": 2048}),
+    ("We train for 3 epochs over the fine-tuning data.", {"epochs": 3}),
+    ("The model was trained for two epochs.", {"epochs": 2}),
+    ("epochs: 90, weight decay: 0.1", {"epochs": 90}),
+    ("Training was done on 2,048 A100 GPUs.", {"hardware_quantity": 2048}),
+    ("We trained on 1024 TPU v4 chips.", {"hardware_quantity": 1024}),
+    ("The model was trained using 8 NVIDIA V100 GPUs.", {"hardware_quantity": 8}),
+    ("The model was trained for 21 days.", {"training_time": 504}),
+    ("Training took approximately 3 weeks.", {"training_time": 504}),
+    ("Pre-training lasted for about 90 hours.", {"training_time": 90}),
+    ("Pretraining took 1,720,320 GPU hours on 2048 A100 GPUs.", {"training_time": 840, "hardware_quantity": 2048}),
+    ("We trained GPT-3 175B on 2048 A100 GPUs; the A100 GPUs ran at full load.", {"hardware_quantity": 2048}),
+    ("The GPT-3 175B model was evaluated zero-shot.", {"parameters": 175e9}),
+]
+
+def measure_recall():
+    hits, totals = {}, {}
+    for sentence, labels in LABELLED_SET:
+        candidates = extract_candidates(sentence)
+        for field, expected in labels.items():
+            totals[field] = totals.get(field, 0) + 1
+            values = [candidate.value for candidate in candidates.get(field, [])]
+            if any(abs(value - expected) <= 1e-6 * abs(expected) for value in values):
+                hits[field] = hits.get(field, 0) + 1
+    return {field: hits.get(field, 0) / totals[field] for field in totals}
+
+def test_recall_on_labelled_set():
+    recall = measure_recall()
+    for field, value in recall.items():
+        assert value >= 0.9, f"recall for {field} dropped to {value:.2f}"
+
+def test_candidates_carry_source_spans():
+    text = "Intro text. We trained on 2,048 A100 GPUs for 21 days."
+    candidate = extract_candidates(text)["hardware_quantity"][0]
+    start, end = candidate.span
+    assert text[start:end] == candidate.source == "2,048 A100 GPUs"
+
+def test_magnitude_suffix_must_end_the_word():
+    # A following word must not be read as a K/M/B/T magnitude
+    for sentence in ("batch size of 2048 tokens", "batch size of 64 but", "batch size 256 to 512", "batch size of 32 by default"):
+        values = [candidate.value for candidate in extract_candidates(sentence)["batch_size"]]
+        assert values and max(values) < 1e4, sentence
+
+def test_digits_inside_names_are_not_values():
+    # Model and hardware names carry digits that are not counts
+    for sentence in ("We train on A100 GPUs.", "Experiments ran on a V100.", "ResNet50 parameters are frozen.", "GPT-3 175B"):
+        assert extract_candidates(sentence) == {}, sentence
+    ranked = extract_candidates("On A100 GPUs. A100 GPUs again. We used 2048 A100 GPUs.")["hardware_quantity"]
+    assert [candidate.value for candidate in ranked] == [2048]
+
+def test_throughput_figures_are_not_training_compute():
+    assert "training_compute" not in extract_candidates("Peak throughput is 312 TFLOPs per GPU, 150 FLOPs per token.")
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    recall = measure_recall()
+    elapsed = time.perf_counter() - start
+    for field, value in sorted(recall.items()):
+        print(f"{field:<20} recall {value:.2f}")
+    print(f"{len(LABELLED_SET)} sentences in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction import ocr
+from content_extraction.ocr import OCRPool
+
+
+def stub_ocr(page_array, lang, config, timeout):
+    """
+    Stands in for Tesseract. The first pixel is the page number. Pages listed
+    in ``config`` time out on their first attempt (tracked by marker files in
+    the ``lang`` directory, since attempts run in different processes) and
+    page 99 always does. Later pages finish first, so results arrive out of order.
+    """
+    page_num = int(page_array[0, 0, 0])
+    marker = os.path.join(lang, f"attempted_{page_num}")
+    if page_num == 99 or (str(page_num) in config.split(',') and not os.path.exists(marker)):
+        open(marker, 'w').close()
+        raise RuntimeError("Tesseract process timeout")
+    time.sleep(0.02 * max(0, 5 - page_num))
+    return f"page {page_num}", 0.0
+
+
+def pages(numbers):
+    return ((page_num, np.full((4, 4, 3), page_num, dtype=np.uint8)) for page_num in numbers)
+
+
+def test_results_come_back_in_input_order(monkeypatch, tmp_path):
+    monkeypatch.setattr(ocr, "_ocr_page", stub_ocr)
+    pool = OCRPool(workers=3, lang=str(tmp_path), max_pending=3)
+    assert pool.ocr_pages(pages(range(5))) == [f"page {page_num}" for page_num in range(5)]
+    assert pool.stats["pages"] == 5 and pool.stats["failed_pages"] == []
+
+
+def test_timeouts_are_retried_then_given_up(monkeypatch, tmp_path):
+    monkeypatch.setattr(ocr, "_ocr_page", stub_ocr)
+    pool = OCRPool(workers=2, lang=str(tmp_path), config="1", retries=1)
+    assert pool.ocr_pages(pages([0, 1, 99])) == ["page 0", "page 1", ""]
+    assert pool.stats["failed_pages"] == [99]
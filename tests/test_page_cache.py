@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.page_cache import PageRasterCache
+
+PAGE_SHAPE = (10, 10, 3)
+PAGE_BYTES = 10 * 10 * 3
+
+
+def renderer(calls, value=0):
+    def render_pages(first, last):
+        calls.extend(range(first, last + 1))
+        return [np.full(PAGE_SHAPE, value + page_num, dtype=np.uint8) for page_num in range(first, last + 1)]
+    return render_pages
+
+
+def test_evicts_least_recently_used_pages_within_byte_budget():
+    calls = []
+    cache = PageRasterCache(renderer(calls), page_count=4, max_bytes=2 * PAGE_BYTES)
+    cache.get(0)
+    cache.get(1)
+    cache.get(0)  # page 1 is now the least recently used
+    cache.get(2)
+    assert calls == [0, 1, 2]
+    cache.get(0)
+    cache.get(1)
+    assert calls == [0, 1, 2, 1]
+    assert cache.stats["hits"] == 2 and cache.stats["pages_rendered"] == 4
+    assert not cache.get(0).flags.writeable
+
+
+def test_spilled_pages_reload_without_rendering(tmp_path):
+    calls = []
+    cache = PageRasterCache(renderer(calls), page_count=3, max_bytes=PAGE_BYTES, spill_dir=str(tmp_path))
+    for page_num in (0, 1, 2, 0, 1, 2):
+        assert cache.get(page_num)[0, 0, 0] == page_num
+    assert calls == [0, 1, 2]
+    # Each page is written once, however often it is evicted again
+    assert cache.stats["spilled"] == 3
+    cache.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_documents_sharing_a_spill_dir_keep_their_own_pages(tmp_path):
+    first = PageRasterCache(renderer([], value=10), page_count=2, max_bytes=PAGE_BYTES, spill_dir=str(tmp_path))
+    second = PageRasterCache(renderer([], value=20), page_count=2, max_bytes=PAGE_BYTES, spill_dir=str(tmp_path))
+    for cache in (first, second):
+        cache.get(0)
+        cache.get(1)
+    assert first.get(0)[0, 0, 0] == 10
+    assert second.get(0)[0, 0, 0] == 20
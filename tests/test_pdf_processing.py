@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pymupdf
+import pytest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.pdf_document import NATIVE_TEXT, NEEDS_OCR, PDFDocument
+
+PAGE_RECT = pymupdf.Rect(0, 0, 600, 800)
+
+
+def add_image(page, rect):
+    pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 20, 20), False)
+    pixmap.set_rect(pixmap.irect, (120, 120, 120))
+    page.insert_image(rect, pixmap=pixmap)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    document = pymupdf.open()
+    # 0: a normal text page
+    page = document.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    page.insert_text((50, 72), "Training details " * 12)
+    # 1: a scanned page, one image covering most of the page and no text layer
+    page = document.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    add_image(page, pymupdf.Rect(20, 20, 580, 780))
+    # 2: a figure-only page whose image is too small to be a scan
+    page = document.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    add_image(page, pymupdf.Rect(100, 100, 300, 300))
+    # 3: a scanned page with a short text caption on top
+    page = document.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    add_image(page, pymupdf.Rect(0, 0, 600, 800))
+    page.insert_text((50, 72), "Scanned appendix")
+    path = str(tmp_path / "paper.pdf")
+    document.save(path)
+    document.close()
+    return path
+
+
+def test_only_low_text_pages_with_a_large_image_need_ocr(pdf_path):
+    document = PDFDocument(pdf_path)
+    assert document.classify_pages() == [NATIVE_TEXT, NEEDS_OCR, NATIVE_TEXT, NEEDS_OCR]
+    document.close()
+
+
+def test_classification_thresholds(pdf_path):
+    document = PDFDocument(pdf_path)
+    # The caption on page 3 is enough text once min_chars is below its length
+    assert document.classify_pages(min_chars=10)[3] == NATIVE_TEXT
+    # The small figure on page 2 counts as a scan once the image ratio allows it
+    assert document.classify_pages(min_image_ratio=0.05)[2] == NEEDS_OCR
+    assert document.classify_pages() == [NATIVE_TEXT, NEEDS_OCR, NATIVE_TEXT, NEEDS_OCR]
+    document.close()
@@ -0,0 +1,67 @@
+import os
+import sys
+import threading
+import time
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from information_extraction.request_executor import RequestExecutor
+
+class FakeClient:
+    """Stands in for an API client: sleeps per call and tracks peak concurrency."""
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def complete(self, prompt):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return f"answer to {prompt}"
+
+def test_results_keep_input_order():
+    client = FakeClient()
+    executor = RequestExecutor({"fake": 8})
+    questions = [f"q{i}" for i in range(20)]
+    calls = [(q, lambda q=q: client.complete(q)) for q in questions]
+
+    results = executor.run("fake", calls)
+
+    assert list(results) == questions
+    assert results["q7"] == "answer to q7"
+
+def test_concurrency_is_bounded_per_provider():
+    client = FakeClient()
+    executor = RequestExecutor({"fake": 3})
+    calls = [(i, lambda i=i: client.complete(i)) for i in range(12)]
+
+    start = time.perf_counter()
+    executor.run("fake", calls)
+    elapsed = time.perf_counter() - start
+
+    assert client.peak == 3
+    # 12 calls at 3 wide is 4 rounds, far below the 12 rounds of a serial loop
+    assert elapsed < 12 * client.delay
+
+def test_latency_stats_and_errors():
+    executor = RequestExecutor({"fake": 2})
+
+    def failing():
+        raise RuntimeError("rate limited")
+
+    executor.run("fake", [("ok", lambda: "fine")])
+    try:
+        executor.run("fake", [("bad", failing)])
+        assert False, "expected the call error to propagate"
+    except RuntimeError:
+        pass
+
+    stats = executor.latency_stats()["fake"]
+    assert stats["calls"] == 2
+    assert stats["errors"] == 1
@@ -0,0 +1,49 @@
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from information_extraction.response_cache import ResponseCache
+
+def make_request(prompt, max_tokens=100):
+    return {"model": "claude-3-5-sonnet-20240620", "max_tokens": max_tokens, "temperature": 0,
+            "messages": [{"role": "user", "content": prompt}]}
+
+def test_identical_requests_hit_the_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), bypass=False)
+    calls = []
+
+    def call():
+        calls.append(1)
+        return "7B parameters"
+
+    assert cache.cached("anthropic", make_request("How many parameters?"), call) == "7B parameters"
+    assert cache.cached("anthropic", make_request("How many parameters?"), call) == "7B parameters"
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+def test_any_input_change_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), bypass=False)
+    cache.cached("anthropic", make_request("q"), lambda: "a")
+    cache.cached("anthropic", make_request("q", max_tokens=200), lambda: "b")
+    cache.cached("openai", make_request("q"), lambda: "c")
+    assert cache.stats() == {"hits": 0, "misses": 3}
+
+def test_ttl_and_lru_eviction(tmp_path):
+    expired = ResponseCache(str(tmp_path / "ttl.sqlite"), ttl_seconds=-1, bypass=False)
+    expired.cached("anthropic", make_request("q"), lambda: "a")
+    assert expired.get(expired.make_key("anthropic", make_request("q"))) is None
+
+    small = ResponseCache(str(tmp_path / "lru.sqlite"), max_entries=2, bypass=False)
+    for prompt in ["a", "b", "c"]:
+        small.cached("anthropic", make_request(prompt), lambda prompt=prompt: prompt)
+    assert small.get(small.make_key("anthropic", make_request("a"))) is None
+    assert small.get(small.make_key("anthropic", make_request("c"))) == "c"
+
+def test_bypass_always_calls(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), bypass=True)
+    calls = []
+    for _ in range(2):
+        cache.cached("anthropic", make_request("q"), lambda: calls.append(1) or "a")
+    assert len(calls) == 2
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from information_extraction import retrieval
+from information_extraction.chunking import TextChunk
+from information_extraction.retrieval import RetrievalIndex
+
+CHUNKS = [
+    TextChunk(0, "Introduction", "We study scaling laws for language models.", 0),
+    TextChunk(1, "Training", "The network was optimised on 512 accelerators for three weeks.", 50),
+    TextChunk(2, "Results", "Accuracy improves with batch size.", 120),
+]
+
+
+class FakeEncoder:
+    """Embeds text on two axes: training hardware words and everything else."""
+    def __init__(self, model_name, device=None):
+        pass
+
+    def encode(self, texts, normalize_embeddings=True):
+        vectors = []
+        for text in texts:
+            hardware = any(word in text.lower() for word in ("gpu", "accelerator", "hardware"))
+            vectors.append([1.0, 0.0] if hardware else [0.0, 1.0])
+        return np.array(vectors)
+
+
+def test_bm25_only_returns_overlapping_chunks():
+    index = RetrievalIndex(CHUNKS)
+    assert [chunk.index for chunk in index.search("What GPUs were used?")] == []
+    assert [chunk.index for chunk in index.search("batch size", top_k=2)] == [2]
+
+
+def test_embeddings_return_chunks_without_term_overlap(monkeypatch):
+    monkeypatch.setattr(retrieval, "SentenceTransformer", FakeEncoder)
+    monkeypatch.setattr(retrieval, "np", np, raising=False)
+    index = RetrievalIndex(CHUNKS, embedding_model="fake")
+    # "GPUs" shares no term with the training chunk, which is found by similarity alone
+    assert [chunk.index for chunk in index.search("What GPUs were used?", top_k=1)] == [1]
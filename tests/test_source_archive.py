@@ -0,0 +1,69 @@
+import io
+import os
+import sys
+import tarfile
+
+import pytest
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from paper_acquisition.source_archive import SourceArchive, safe_member_name
+
+MAIN_TEX = rb"""
+\documentclass{article}
+\usepackage{graphicx}
+\graphicspath{{figures/}}
+\begin{document}
+\input{sections/results}
+\includegraphics[width=0.5\linewidth]{architecture}
+% \includegraphics{commented_out}
+\end{document}
+"""
+RESULTS_TEX = rb"\section{Results}\includegraphics{plots/loss.png}"
+
+
+def make_archive(path, members):
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = str(tmp_path / 'source')
+    make_archive(path, {
+        'main.tex': MAIN_TEX,
+        'main.bbl': b'\\begin{thebibliography}{1}\\end{thebibliography}',
+        'sections/results.tex': RESULTS_TEX,
+        'figures/architecture.pdf': b'%PDF architecture',
+        'plots/loss.png': b'\x89PNG loss',
+        'figures/commented_out.pdf': b'%PDF unused',
+        'data/checkpoint.bin': b'\0' * 100000,
+        '../escape.tex': b'evil',
+    })
+    return path
+
+
+def test_extracts_only_sources_and_referenced_graphics(archive_path, tmp_path):
+    dest = tmp_path / 'latex'
+    written = SourceArchive(archive_path).extract(str(dest))
+    extracted = sorted(os.path.relpath(path, str(dest)).replace(os.sep, '/') for path in written)
+    assert extracted == ['figures/architecture.pdf', 'main.bbl', 'main.tex',
+                         'plots/loss.png', 'sections/results.tex']
+    assert not (tmp_path / 'escape.tex').exists()
+
+
+def test_reads_members_without_extracting(archive_path):
+    archive = SourceArchive(archive_path)
+    assert archive.read('plots/loss.png') == b'\x89PNG loss'
+    assert archive.read('main.tex') == MAIN_TEX
+    assert '../escape.tex' not in archive.index
+
+
+def test_safe_member_name():
+    assert safe_member_name('./figs/a.png') == 'figs/a.png'
+    assert safe_member_name('figs/../../etc/passwd') is None
+    assert safe_member_name('/etc/passwd') is None
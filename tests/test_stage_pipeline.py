@@ -0,0 +1,71 @@
+import os
+import sys
+import threading
+import time
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from pipeline.stage_pipeline import StagePipeline
+
+
+def sleepy(name, seconds_for):
+    def run(item):
+        time.sleep(seconds_for(item))
+        item.setdefault('trace', []).append(name)
+        return item
+    return run
+
+
+def test_outputs_keep_input_order():
+    # Later items finish the first stage sooner, so they overtake earlier ones
+    pipeline = StagePipeline([
+        ('first', sleepy('first', lambda item: 0.05 / (item['n'] + 1)), 4),
+        ('second', sleepy('second', lambda item: 0.0), 2),
+    ])
+    outputs = pipeline.run({'n': n} for n in range(8))
+    assert [item['n'] for item in outputs] == list(range(8))
+    assert all(item['trace'] == ['first', 'second'] for item in outputs)
+    assert pipeline.utilization()['first']['items'] == 8
+
+
+def test_failures_are_recorded_and_skip_later_stages():
+    def flaky(item):
+        if item['n'] == 1:
+            raise ValueError('bad paper')
+        return item
+
+    def finish_early(item):
+        item['done'] = item['n'] == 2
+        return item
+
+    pipeline = StagePipeline([('check', flaky, 2), ('early', finish_early, 1), ('last', sleepy('last', lambda item: 0.0), 1)])
+    outputs = pipeline.run({'n': n} for n in range(4))
+    assert (outputs[1]['failed_stage'], outputs[1]['error']) == ('check', 'bad paper')
+    assert 'trace' not in outputs[1] and 'trace' not in outputs[2]
+    assert outputs[0]['trace'] == outputs[3]['trace'] == ['last']
+
+
+def test_full_queue_blocks_the_upstream_stage():
+    release = threading.Event()
+    produced = []
+
+    def produce(item):
+        produced.append(item['n'])
+        return item
+
+    def slow(item):
+        release.wait(5)
+        return item
+
+    pipeline = StagePipeline([('produce', produce, 1), ('slow', slow, 1)], queue_size=1)
+    runner = threading.Thread(target=lambda: pipeline.run({'n': n} for n in range(6)))
+    runner.start()
+    time.sleep(0.2)
+    # One item in the slow stage, one in its queue, one held by the blocked producer
+    assert len(produced) == 3
+    release.set()
+    runner.join(5)
+    assert produced == list(range(6))
+    assert pipeline.utilization()['produce']['blocked_seconds'] > 0.1
+    assert pipeline.utilization()['slow']['max_queue_depth'] == 1
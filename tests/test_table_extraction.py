@@ -0,0 +1,55 @@
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from content_extraction.latex_structure import parse_structure
+from content_extraction.table_extractor import load_tables, save_tables, tables_from_latex
+from information_extraction.numeric_extractor import extract_candidates
+from information_extraction.retrieval import select_tables
+
+HYPERPARAMETERS = r"""
+\begin{table}
+  \caption{Training hyperparameters.}\label{tab:hparams}
+  \begin{tabular}{lr}
+    \toprule
+    Hyperparameter & Value \\
+    \midrule
+    Batch size & 2048 \\
+    Epochs & 90 \\
+    Learning rate & 3e-4 \\
+    \bottomrule
+  \end{tabular}
+\end{table}
+\begin{table}
+  \caption{Model sizes.}
+  \begin{tabular}{lcc}
+    Model & Params & Layers \\ \hline
+    Small & 125M & 12 \\
+    Large & 1.3B & 24 \\
+  \end{tabular}
+\end{table}
+"""
+
+def test_latex_tables_become_records(tmp_path):
+    hparams, sizes = tables_from_latex(parse_structure(HYPERPARAMETERS, str(tmp_path)))
+    assert hparams.header == ['Hyperparameter', 'Value']
+    assert hparams.rows[0] == ['Batch size', '2048']
+    assert hparams.title == 'Table 1: Training hyperparameters.'
+    assert sizes.rows == [['Small', '125M', '12'], ['Large', '1.3B', '24']]
+
+    path = str(tmp_path / 'tables.json')
+    save_tables([hparams, sizes], path)
+    assert load_tables(path) == [hparams, sizes]
+
+def test_numeric_extractor_reads_table_sentences(tmp_path):
+    hparams, sizes = tables_from_latex(parse_structure(HYPERPARAMETERS, str(tmp_path)))
+    candidates = extract_candidates(hparams.to_sentences() + "\n" + sizes.to_sentences())
+    assert candidates["batch_size"][0].value == 2048
+    assert candidates["epochs"][0].value == 90
+    assert 1.3e9 in [candidate.value for candidate in candidates["parameters"]]
+
+def test_tables_are_selected_by_question(tmp_path):
+    tables = tables_from_latex(parse_structure(HYPERPARAMETERS, str(tmp_path)))
+    assert select_tables(tables, "What batch size was used for training?", top_k=1) == [tables[0]]